@@ -0,0 +1,43 @@
+import asyncio
+from dataclasses import asdict
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.schemas.candidates import CandidateListResponse, CandidateSummary
+from app.core.deps import get_candidate_directory
+from app.services.candidate_index import CandidateDirectory, CandidateQuery
+
+router = APIRouter(prefix="/candidates", tags=["Candidates"])
+
+
+@router.get("", response_model=CandidateListResponse)
+async def list_candidates(
+    skill: List[str] = Query([]),
+    language: List[str] = Query([]),
+    location: Optional[str] = None,
+    title: Optional[str] = None,
+    graduated_after: Optional[int] = None,
+    graduated_before: Optional[int] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=200),
+    directory: CandidateDirectory = Depends(get_candidate_directory),
+) -> CandidateListResponse:
+    """Filter structured candidate profiles; all given filters must match."""
+    query = CandidateQuery(
+        skills=skill,
+        languages=language,
+        location=location,
+        title=title,
+        graduated_after=graduated_after,
+        graduated_before=graduated_before,
+    )
+    # Refreshing may parse new profile records from disk.
+    total, records = await asyncio.to_thread(directory.search, query, offset, limit)
+    return CandidateListResponse(
+        total=total,
+        offset=offset,
+        limit=limit,
+        items=[CandidateSummary(**asdict(record)) for record in records],
+        unindexed_files=directory.unstructured_count,
+    )
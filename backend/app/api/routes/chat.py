@@ -1,23 +1,36 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
-from app.api.schemas.chat import ChatRequest, ChatResponse
-from app.core.deps import get_rag_service
+from app.api.schemas.chat import ChatCacheStatsResponse, ChatRequest, ChatResponse
+from app.core.deps import get_candidate_directory, get_rag_service
+from app.services.candidate_index import CandidateDirectory
 from app.services.rag import RAGConfigurationError, RAGIndexNotFoundError, RAGService
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
+logger = logging.getLogger(__name__)
 
 
 @router.post("", response_model=ChatResponse)
-def chat(
+async def chat(
     payload: ChatRequest,
     rag_service: RAGService = Depends(get_rag_service),
+    directory: CandidateDirectory = Depends(get_candidate_directory),
 ) -> ChatResponse:
     question = payload.message.strip()
     if not question:
         raise HTTPException(status_code=400, detail="Message must not be empty.")
 
+    exact_answer = await _exact_answer(directory, question)
+    if exact_answer is not None:
+        return ChatResponse(response=exact_answer)
+
     try:
-        response_text = rag_service.answer(question)
+        response_text = await rag_service.aanswer(question)
         return ChatResponse(response=response_text)
     except RAGConfigurationError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -25,3 +38,77 @@ def chat(
         raise HTTPException(status_code=400, detail="RAG index is missing. Please ingest CVs first.") from None
     except Exception as exc:  # pragma: no cover
         raise HTTPException(status_code=500, detail="Failed to generate chat response.") from exc
+
+
+@router.post("/stream")
+async def chat_stream(
+    payload: ChatRequest,
+    rag_service: RAGService = Depends(get_rag_service),
+    directory: CandidateDirectory = Depends(get_candidate_directory),
+) -> StreamingResponse:
+    """Stream the answer as Server-Sent Events: ``token`` events, then one ``sources`` event."""
+    question = payload.message.strip()
+    if not question:
+        raise HTTPException(status_code=400, detail="Message must not be empty.")
+
+    exact_answer = await _exact_answer(directory, question)
+    events = _exact_events(exact_answer) if exact_answer is not None else rag_service.astream_answer(question)
+    # Pull the first event before responding so setup errors still map to HTTP status codes.
+    try:
+        first_event = await events.__anext__()
+    except RAGConfigurationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RAGIndexNotFoundError:
+        raise HTTPException(status_code=400, detail="RAG index is missing. Please ingest CVs first.") from None
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(status_code=500, detail="Failed to generate chat response.") from exc
+
+    return StreamingResponse(
+        _sse_events(first_event, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _exact_answer(directory: CandidateDirectory, question: str) -> Optional[str]:
+    """Answer count/list questions from the candidate index, skipping retrieval and the LLM."""
+    try:
+        return await asyncio.to_thread(directory.answer, question)
+    except Exception:
+        logger.exception("Candidate index lookup failed; falling back to RAG.")
+        return None
+
+
+async def _exact_events(answer: str) -> AsyncIterator[Tuple[str, object]]:
+    yield "token", answer
+    yield "sources", []
+
+
+async def _sse_events(
+    first_event: Tuple[str, object],
+    events: AsyncIterator[Tuple[str, object]],
+) -> AsyncIterator[str]:
+    yield _sse(*first_event)
+    try:
+        async for event in events:
+            yield _sse(*event)
+    except Exception:
+        logger.exception("Chat stream failed mid-response.")
+        yield _sse("error", "Failed to generate chat response.")
+
+
+def _sse(event: str, data: object) -> str:
+    if event == "token":
+        payload = {"text": data}
+    elif event == "sources":
+        payload = {"files": data}
+    else:
+        payload = {"detail": data}
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@router.get("/cache", response_model=ChatCacheStatsResponse)
+async def chat_cache_stats(
+    rag_service: RAGService = Depends(get_rag_service),
+) -> ChatCacheStatsResponse:
+    return ChatCacheStatsResponse(**rag_service.cache_stats())
@@ -1,28 +1,72 @@
-from fastapi import APIRouter, Depends
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from app.api.schemas.cv import CVListResponse
 from app.api.schemas.tasks import TaskSubmissionResponse
-from app.core.deps import get_cv_generator
+from app.core.config import AppSettings
+from app.core.deps import get_cv_generator, get_settings
 from app.services.cv_generator import CVGeneratorService
-from app.tasks.cv_tasks import generate_cv_task, generate_mock_cv_task
+from app.tasks.cv_tasks import (
+    generate_cv_batch_task,
+    generate_cv_task,
+    generate_mock_cv_task,
+    synthesize_corpus_task,
+)
 
 router = APIRouter(prefix="/cv", tags=["CV"])
 
 
 @router.get("", response_model=CVListResponse)
-def list_cvs(
+async def list_cvs(
     generator: CVGeneratorService = Depends(get_cv_generator),
 ) -> CVListResponse:
-    return CVListResponse(files=generator.list_pdf_files())
+    return CVListResponse(files=await generator.alist_pdf_files())
 
 
 @router.post("/generate", response_model=TaskSubmissionResponse)
-def generate_cv() -> TaskSubmissionResponse:
-    task = generate_cv_task.delay()
+async def generate_cv() -> TaskSubmissionResponse:
+    task = await asyncio.to_thread(generate_cv_task.delay)
     return TaskSubmissionResponse(task_id=task.id, status=task.status)
 
 
 @router.post("/generate-mock", response_model=TaskSubmissionResponse)
-def generate_mock_cv() -> TaskSubmissionResponse:
-    task = generate_mock_cv_task.delay()
+async def generate_mock_cv() -> TaskSubmissionResponse:
+    task = await asyncio.to_thread(generate_mock_cv_task.delay)
+    return TaskSubmissionResponse(task_id=task.id, status=task.status)
+
+
+@router.post("/generate-batch", response_model=TaskSubmissionResponse)
+async def generate_cv_batch(
+    count: int = Query(..., ge=1),
+    mock: bool = False,
+    settings: AppSettings = Depends(get_settings),
+) -> TaskSubmissionResponse:
+    """Queue a pipelined batch; poll ``/tasks/{id}`` for per-item progress."""
+    if count > settings.cv_batch_max_count:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch size must not exceed {settings.cv_batch_max_count}.",
+        )
+    task = await asyncio.to_thread(generate_cv_batch_task.delay, count, mock)
+    return TaskSubmissionResponse(task_id=task.id, status=task.status)
+
+
+@router.post("/synthesize", response_model=TaskSubmissionResponse)
+async def synthesize_corpus(
+    count: int = Query(..., ge=1),
+    seed: int = 0,
+    render: bool = False,
+    settings: AppSettings = Depends(get_settings),
+) -> TaskSubmissionResponse:
+    """Queue a reproducible synthetic corpus in ``cv_synthetic_dir`` (never the served corpus).
+
+    Writes profile records with placeholder PDFs, or rendered PDFs when ``render``.
+    """
+    if count > settings.cv_synthetic_max_count:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Corpus size must not exceed {settings.cv_synthetic_max_count}.",
+        )
+    task = await asyncio.to_thread(synthesize_corpus_task.delay, count, seed, render)
     return TaskSubmissionResponse(task_id=task.id, status=task.status)
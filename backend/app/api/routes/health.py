@@ -1,10 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.api.schemas.health import HealthResponse
+from app.core.deps import get_rag_service
+from app.services.rag import RAGService
 
 router = APIRouter(tags=["Health"])
 
 
 @router.get("/health", response_model=HealthResponse)
-def health() -> HealthResponse:
-    return HealthResponse(message="Hello from FastAPI backend 👋")
+async def health(rag_service: RAGService = Depends(get_rag_service)) -> HealthResponse:
+    return HealthResponse(
+        message="Hello from FastAPI backend 👋",
+        rag_index="warm" if rag_service.is_warm else "cold",
+        rag_index_generation=rag_service.index_generation,
+    )
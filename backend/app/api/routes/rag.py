@@ -1,12 +1,22 @@
-from fastapi import APIRouter
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends
 
 from app.api.schemas.tasks import TaskSubmissionResponse
+from app.core.deps import get_ingest_coalescer
+from app.services.ingest_coalescer import IngestCoalescer
 from app.tasks.cv_tasks import ingest_rag_task
 
 router = APIRouter(prefix="/rag", tags=["RAG"])
 
 
 @router.post("/ingest", response_model=TaskSubmissionResponse)
-def ingest_rag() -> TaskSubmissionResponse:
-    task = ingest_rag_task.delay()
-    return TaskSubmissionResponse(task_id=task.id, status=task.status)
+async def ingest_rag(coalescer: Optional[IngestCoalescer] = Depends(get_ingest_coalescer)) -> TaskSubmissionResponse:
+    if coalescer is None:
+        task = await asyncio.to_thread(ingest_rag_task.delay)
+        return TaskSubmissionResponse(task_id=task.id, status=task.status)
+    task_id, coalesced = await asyncio.to_thread(
+        coalescer.submit, lambda new_id: ingest_rag_task.apply_async(task_id=new_id)
+    )
+    return TaskSubmissionResponse(task_id=task_id, status="PENDING", coalesced=coalesced)
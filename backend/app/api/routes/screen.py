@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.api.schemas.screen import ScreenRequest, ScreenResponse, ScreenResult
+from app.core.deps import get_rag_service
+from app.services.rag import RAGConfigurationError, RAGIndexNotFoundError, RAGService
+
+router = APIRouter(prefix="/screen", tags=["Screening"])
+
+
+@router.post("", response_model=ScreenResponse)
+async def screen_candidates(
+    payload: ScreenRequest,
+    rag_service: RAGService = Depends(get_rag_service),
+) -> ScreenResponse:
+    """Rank all indexed CVs against a job description by embedding similarity."""
+    job_description = payload.job_description.strip()
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Job description must not be empty.")
+
+    try:
+        total, ranked = await rag_service.ascreen(
+            job_description,
+            aggregate=payload.aggregate,
+            offset=payload.offset,
+            limit=payload.limit,
+        )
+    except RAGConfigurationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except RAGIndexNotFoundError:
+        raise HTTPException(status_code=400, detail="RAG index is missing. Please ingest CVs first.") from None
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(status_code=500, detail="Failed to screen candidates.") from exc
+
+    return ScreenResponse(
+        total=total,
+        offset=payload.offset,
+        limit=payload.limit,
+        aggregate=payload.aggregate,
+        results=[ScreenResult(filename=filename, score=score) for filename, score in ranked],
+    )
@@ -1,18 +1,116 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, Optional
+
 from celery.result import AsyncResult
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.api.schemas.tasks import TaskStatusResponse
 from app.core.celery_app import celery_app
+from app.core.config import AppSettings
+from app.core.deps import get_settings, get_task_event_stream
+from app.services.task_events import TaskEventStream
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
+logger = logging.getLogger(__name__)
+
+# Event metadata that is not part of a task's progress payload.
+_EVENT_FIELDS = ("task_id", "type", "timestamp")
 
 
 @router.get("/{task_id}", response_model=TaskStatusResponse)
-def get_task(task_id: str) -> TaskStatusResponse:
+async def get_task(
+    task_id: str,
+    stream: Optional[TaskEventStream] = Depends(get_task_event_stream),
+) -> TaskStatusResponse:
+    # Running, progress and final states are answered from the Redis snapshot when one exists.
+    event = await _latest_event(stream, task_id)
+    if event is not None and event["type"] in ("started", "stage", "progress", "succeeded", "failed"):
+        return _status_from_event(task_id, event)
+    # The result backend is a blocking database client; keep it off the event loop.
+    return await asyncio.to_thread(_task_status, task_id)
+
+
+@router.get("/{task_id}/events")
+async def get_task_events(
+    task_id: str,
+    stream: Optional[TaskEventStream] = Depends(get_task_event_stream),
+    settings: AppSettings = Depends(get_settings),
+) -> StreamingResponse:
+    """Push task events as Server-Sent Events until the final ``succeeded``/``failed`` event.
+
+    Events: ``started``, ``stage`` (``stage``, ``status``), ``progress`` (``completed``,
+    ``total``, ``percent``), then ``succeeded`` (``result``) or ``failed`` (``error``).
+    """
+    if stream is None:
+        raise HTTPException(status_code=503, detail="Task events are disabled; poll GET /tasks/{task_id}.")
+    return StreamingResponse(
+        _sse_events(stream, task_id, settings.task_events_keepalive_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(stream: TaskEventStream, task_id: str, keepalive_seconds: float) -> AsyncIterator[str]:
+    try:
+        async for event in stream.follow(task_id, keepalive_seconds):
+            if event is not None:
+                yield _sse(event)
+                continue
+            # Nothing new: the task may have finished before publishing, or its events expired.
+            final = await asyncio.to_thread(_final_event, task_id)
+            if final is not None:
+                yield _sse(final)
+                return
+            yield ": keep-alive\n\n"
+    except Exception:
+        logger.exception("Task event stream for %s failed.", task_id)
+        yield _sse({"task_id": task_id, "type": "error", "detail": "Event stream failed; poll GET /tasks/{task_id}."})
+
+
+async def _latest_event(stream: Optional[TaskEventStream], task_id: str) -> Optional[Dict[str, object]]:
+    if stream is None:
+        return None
+    try:
+        return await stream.latest(task_id)
+    except Exception:
+        logger.warning("Task event snapshot lookup failed; using the result backend.", exc_info=True)
+        return None
+
+
+def _status_from_event(task_id: str, event: Dict[str, object]) -> TaskStatusResponse:
+    if event["type"] == "succeeded":
+        return TaskStatusResponse(task_id=task_id, status="SUCCESS", result=event.get("result"))
+    if event["type"] == "failed":
+        return TaskStatusResponse(task_id=task_id, status="FAILURE", error=str(event.get("error") or "Task failed."))
+    if event["type"] == "started":
+        return TaskStatusResponse(task_id=task_id, status="STARTED")
+    progress = {key: value for key, value in event.items() if key not in _EVENT_FIELDS}
+    return TaskStatusResponse(task_id=task_id, status="PROGRESS", progress=progress)
+
+
+def _final_event(task_id: str) -> Optional[Dict[str, object]]:
+    status = _task_status(task_id)
+    if status.status == "SUCCESS":
+        return {"task_id": task_id, "type": "succeeded", "result": status.result}
+    if status.status == "FAILURE":
+        return {"task_id": task_id, "type": "failed", "error": status.error}
+    return None
+
+
+def _sse(event: Dict[str, object]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _task_status(task_id: str) -> TaskStatusResponse:
     result = AsyncResult(task_id, app=celery_app)
     payload = TaskStatusResponse(task_id=task_id, status=result.state)
     if result.state == "SUCCESS":
         payload.result = result.result
+    elif result.state == "PROGRESS":
+        payload.progress = result.info
     elif result.state == "FAILURE":
         payload.error = str(result.info) if result.info else "Task failed."
     return payload
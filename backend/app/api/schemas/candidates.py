@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class CandidateSummary(BaseModel):
+    filename: str
+    name: str
+    title: str
+    location: str
+    skills: List[str]
+    languages: List[str]
+    graduation_year: Optional[int] = None
+
+
+class CandidateListResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    items: List[CandidateSummary]
+    unindexed_files: int = 0
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel, Field
 
 
@@ -7,3 +9,14 @@ class ChatRequest(BaseModel):
 
 class ChatResponse(BaseModel):
     response: str
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    size: int
+
+
+class ChatCacheStatsResponse(BaseModel):
+    query_embeddings: CacheStats
+    answers: Optional[CacheStats] = None
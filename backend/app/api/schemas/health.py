@@ -1,5 +1,9 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class HealthResponse(BaseModel):
     message: str
+    rag_index: str
+    rag_index_generation: Optional[int] = None
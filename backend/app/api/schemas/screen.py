@@ -0,0 +1,23 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class ScreenRequest(BaseModel):
+    job_description: str = Field(..., min_length=1)
+    aggregate: Literal["max", "mean"] = "max"
+    offset: int = Field(0, ge=0)
+    limit: int = Field(20, ge=1, le=200)
+
+
+class ScreenResult(BaseModel):
+    filename: str
+    score: float
+
+
+class ScreenResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    aggregate: str
+    results: List[ScreenResult]
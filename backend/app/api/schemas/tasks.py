@@ -6,10 +6,13 @@ from pydantic import BaseModel
 class TaskSubmissionResponse(BaseModel):
     task_id: str
     status: str
+    # True when the request attached to an already queued task instead of enqueuing one.
+    coalesced: bool = False
 
 
 class TaskStatusResponse(BaseModel):
     task_id: str
     status: str
     result: Optional[Any] = None
+    progress: Optional[Any] = None
     error: Optional[str] = None
@@ -0,0 +1 @@
+"""Offline benchmarks for ingest, retrieval, chat and PDF rendering."""
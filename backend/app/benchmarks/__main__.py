@@ -0,0 +1,63 @@
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from app.benchmarks.suite import BenchmarkConfig, run_benchmarks
+
+
+def main() -> None:
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmarks",
+        description="Benchmark ingest, retrieval, /chat and PDF rendering with offline Gemini stand-ins.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(defaults.sizes), help="corpus sizes in CVs")
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"), help="JSON results file")
+    parser.add_argument("--work-dir", type=Path, default=None, help="where corpora are built (default: temp dir)")
+    parser.add_argument("--keep-corpus", action="store_true", help="keep generated corpora and indexes")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--embedding-size", type=int, default=defaults.embedding_size)
+    parser.add_argument("--embedding-latency", type=float, default=defaults.embedding_latency_seconds, help="seconds per call")
+    parser.add_argument("--chat-latency", type=float, default=defaults.chat_latency_seconds, help="seconds to first token")
+    parser.add_argument("--chat-token-latency", type=float, default=defaults.chat_token_latency_seconds)
+    parser.add_argument("--retrieval-queries", type=int, default=defaults.retrieval_queries)
+    parser.add_argument("--chat-requests", type=int, default=defaults.chat_requests)
+    parser.add_argument("--chat-concurrency", type=int, default=defaults.chat_concurrency)
+    parser.add_argument("--render-sample", type=int, default=defaults.render_sample)
+    parser.add_argument("--render-workers", type=int, default=defaults.render_workers)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    logging.getLogger("app.benchmarks.suite").setLevel(logging.INFO)
+    report = run_benchmarks(
+        BenchmarkConfig(
+            sizes=args.sizes,
+            work_dir=args.work_dir,
+            keep_corpus=args.keep_corpus,
+            seed=args.seed,
+            embedding_size=args.embedding_size,
+            embedding_latency_seconds=args.embedding_latency,
+            chat_latency_seconds=args.chat_latency,
+            chat_token_latency_seconds=args.chat_token_latency,
+            retrieval_queries=args.retrieval_queries,
+            chat_requests=args.chat_requests,
+            chat_concurrency=args.chat_concurrency,
+            render_sample=args.render_sample,
+            render_workers=args.render_workers,
+        )
+    )
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    for run in report["runs"]:
+        print(
+            f"{run['corpus_size']:>7} CVs | ingest {run['ingest']['cvs_per_second']} CVs/s"
+            f" | retrieval p50 {run['retrieval']['p50_ms']} ms p99 {run['retrieval']['p99_ms']} ms"
+            f" | chat p50 {run['chat']['p50_ms']} ms p99 {run['chat']['p99_ms']} ms"
+            f" | render {run['render']['pdfs_per_second']} PDFs/s"
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
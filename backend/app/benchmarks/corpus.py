@@ -0,0 +1,47 @@
+import argparse
+import logging
+import time
+from pathlib import Path
+
+from app.core.config import AppSettings
+from app.services.corpus_synthesizer import write_corpus
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.providers.cv_image import MockImageGenerator
+from app.wiring.container import build_corpus_synthesizer
+
+
+def main() -> None:
+    settings = AppSettings()
+    parser = argparse.ArgumentParser(
+        prog="python -m app.benchmarks.corpus",
+        description="Write a reproducible synthetic CV corpus (profile records, optionally rendered PDFs).",
+    )
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", type=int, default=0, help="index of the first CV (extends an existing corpus)")
+    parser.add_argument("--output-dir", type=Path, default=settings.cv_synthetic_dir)
+    parser.add_argument("--render", action="store_true", help="render real PDFs instead of placeholders")
+    parser.add_argument("--render-workers", type=int, default=settings.cv_render_workers)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    renderer = CVPdfRenderer(args.output_dir, max_workers=args.render_workers) if args.render else None
+    started = time.perf_counter()
+    try:
+        paths = write_corpus(
+            build_corpus_synthesizer(settings, args.seed),
+            args.count,
+            args.output_dir,
+            renderer=renderer,
+            photo_path=MockImageGenerator(photos_dir=settings.photos_dir).seed_file if args.render else None,
+            start=args.start,
+            on_progress=lambda done, total: print(f"\r{done}/{total} CVs", end="", flush=True),
+        )
+    finally:
+        if renderer is not None:
+            renderer.close()
+    print(f"\nWrote {len(paths)} CVs to {args.output_dir} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
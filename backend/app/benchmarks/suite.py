@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+from app.core.config import AppSettings
+from app.core.deps import get_candidate_directory, get_rag_service
+from app.server import create_app
+from app.services.corpus_synthesizer import CorpusSynthesizer, write_corpus
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.providers.cv_image import MockImageGenerator
+from app.services.rag import RAGService
+from app.wiring.container import build_candidate_directory, build_rag_service
+
+logger = logging.getLogger(__name__)
+
+RESULTS_SCHEMA_VERSION = 1
+
+
+@dataclass
+class BenchmarkConfig:
+    """Corpus sizes and the simulated latency of the offline Gemini stand-ins."""
+
+    sizes: Sequence[int] = (100, 10_000, 100_000)
+    work_dir: Optional[Path] = None
+    keep_corpus: bool = False
+    seed: int = 0
+    embedding_size: int = 256
+    embedding_latency_seconds: float = 0.05
+    chat_latency_seconds: float = 0.3
+    chat_token_latency_seconds: float = 0.0
+    retrieval_queries: int = 200
+    chat_requests: int = 200
+    chat_concurrency: int = 16
+    render_sample: int = 200
+    render_workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+
+
+def run_benchmarks(config: BenchmarkConfig) -> Dict[str, object]:
+    """Run every benchmark at each corpus size; returns a JSON-serializable report."""
+    runs = []
+    for size in config.sizes:
+        root = Path(tempfile.mkdtemp(prefix=f"cv-bench-{size}-", dir=config.work_dir))
+        try:
+            runs.append(run_corpus_benchmark(config, size, root))
+        finally:
+            if not config.keep_corpus:
+                shutil.rmtree(root, ignore_errors=True)
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "platform": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {key: str(value) if isinstance(value, Path) else value for key, value in asdict(config).items()},
+        "runs": runs,
+    }
+
+
+def run_corpus_benchmark(config: BenchmarkConfig, size: int, root: Path) -> Dict[str, object]:
+    settings = _settings(config, root)
+    settings.ensure_directories()
+    logger.info("Benchmarking corpus of %d CVs in %s.", size, root)
+
+    render = _build_corpus(config, settings, size)
+    service = build_rag_service(settings)
+    start = time.perf_counter()
+    documents = service.ingest()
+    ingest_seconds = time.perf_counter() - start
+    service.warm_up()
+
+    return {
+        "corpus_size": size,
+        "render": render,
+        "ingest": {
+            "seconds": round(ingest_seconds, 3),
+            "cvs_per_second": round(size / ingest_seconds, 2),
+            "cvs_indexed": documents,
+        },
+        "retrieval": _bench_retrieval(service, config),
+        "chat": asyncio.run(_bench_chat(service, settings, config)),
+    }
+
+
+def _settings(config: BenchmarkConfig, root: Path) -> AppSettings:
+    return AppSettings(
+        static_dir=root / "static",
+        rag_index_dir=root / "index",
+        rag_cache_dir=root / "index" / "cache",
+        photos_dir=root / "photos",
+        google_genai_api_key="",
+        use_mock_rag_models=True,
+        rag_mock_embedding_size=config.embedding_size,
+        rag_mock_embedding_latency_seconds=config.embedding_latency_seconds,
+        rag_mock_chat_latency_seconds=config.chat_latency_seconds,
+        rag_mock_chat_token_latency_seconds=config.chat_token_latency_seconds,
+        # Every request should pay for retrieval and the LLM call.
+        rag_answer_cache_backend="none",
+        rag_query_embedding_cache_size=0,
+    )
+
+
+def _build_corpus(config: BenchmarkConfig, settings: AppSettings, size: int) -> Dict[str, object]:
+    """Synthesize ``size`` CVs; times rendering on a sample of real PDFs.
+
+    Ingest and the candidate index read the profile records, so CVs beyond the render
+    sample are written records-only to keep corpus setup out of the measurements.
+    """
+    synthesizer = CorpusSynthesizer(seed=config.seed)
+    sample = min(size, config.render_sample)
+    renderer = CVPdfRenderer(settings.static_dir, max_workers=config.render_workers)
+    try:
+        start = time.perf_counter()
+        paths = write_corpus(
+            synthesizer,
+            sample,
+            settings.static_dir,
+            renderer=renderer,
+            photo_path=MockImageGenerator(photos_dir=settings.photos_dir).seed_file,
+        )
+        render_seconds = time.perf_counter() - start
+    finally:
+        renderer.close()
+    write_corpus(synthesizer, size - sample, settings.static_dir, start=sample)
+    return {
+        "pdfs": len(paths),
+        "seconds": round(render_seconds, 3),
+        "pdfs_per_second": round(len(paths) / render_seconds, 2) if render_seconds else None,
+        "workers": config.render_workers,
+    }
+
+
+def _questions(count: int) -> List[str]:
+    topics = ["Kubernetes", "Python", "prompt engineering", "TypeScript", "LLM fine-tuning", "mentoring"]
+    return [f"Who has shipped {topics[position % len(topics)]} work in role #{position}?" for position in range(count)]
+
+
+def _bench_retrieval(service: RAGService, config: BenchmarkConfig) -> Dict[str, object]:
+    latencies = []
+    for question in _questions(config.retrieval_queries):
+        start = time.perf_counter()
+        service.retrieve(question)
+        latencies.append(time.perf_counter() - start)
+    return {"queries": len(latencies), **_percentiles(latencies)}
+
+
+async def _bench_chat(service: RAGService, settings: AppSettings, config: BenchmarkConfig) -> Dict[str, object]:
+    app = create_app()
+    directory = build_candidate_directory(settings)
+    app.dependency_overrides[get_rag_service] = lambda: service
+    app.dependency_overrides[get_candidate_directory] = lambda: directory
+    semaphore = asyncio.Semaphore(config.chat_concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def ask(client: httpx.AsyncClient, question: str) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/chat", json={"message": question})
+            latencies.append(time.perf_counter() - start)
+            errors += response.status_code != 200
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(ask(client, question) for question in _questions(config.chat_requests)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "concurrency": config.chat_concurrency,
+        "errors": errors,
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else None,
+        **_percentiles(latencies),
+    }
+
+
+def _percentiles(latencies: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not latencies:
+        return {"p50_ms": None, "p99_ms": None}
+    p50, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 99])
+    return {"p50_ms": round(float(p50), 3), "p99_ms": round(float(p99), 3)}
@@ -1,10 +1,57 @@
+import os
+from typing import Tuple
+
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
+from kombu import Exchange, Queue
 
+from app.core import metrics
 from app.core.config import AppSettings
 
+# The Redis transport consumes lower numbers first; both match kombu's default priority steps.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 6
+
 settings = AppSettings()
 settings.ensure_directories()
 
+
+def task_routes(settings: AppSettings) -> dict:
+    """Ingest gets its own queue; single CVs jump ahead of batch and corpus jobs."""
+    ingest = {"queue": settings.celery_ingest_queue, "priority": PRIORITY_INTERACTIVE}
+    interactive = {"queue": settings.celery_generation_queue, "priority": PRIORITY_INTERACTIVE}
+    bulk = {"queue": settings.celery_generation_queue, "priority": PRIORITY_BULK}
+    return {
+        "rag.ingest": ingest,
+        "cv.generate": interactive,
+        "cv.generate_mock": interactive,
+        "cv.generate_batch": bulk,
+        "cv.synthesize_corpus": bulk,
+    }
+
+
+def worker_pool_options(settings: AppSettings) -> Tuple[Tuple[str, ...], int, int]:
+    """Queues, concurrency and prefetch multiplier for ``settings.celery_worker_pool``."""
+    if settings.celery_worker_pool == "ingest":
+        return (
+            (settings.celery_ingest_queue,),
+            settings.celery_ingest_concurrency,
+            settings.celery_ingest_prefetch_multiplier,
+        )
+    if settings.celery_worker_pool == "generation":
+        return (
+            (settings.celery_generation_queue,),
+            settings.celery_generation_concurrency,
+            settings.celery_generation_prefetch_multiplier,
+        )
+    # One worker for both queues (local development): the two pools' slots combined.
+    return (
+        (settings.celery_generation_queue, settings.celery_ingest_queue),
+        settings.celery_generation_concurrency + settings.celery_ingest_concurrency,
+        min(settings.celery_generation_prefetch_multiplier, settings.celery_ingest_prefetch_multiplier),
+    )
+
+
 celery_app = Celery("cv_screener")
 celery_app.conf.broker_url = settings.celery_broker_url
 celery_app.conf.result_backend = settings.celery_result_backend
@@ -12,4 +59,22 @@ celery_app.conf.accept_content = ["json"]
 celery_app.conf.result_serializer = "json"
 celery_app.conf.task_serializer = "json"
 celery_app.conf.imports = ("app.tasks.cv_tasks",)
+celery_app.conf.task_routes = task_routes(settings)
+celery_app.conf.task_default_queue = settings.celery_generation_queue
+_queues, celery_app.conf.worker_concurrency, celery_app.conf.worker_prefetch_multiplier = worker_pool_options(settings)
+# Workers consume only their pool's queues; producers route by name regardless.
+celery_app.conf.task_queues = tuple(Queue(name, Exchange(name), routing_key=name) for name in _queues)
 celery_app.autodiscover_tasks(["app.tasks"])
+
+
+@worker_init.connect
+def _start_worker_metrics(**_kwargs) -> None:
+    # Runs in the parent before the pool forks, so children write into a clean directory.
+    metrics.reset_multiprocess_dir()
+    if settings.worker_metrics_port:
+        metrics.start_metrics_server(settings.worker_metrics_port)
+
+
+@worker_process_shutdown.connect
+def _release_worker_metrics(**_kwargs) -> None:
+    metrics.mark_process_dead(os.getpid())
@@ -1,14 +1,67 @@
 from pathlib import Path
-from typing import List
+from typing import List, Literal
 
 from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_CORS = ["http://localhost:3000", "http://127.0.0.1:3000"]
+DEFAULT_CV_TEXT_PROFILES_PER_REQUEST = 1
+DEFAULT_CV_TEXT_MAX_ATTEMPTS = 3
+DEFAULT_CV_PHOTO_POOL_VARIANTS_PER_KEY = 6
+DEFAULT_CV_PHOTO_POOL_MAX_IMAGES = 500
+DEFAULT_CV_PHOTO_POOL_MAX_AGE_SECONDS = 7 * 24 * 3600
+DEFAULT_CV_PHOTO_IMAGES_PER_REQUEST = 4
+DEFAULT_CV_RENDER_WORKERS = 2
+DEFAULT_CV_RENDER_PHOTO_SIZE_PX = 236
+DEFAULT_CV_RENDER_PHOTO_QUALITY = 80
+DEFAULT_CV_BATCH_MAX_COUNT = 500
+DEFAULT_CV_BATCH_TEXT_CONCURRENCY = 4
+DEFAULT_CV_BATCH_IMAGE_CONCURRENCY = 2
+DEFAULT_CV_BATCH_RENDER_CONCURRENCY = 1
+DEFAULT_CV_BATCH_PIPELINE_BUFFER = 8
+DEFAULT_CV_SYNTHETIC_MAX_COUNT = 200_000
+DEFAULT_CANDIDATE_INDEX_REFRESH_SECONDS = 5.0
+DEFAULT_CANDIDATE_ANSWER_MAX_LISTED = 20
 DEFAULT_RAG_CHUNK_SIZE = 1000
 DEFAULT_RAG_CHUNK_OVERLAP = 200
 DEFAULT_RAG_RETRIEVAL_K = 4
+DEFAULT_RAG_INDEX_GC_GRACE_SECONDS = 600
+DEFAULT_RAG_RELOAD_INTERVAL_SECONDS = 2.0
+DEFAULT_RAG_EXTRACTION_WORKERS = 4
+DEFAULT_RAG_EXTRACTION_TIMEOUT_SECONDS = 30.0
+DEFAULT_RAG_EMBEDDING_BATCH_SIZE = 100
+DEFAULT_RAG_EMBEDDING_CONCURRENCY = 4
+DEFAULT_RAG_EMBEDDING_REQUESTS_PER_MINUTE = 1500
+DEFAULT_RAG_EMBEDDING_MAX_RETRIES = 3
+DEFAULT_RAG_ANN_MIN_VECTORS = 10_000
+DEFAULT_RAG_IVF_NLIST = 1024
+DEFAULT_RAG_IVF_NPROBE = 16
+DEFAULT_RAG_HNSW_M = 32
+DEFAULT_RAG_HNSW_EF_CONSTRUCTION = 80
+DEFAULT_RAG_HNSW_EF_SEARCH = 64
+DEFAULT_RAG_PQ_M = 64
+DEFAULT_RAG_PQ_NBITS = 8
+DEFAULT_RAG_HYBRID_CANDIDATES = 20
+DEFAULT_RAG_RRF_K = 60
+DEFAULT_RAG_BM25_K1 = 1.2
+DEFAULT_RAG_BM25_B = 0.75
+DEFAULT_RAG_CONTEXT_TOKEN_BUDGET = 3000
+DEFAULT_RAG_CONTEXT_MAX_CHUNKS = 24
+DEFAULT_RAG_CONTEXT_CANDIDATES = 24
+DEFAULT_RAG_QUERY_EMBEDDING_CACHE_SIZE = 1024
+DEFAULT_RAG_ANSWER_CACHE_SIZE = 512
+DEFAULT_RAG_ANSWER_CACHE_TTL_SECONDS = 3600
+DEFAULT_RAG_MOCK_EMBEDDING_SIZE = 768
+DEFAULT_WORKER_METRICS_PORT = 9808
+DEFAULT_CACHE_REDIS_TIMEOUT_SECONDS = 0.5
+DEFAULT_TASK_EVENTS_TTL_SECONDS = 3600
+DEFAULT_TASK_EVENTS_KEEPALIVE_SECONDS = 15.0
+DEFAULT_CELERY_INGEST_CONCURRENCY = 1
+DEFAULT_CELERY_GENERATION_CONCURRENCY = 4
+DEFAULT_CELERY_PREFETCH_MULTIPLIER = 1
+DEFAULT_RAG_INGEST_LOCK_TTL_SECONDS = 6 * 3600
+DEFAULT_RAG_INGEST_RETRY_SECONDS = 10.0
 
 
 class AppSettings(BaseSettings):
@@ -28,7 +81,10 @@ class AppSettings(BaseSettings):
     # Directories
     static_dir: Path = BASE_DIR / "static"
     rag_index_dir: Path = BASE_DIR / "cv_faiss_index"
+    rag_cache_dir: Path = BASE_DIR / "cv_faiss_index" / "cache"
     photos_dir: Path = BASE_DIR / "photos"
+    # Synthetic corpora (POST /cv/synthesize); kept apart from the served static_dir.
+    cv_synthetic_dir: Path = BASE_DIR / "synthetic_cvs"
     placeholder_photo: str = "placeholder.png"
     use_mock_generators: bool = False
 
@@ -38,18 +94,113 @@ class AppSettings(BaseSettings):
     google_genai_image_model_name: str = "imagen-4.0-fast-generate-001"
     google_rag_embedding_model: str = "models/text-embedding-004"
 
+    # Headshot pool (reused photos instead of one image call per CV)
+    cv_photo_pool_enabled: bool = True
+    cv_photo_pool_variants_per_key: int = DEFAULT_CV_PHOTO_POOL_VARIANTS_PER_KEY
+    cv_photo_pool_max_images: int = DEFAULT_CV_PHOTO_POOL_MAX_IMAGES
+    cv_photo_pool_max_age_seconds: int = DEFAULT_CV_PHOTO_POOL_MAX_AGE_SECONDS
+    cv_photo_images_per_request: int = DEFAULT_CV_PHOTO_IMAGES_PER_REQUEST
+
+    # PDF rendering
+    cv_render_workers: int = DEFAULT_CV_RENDER_WORKERS
+    cv_render_photo_size_px: int = DEFAULT_CV_RENDER_PHOTO_SIZE_PX
+    cv_render_photo_quality: int = DEFAULT_CV_RENDER_PHOTO_QUALITY
+
+    # Batch CV generation
+    cv_text_profiles_per_request: int = DEFAULT_CV_TEXT_PROFILES_PER_REQUEST
+    cv_text_max_attempts: int = DEFAULT_CV_TEXT_MAX_ATTEMPTS
+    cv_batch_max_count: int = DEFAULT_CV_BATCH_MAX_COUNT
+    cv_batch_text_concurrency: int = DEFAULT_CV_BATCH_TEXT_CONCURRENCY
+    cv_batch_image_concurrency: int = DEFAULT_CV_BATCH_IMAGE_CONCURRENCY
+    cv_batch_render_concurrency: int = DEFAULT_CV_BATCH_RENDER_CONCURRENCY
+    cv_batch_pipeline_buffer: int = DEFAULT_CV_BATCH_PIPELINE_BUFFER
+
+    # Synthetic corpora for scale testing (no Gemini calls)
+    cv_synthetic_max_count: int = DEFAULT_CV_SYNTHETIC_MAX_COUNT
+    # JSON object overriding CorpusVocabulary word lists; empty uses the built-in lists.
+    cv_synthetic_vocabulary_path: str = ""
+
+    # Structured candidate index (filters and no-LLM chat answers)
+    candidate_index_refresh_seconds: float = DEFAULT_CANDIDATE_INDEX_REFRESH_SECONDS
+    candidate_answer_max_listed: int = DEFAULT_CANDIDATE_ANSWER_MAX_LISTED
+    # Answer /chat count/list questions made only of indexed filters without RAG.
+    candidate_exact_answers: bool = True
+
     # RAG
     rag_chunk_size: int = DEFAULT_RAG_CHUNK_SIZE
     rag_chunk_overlap: int = DEFAULT_RAG_CHUNK_OVERLAP
+    rag_chunking: Literal["sections", "recursive"] = "sections"
     rag_retriever_k: int = DEFAULT_RAG_RETRIEVAL_K
+    rag_index_gc_grace_seconds: int = DEFAULT_RAG_INDEX_GC_GRACE_SECONDS
+    rag_reload_interval_seconds: float = DEFAULT_RAG_RELOAD_INTERVAL_SECONDS
+    rag_extraction_workers: int = DEFAULT_RAG_EXTRACTION_WORKERS
+    rag_extraction_timeout_seconds: float = DEFAULT_RAG_EXTRACTION_TIMEOUT_SECONDS
+    rag_embedding_batch_size: int = DEFAULT_RAG_EMBEDDING_BATCH_SIZE
+    rag_embedding_concurrency: int = DEFAULT_RAG_EMBEDDING_CONCURRENCY
+    rag_embedding_requests_per_minute: int = DEFAULT_RAG_EMBEDDING_REQUESTS_PER_MINUTE
+    rag_embedding_max_retries: int = DEFAULT_RAG_EMBEDDING_MAX_RETRIES
+    # ANN indexes never read the float32 vectors.npy while serving; it stays on disk as the
+    # exact source for incremental ingest. "hnsw" holds float32 vectors in RAM, "hnsw_sq8" int8.
+    rag_index_type: Literal["flat", "ivf_flat", "hnsw", "hnsw_sq8", "ivf_sq8", "ivf_pq"] = "flat"
+    rag_ann_min_vectors: int = DEFAULT_RAG_ANN_MIN_VECTORS
+    rag_ivf_nlist: int = DEFAULT_RAG_IVF_NLIST
+    rag_ivf_nprobe: int = DEFAULT_RAG_IVF_NPROBE
+    rag_hnsw_m: int = DEFAULT_RAG_HNSW_M
+    rag_hnsw_ef_construction: int = DEFAULT_RAG_HNSW_EF_CONSTRUCTION
+    rag_hnsw_ef_search: int = DEFAULT_RAG_HNSW_EF_SEARCH
+    rag_pq_m: int = DEFAULT_RAG_PQ_M
+    rag_pq_nbits: int = DEFAULT_RAG_PQ_NBITS
+    rag_retrieval_mode: Literal["dense", "hybrid"] = "dense"
+    rag_hybrid_candidates: int = DEFAULT_RAG_HYBRID_CANDIDATES
+    rag_rrf_k: int = DEFAULT_RAG_RRF_K
+    rag_bm25_k1: float = DEFAULT_RAG_BM25_K1
+    rag_bm25_b: float = DEFAULT_RAG_BM25_B
+    # Packing retrieves rag_context_candidates chunks, then groups and merges them under
+    # this budget, admitting at most rag_context_max_chunks. 0 disables packing: the
+    # prompt gets exactly rag_retriever_k chunks.
+    rag_context_token_budget: int = DEFAULT_RAG_CONTEXT_TOKEN_BUDGET
+    rag_context_max_chunks: int = DEFAULT_RAG_CONTEXT_MAX_CHUNKS
+    rag_context_candidates: int = DEFAULT_RAG_CONTEXT_CANDIDATES
+    rag_query_embedding_cache_size: int = DEFAULT_RAG_QUERY_EMBEDDING_CACHE_SIZE
+    rag_answer_cache_backend: Literal["none", "memory", "redis"] = "memory"
+    rag_answer_cache_size: int = DEFAULT_RAG_ANSWER_CACHE_SIZE
+    rag_answer_cache_ttl_seconds: int = DEFAULT_RAG_ANSWER_CACHE_TTL_SECONDS
+    # Deterministic offline embeddings/chat instead of Gemini, with simulated latency.
+    use_mock_rag_models: bool = False
+    rag_mock_embedding_size: int = DEFAULT_RAG_MOCK_EMBEDDING_SIZE
+    rag_mock_embedding_latency_seconds: float = 0.0
+    rag_mock_chat_latency_seconds: float = 0.0
+    rag_mock_chat_token_latency_seconds: float = 0.0
 
     # Celery / infrastructure
     celery_broker_url: str = "redis://redis:6379/0"
     celery_result_backend: str = "db+postgresql+psycopg2://ai:ai@postgres:5432/ai_cv"
+    cache_redis_url: str = "redis://redis:6379/1"
+    # Connect/read timeout for cache_redis_url clients, so a hung Redis degrades instead of blocking.
+    cache_redis_timeout_seconds: float = DEFAULT_CACHE_REDIS_TIMEOUT_SECONDS
+    # Ingest and CV generation run on separate queues, each with its own worker pool.
+    # A worker consumes the queues of ``celery_worker_pool`` ("all" for a single dev worker).
+    celery_ingest_queue: str = "ingest"
+    celery_generation_queue: str = "generation"
+    celery_worker_pool: Literal["all", "ingest", "generation"] = "all"
+    celery_ingest_concurrency: int = DEFAULT_CELERY_INGEST_CONCURRENCY
+    celery_ingest_prefetch_multiplier: int = DEFAULT_CELERY_PREFETCH_MULTIPLIER
+    celery_generation_concurrency: int = DEFAULT_CELERY_GENERATION_CONCURRENCY
+    celery_generation_prefetch_multiplier: int = DEFAULT_CELERY_PREFETCH_MULTIPLIER
+    # At most one ingest running and one pending; repeated POST /rag/ingest attach to the pending one.
+    rag_ingest_coalescing: bool = True
+    rag_ingest_lock_ttl_seconds: int = DEFAULT_RAG_INGEST_LOCK_TTL_SECONDS
+    rag_ingest_retry_seconds: float = DEFAULT_RAG_INGEST_RETRY_SECONDS
+    # Task progress events over Redis pub/sub (GET /tasks/{id}/events); "none" leaves polling only.
+    task_events_backend: Literal["none", "redis"] = "none"
+    task_events_ttl_seconds: int = DEFAULT_TASK_EVENTS_TTL_SECONDS
+    task_events_keepalive_seconds: float = DEFAULT_TASK_EVENTS_KEEPALIVE_SECONDS
+    # Prometheus exporter started by the Celery worker; 0 disables it.
+    worker_metrics_port: int = DEFAULT_WORKER_METRICS_PORT
 
     @model_validator(mode="after")
     def _normalize_paths(self) -> "AppSettings":
-        for attr in ("static_dir", "rag_index_dir", "photos_dir"):
+        for attr in ("static_dir", "rag_index_dir", "rag_cache_dir", "photos_dir", "cv_synthetic_dir"):
             path = Path(getattr(self, attr))
             if not path.is_absolute():
                 path = (BASE_DIR / path).resolve()
@@ -65,5 +216,5 @@ class AppSettings(BaseSettings):
 
     def ensure_directories(self) -> None:
         """Create required directories up front."""
-        for path in (self.static_dir, self.rag_index_dir, self.photos_dir):
+        for path in (self.static_dir, self.rag_index_dir, self.rag_cache_dir, self.photos_dir):
             Path(path).mkdir(parents=True, exist_ok=True)
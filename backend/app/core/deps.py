@@ -1,11 +1,22 @@
 from functools import lru_cache
+from typing import Optional
 
 from fastapi import Depends
 
 from app.core.config import AppSettings
+from app.services.candidate_index import CandidateDirectory
 from app.services.cv_generator import CVGeneratorService
+from app.services.ingest_coalescer import IngestCoalescer
 from app.services.rag import RAGService
-from app.wiring.container import build_cv_generator, build_mock_cv_generator, build_rag_service
+from app.services.task_events import TaskEventStream
+from app.wiring.container import (
+    build_candidate_directory,
+    build_ingest_coalescer,
+    build_cv_generator,
+    build_mock_cv_generator,
+    build_rag_service,
+    build_task_event_stream,
+)
 
 
 @lru_cache
@@ -23,5 +34,25 @@ def get_mock_cv_generator(settings: AppSettings = Depends(get_settings)) -> CVGe
     return build_mock_cv_generator(settings)
 
 
-def get_rag_service(settings: AppSettings = Depends(get_settings)) -> RAGService:
-    return build_rag_service(settings)
+@lru_cache
+def get_rag_service() -> RAGService:
+    """Process-wide RAG service so the loaded index survives across requests."""
+    return build_rag_service(get_settings())
+
+
+@lru_cache
+def get_candidate_directory() -> CandidateDirectory:
+    """Process-wide candidate index, refreshed incrementally from profile records."""
+    return build_candidate_directory(get_settings())
+
+
+@lru_cache
+def get_task_event_stream() -> Optional[TaskEventStream]:
+    """Process-wide Redis reader for task progress events; ``None`` when disabled."""
+    return build_task_event_stream(get_settings())
+
+
+@lru_cache
+def get_ingest_coalescer() -> Optional[IngestCoalescer]:
+    """Process-wide ingest coalescer; ``None`` when coalescing is disabled."""
+    return build_ingest_coalescer(get_settings())
@@ -0,0 +1,146 @@
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+# Celery's prefork children each keep their own counters; with this set (before the
+# process starts) prometheus_client writes them to shared files the exporter merges.
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+# From a cached query embedding (~1 ms) to a full Gemini image call or ingest (minutes).
+_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+STAGE_SECONDS = Histogram(
+    "cv_screener_stage_duration_seconds",
+    "Wall time spent in a pipeline stage.",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+STAGE_FAILURES = Counter(
+    "cv_screener_stage_failures_total",
+    "Pipeline stage calls that raised.",
+    ["stage"],
+)
+STAGE_IN_FLIGHT = Gauge(
+    "cv_screener_stage_in_flight",
+    "Pipeline stage calls currently running.",
+    ["stage"],
+    multiprocess_mode="livesum",
+)
+ITEMS = Counter(
+    "cv_screener_items_total",
+    "Items processed by pipeline stages (CVs, PDFs, chunks, tokens).",
+    ["kind"],
+)
+
+# Labelled children are resolved once per stage; ``labels()`` takes a lock and a dict lookup.
+_stage_children: Dict[str, Tuple[Histogram, Counter, Gauge]] = {}
+_item_children: Dict[str, Counter] = {}
+
+F = TypeVar("F", bound=Callable)
+# Called with ``(stage, "started" | "finished")``, e.g. to publish task progress events.
+StageListener = Callable[[str, str], None]
+
+
+def _stage(name: str) -> Tuple[Histogram, Counter, Gauge]:
+    children = _stage_children.get(name)
+    if children is None:
+        children = _stage_children.setdefault(
+            name,
+            (STAGE_SECONDS.labels(name), STAGE_FAILURES.labels(name), STAGE_IN_FLIGHT.labels(name)),
+        )
+    return children
+
+
+@contextmanager
+def timed(stage: str, listener: Optional[StageListener] = None) -> Iterator[None]:
+    """Record the duration, failure and in-flight count of the wrapped block as ``stage``.
+
+    ``listener`` is told when the stage starts and when it finishes successfully.
+    """
+    seconds, failures, in_flight = _stage(stage)
+    if listener is not None:
+        listener(stage, "started")
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        failures.inc()
+        raise
+    finally:
+        seconds.observe(time.perf_counter() - start)
+        in_flight.dec()
+    if listener is not None:
+        listener(stage, "finished")
+
+
+def instrumented(stage: str) -> Callable[[F], F]:
+    """Decorator form of :func:`timed` for synchronous callables."""
+
+    def decorate(func: F) -> F:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def count_items(kind: str, amount: float = 1) -> None:
+    child = _item_children.get(kind)
+    if child is None:
+        child = _item_children.setdefault(kind, ITEMS.labels(kind))
+    child.inc(amount)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """The default registry, or one aggregating every process in multiprocess mode."""
+    if not os.environ.get(MULTIPROC_ENV):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Prometheus text exposition of all metrics visible to this process."""
+    return generate_latest(metrics_registry())
+
+
+def reset_multiprocess_dir() -> None:
+    """Empty the multiprocess directory so a restarted worker does not report stale files."""
+    directory = os.environ.get(MULTIPROC_ENV)
+    if not directory:
+        return
+    path = Path(directory)
+    shutil.rmtree(path, ignore_errors=True)
+    path.mkdir(parents=True, exist_ok=True)
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve ``/metrics`` on ``port`` from a background thread (used by the Celery worker)."""
+    start_http_server(port, registry=metrics_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a finished worker child's live gauges from the multiprocess aggregate."""
+    if os.environ.get(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid)
@@ -19,3 +19,11 @@ class CandidateProfile(BaseModel):
     languages: List[str]
     gender: Optional[str] = None
     photo_path: Optional[Path] = Field(default=None, exclude=True)
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one CV in a batch generation run."""
+
+    index: int
+    file: Optional[str] = None
+    error: Optional[str] = None
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -5,8 +6,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api.routes import chat, cv, health, rag, tasks
-from app.core.deps import get_settings
+from app.api.routes import candidates, chat, cv, health, metrics, rag, screen, tasks
+from app.core.deps import get_rag_service, get_settings
+from app.services.rag import RAGServiceError
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +18,21 @@ async def lifespan(app: FastAPI):
     settings = get_settings()
     settings.ensure_directories()
     logger.info("Starting application with static dir %s", settings.static_dir)
+    await _warm_rag_service()
     yield
 
 
+async def _warm_rag_service() -> None:
+    rag_service = get_rag_service()
+    try:
+        await asyncio.to_thread(rag_service.warm_up)
+        logger.info("RAG index loaded into memory.")
+    except RAGServiceError as exc:
+        logger.warning("RAG service starting cold: %s", exc)
+    except Exception:  # pragma: no cover - keep the API up even with a broken index
+        logger.exception("Failed to warm up RAG service; it will retry on first chat request.")
+
+
 def create_app() -> FastAPI:
     settings = get_settings()
     app = FastAPI(
@@ -42,7 +56,10 @@ def create_app() -> FastAPI:
 
     app.include_router(cv.router)
     app.include_router(chat.router)
+    app.include_router(candidates.router)
+    app.include_router(screen.router)
     app.include_router(rag.router)
     app.include_router(tasks.router)
     app.include_router(health.router)
+    app.include_router(metrics.router)
     return app
@@ -0,0 +1,307 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.models import CandidateProfile
+from app.services.profile_records import PROFILE_RECORD_SUFFIX, read_profile_record
+
+_COUNT_INTENT = re.compile(r"\b(how many|number of|count)\b")
+_LIST_INTENT = re.compile(r"\b(list|which|who|show|find|name)\b")
+_CANDIDATE_NOUN = re.compile(r"\b(candidates?|people|persons?|applicants?|cvs?|profiles?)\b")
+_GRADUATION = re.compile(r"\bgraduat\w*\s+(after|before|since|in)\s+((?:19|20)\d{2})\b")
+# Words a question may contain besides recognised filters and still be answered exactly.
+# Anything else (negation, "or", comparisons, ranking, companies, years of experience...)
+# carries meaning the index cannot express, so the question goes to RAG.
+_FILLER_WORDS = frozenset(
+    """
+    how many number of count list which who whom what show find name give tell me us all
+    candidate candidates people person persons applicant applicants cv cvs profile profiles
+    the a an any our there are is do does did can could please currently
+    and with that have has having know knows knowing speak speaks speaking use uses using
+    skilled skills skill language languages in from at based located living live lives also both
+    """.split()
+)
+
+
+def _normalize(value: object) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+@dataclass(frozen=True)
+class CandidateRecord:
+    filename: str
+    name: str
+    title: str
+    location: str
+    skills: Tuple[str, ...]
+    languages: Tuple[str, ...]
+    graduation_year: Optional[int]
+
+    @classmethod
+    def from_profile(cls, filename: str, profile: CandidateProfile) -> "CandidateRecord":
+        years = []
+        for edu in profile.education:
+            match = re.search(r"(?:19|20)\d{2}", str(edu.get("graduation_year", "")))
+            if match:
+                years.append(int(match.group()))
+        return cls(
+            filename=filename,
+            name=profile.name,
+            title=profile.title,
+            location=str(profile.contact.get("location") or ""),
+            skills=tuple(profile.skills),
+            languages=tuple(profile.languages),
+            graduation_year=max(years) if years else None,
+        )
+
+
+@dataclass
+class CandidateQuery:
+    """Conjunctive filter: every listed skill/language, location part and title words must match."""
+
+    skills: List[str] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+    location: Optional[str] = None
+    title: Optional[str] = None
+    graduated_after: Optional[int] = None
+    graduated_before: Optional[int] = None
+
+    def is_empty(self) -> bool:
+        return not (
+            self.skills
+            or self.languages
+            or self.location
+            or self.title
+            or self.graduated_after is not None
+            or self.graduated_before is not None
+        )
+
+    def describe(self) -> str:
+        parts = []
+        if self.skills:
+            parts.append(f"skills {' and '.join(self.skills)}")
+        if self.languages:
+            parts.append(f"languages {' and '.join(self.languages)}")
+        if self.location:
+            parts.append(f"location {self.location}")
+        if self.title:
+            parts.append(f"title '{self.title}'")
+        if self.graduated_after is not None:
+            parts.append(f"graduated after {self.graduated_after}")
+        if self.graduated_before is not None:
+            parts.append(f"graduated before {self.graduated_before}")
+        return ", ".join(parts) or "no filters"
+
+
+class CandidateIndex:
+    """Immutable inverted index over structured candidate fields.
+
+    Skills, languages, location parts (comma-separated) and title words map to sorted
+    row arrays that are intersected per query; graduation years are a numpy column
+    for range filters. Built once per snapshot of profile records.
+    """
+
+    def __init__(self, records: Iterable[CandidateRecord]) -> None:
+        self.records: List[CandidateRecord] = sorted(records, key=lambda record: record.filename)
+        postings: Dict[str, List[int]] = {}
+        # Display form (first spelling seen) for each normalized skill/language/location.
+        self._labels: Dict[str, str] = {}
+        for row, record in enumerate(self.records):
+            labels = {f"skill:{_normalize(skill)}": skill for skill in record.skills}
+            labels.update({f"language:{_normalize(language)}": language for language in record.languages})
+            labels.update(
+                {f"location:{_normalize(part)}": part.strip() for part in record.location.split(",") if part.strip()}
+            )
+            for key, label in labels.items():
+                self._labels.setdefault(key, label)
+            keys = set(labels) | {f"title:{word}" for word in re.findall(r"\w+", record.title.lower())}
+            for key in keys:
+                postings.setdefault(key, []).append(row)
+        self._postings = {key: np.asarray(rows, dtype=np.int64) for key, rows in postings.items()}
+        self._graduation_years = np.asarray(
+            [record.graduation_year or 0 for record in self.records], dtype=np.int32
+        )
+        self._vocabulary_keys = sorted(self._labels, key=lambda key: len(key.split(":", 1)[1]), reverse=True)
+        self._vocabulary_pattern: Optional[re.Pattern] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def search(self, query: CandidateQuery) -> np.ndarray:
+        """Rows matching ``query``, in filename order."""
+        keys = [f"skill:{_normalize(skill)}" for skill in query.skills]
+        keys += [f"language:{_normalize(language)}" for language in query.languages]
+        if query.location:
+            keys.append(f"location:{_normalize(query.location)}")
+        if query.title:
+            keys += [f"title:{word}" for word in re.findall(r"\w+", query.title.lower())]
+
+        rows = np.arange(len(self.records), dtype=np.int64)
+        for key in sorted(keys, key=lambda key: len(self._postings.get(key, ()))):
+            rows = np.intersect1d(rows, self._postings.get(key, np.empty(0, dtype=np.int64)), assume_unique=True)
+            if not len(rows):
+                return rows
+        years = self._graduation_years[rows]
+        if query.graduated_after is not None:
+            rows = rows[years > query.graduated_after]
+            years = self._graduation_years[rows]
+        if query.graduated_before is not None:
+            rows = rows[(years > 0) & (years < query.graduated_before)]
+        return rows
+
+    def parse_question(self, question: str) -> Optional[Tuple[str, CandidateQuery]]:
+        """Recognise count/list questions over indexed fields; ``None`` means use RAG.
+
+        Only questions made entirely of filters and filler words are recognised, so
+        nothing the index cannot express is silently dropped.
+        """
+        text = _normalize(question)
+        intent = "count" if _COUNT_INTENT.search(text) else "list" if _LIST_INTENT.search(text) else None
+        if intent is None or not _CANDIDATE_NOUN.search(text):
+            return None
+
+        query = CandidateQuery()
+        matches = list(self._vocabulary().finditer(text))
+        leftover = _GRADUATION.sub(" ", self._vocabulary().sub(" ", text))
+        if any(word not in _FILLER_WORDS for word in re.findall(r"[\w+#]+", leftover)):
+            return None
+        for match in matches:
+            kind, value = self._match_kind(match)
+            if kind == "skill" and value not in query.skills:
+                query.skills.append(value)
+            elif kind == "language" and value not in query.languages:
+                query.languages.append(value)
+            elif kind == "location" and query.location is None:
+                query.location = value
+        for direction, year in _GRADUATION.findall(text):
+            if direction == "before":
+                query.graduated_before = int(year)
+            elif direction == "in":
+                query.graduated_after, query.graduated_before = int(year) - 1, int(year) + 1
+            else:
+                query.graduated_after = int(year) - (1 if direction == "since" else 0)
+        return (intent, query) if not query.is_empty() else None
+
+    def _vocabulary(self) -> re.Pattern:
+        if self._vocabulary_pattern is None:
+            alternatives = []
+            for position, key in enumerate(self._vocabulary_keys):
+                kind, value = key.split(":", 1)
+                term = re.escape(value)
+                if kind == "location":
+                    term = rf"(?:in|from|at|based in|located in) {term}"
+                alternatives.append(f"(?P<term_{position}>{term})")
+            pattern = r"(?<![\w+#])(?:" + "|".join(alternatives or ["(?!)"]) + r")(?![\w+#])"
+            self._vocabulary_pattern = re.compile(pattern)
+        return self._vocabulary_pattern
+
+    def _match_kind(self, match: re.Match) -> Tuple[str, str]:
+        key = self._vocabulary_keys[int((match.lastgroup or "term_0").split("_", 1)[1])]
+        return key.split(":", 1)[0], self._labels[key]
+
+
+class CandidateDirectory:
+    """Keeps a :class:`CandidateIndex` in sync with the profile sidecars in ``static_dir``.
+
+    Refreshes are throttled and incremental: only new or modified sidecars are parsed.
+    """
+
+    def __init__(
+        self,
+        static_dir: Path,
+        refresh_interval_seconds: float = 5.0,
+        max_listed: int = 20,
+        exact_answers: bool = True,
+    ) -> None:
+        self._static_dir = Path(static_dir)
+        self._refresh_interval_seconds = refresh_interval_seconds
+        self._max_listed = max_listed
+        self._exact_answers = exact_answers
+        self._records: Dict[str, Tuple[int, CandidateRecord]] = {}
+        self._index = CandidateIndex([])
+        self._unstructured = 0
+        self._last_refresh = float("-inf")
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def index(self) -> CandidateIndex:
+        if time.monotonic() - self._last_refresh >= self._refresh_interval_seconds:
+            with self._lock:
+                if time.monotonic() - self._last_refresh >= self._refresh_interval_seconds:
+                    self._refresh()
+                    self._last_refresh = time.monotonic()
+        return self._index
+
+    @property
+    def unstructured_count(self) -> int:
+        """PDFs without a profile record, which the index cannot see."""
+        self.index()
+        return self._unstructured
+
+    def search(self, query: CandidateQuery, offset: int = 0, limit: int = 20) -> Tuple[int, List[CandidateRecord]]:
+        index = self.index()
+        rows = index.search(query)
+        return len(rows), [index.records[row] for row in rows[offset : offset + limit]]
+
+    def answer(self, question: str) -> Optional[str]:
+        """Exact answer for count/list questions, or ``None`` when RAG should handle it.
+
+        Only answers when enabled and every CV has a structured record, so counts
+        cover the corpus.
+        """
+        if not self._exact_answers:
+            return None
+        index = self.index()
+        if not len(index) or self._unstructured:
+            return None
+        parsed = index.parse_question(question)
+        if parsed is None:
+            return None
+        intent, query = parsed
+        rows = index.search(query)
+        total = len(rows)
+        noun = "candidate" if total == 1 else "candidates"
+        lines = [f"{total} {noun} match {query.describe()}" + (":" if total else ".")]
+        for row in rows[: self._max_listed]:
+            record = index.records[row]
+            lines.append(f"- {record.name} - {record.title} ({record.filename})")
+        if total > self._max_listed:
+            lines.append(f"...and {total - self._max_listed} more.")
+        return "\n".join(lines)
+
+    def _refresh(self) -> None:
+        pdf_names = set()
+        sidecars: Dict[str, int] = {}
+        with os.scandir(self._static_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(PROFILE_RECORD_SUFFIX):
+                    sidecars[entry.name[: -len(PROFILE_RECORD_SUFFIX)] + ".pdf"] = entry.stat().st_mtime_ns
+                elif entry.name.endswith(".pdf"):
+                    pdf_names.add(entry.name)
+
+        changed = False
+        for name in [name for name in self._records if name not in pdf_names or name not in sidecars]:
+            del self._records[name]
+            changed = True
+        for name in pdf_names & sidecars.keys():
+            cached = self._records.get(name)
+            if cached is not None and cached[0] == sidecars[name]:
+                continue
+            profile = read_profile_record(self._static_dir / name)
+            if profile is None:
+                self._records.pop(name, None)
+            else:
+                self._records[name] = (sidecars[name], CandidateRecord.from_profile(name, profile))
+            changed = True
+
+        self._unstructured = len(pdf_names) - len(self._records)
+        if changed:
+            self._index = CandidateIndex(record for _, record in self._records.values())
+            self._logger.info("Candidate index rebuilt with %d profiles.", len(self._index))
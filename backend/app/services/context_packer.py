@@ -0,0 +1,105 @@
+import math
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+# Shortest suffix/prefix match treated as splitter overlap rather than coincidence.
+MIN_OVERLAP_CHARS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prose)."""
+    return math.ceil(len(text) / 4)
+
+
+def merge_overlapping(first: str, second: str) -> Optional[str]:
+    """Join two chunks if one contains the other or they share a splitter overlap."""
+    if second in first:
+        return first
+    if first in second:
+        return second
+    for size in range(min(len(first), len(second)) - 1, MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return None
+
+
+class _CandidateGroup:
+    def __init__(self, document: Document) -> None:
+        self.filename = str(document.metadata.get("filename", "unknown"))
+        self.candidate = str(document.metadata.get("candidate") or "")
+        self.title = str(document.metadata.get("title") or "")
+        self.parts: List[str] = []
+
+    def header(self) -> str:
+        if not self.candidate:
+            return f"File: {self.filename}"
+        label = f"{self.candidate} ({self.title})" if self.title else self.candidate
+        return f"File: {self.filename} | Candidate: {label}"
+
+    def body_with(self, text: str) -> List[str]:
+        """Parts after adding ``text``, merged into an overlapping part when possible."""
+        for position, part in enumerate(self.parts):
+            merged = merge_overlapping(part, text) or merge_overlapping(text, part)
+            if merged is not None:
+                return self.parts[:position] + [merged] + self.parts[position + 1 :]
+        return self.parts + [text]
+
+    def render(self, parts: Optional[List[str]] = None) -> str:
+        return "\n".join([self.header(), *(parts if parts is not None else self.parts)])
+
+
+class ContextPacker:
+    """Builds the prompt context from ranked chunks under a token budget.
+
+    Chunks are grouped per file (one header per candidate), overlapping or duplicate
+    chunks from the same file are merged, and chunks are admitted in rank order while
+    the estimated size stays within ``token_budget``, up to ``max_chunks`` of them.
+    """
+
+    def __init__(self, token_budget: int, max_chunks: int) -> None:
+        self.token_budget = token_budget
+        self.max_chunks = max_chunks
+
+    def pack(self, documents: List[Document]) -> List[Document]:
+        """One document per candidate, in order of their best-ranked chunk."""
+        groups: Dict[str, _CandidateGroup] = {}
+        used = 0
+        admitted = 0
+        for document in documents:
+            if admitted >= self.max_chunks:
+                break
+            group = groups.get(str(document.metadata.get("filename", "unknown")))
+            is_new = group is None
+            if group is None:
+                group = _CandidateGroup(document)
+            text = self._strip_heading(document.page_content, group)
+            before = 0 if is_new else estimate_tokens(group.render()) + 1
+            parts = group.body_with(text)
+            cost = estimate_tokens(group.render(parts)) + 1 - before
+            if used + cost > self.token_budget:
+                continue
+            used += cost
+            admitted += 1
+            group.parts = parts
+            if is_new:
+                groups[group.filename] = group
+
+        return [
+            Document(
+                page_content="\n".join(group.parts),
+                metadata={"filename": group.filename, "candidate": group.candidate, "title": group.title},
+            )
+            for group in groups.values()
+        ]
+
+    def format(self, documents: List[Document]) -> str:
+        return "\n\n".join(_CandidateGroup(document).render([document.page_content]) for document in documents)
+
+    @staticmethod
+    def _strip_heading(text: str, group: _CandidateGroup) -> str:
+        # Section chunks open with "Candidate: ..."; the group header already says it.
+        first_line, _, rest = text.partition("\n")
+        if group.candidate and first_line.startswith("Candidate: ") and rest:
+            return rest
+        return text
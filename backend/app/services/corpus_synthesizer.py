@@ -0,0 +1,325 @@
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from fpdf import FPDF
+
+from app.domain.models import CandidateProfile
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.profile_records import write_profile_record
+
+# Profiles are drawn in fixed-size blocks, each from its own seeded generator, so
+# profile ``i`` is the same whatever ``count`` or ``start`` a caller asks for.
+SYNTHESIS_BLOCK_SIZE = 1024
+MAX_JOBS = 4
+CORE_SKILLS_PER_PROFILE = 3
+EXTRA_SKILLS_RANGE = (2, 7)
+
+CorpusProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class CorpusVocabulary:
+    """Word lists synthetic profiles are sampled from; override any field from JSON."""
+
+    first_names: Tuple[str, ...] = (
+        "Avery", "Kai", "Morgan", "Sage", "River", "Amara", "Luca", "Mei", "Noah", "Priya",
+        "Mateo", "Zoe", "Elif", "Tomasz", "Hana", "Omar", "Ingrid", "Diego", "Aisha", "Lars",
+        "Sofia", "Kenji", "Chloe", "Rafael", "Nadia", "Ethan", "Yara", "Jonas", "Leila", "Marco",
+        "Freya", "Arjun", "Camille", "Felix", "Imani", "Sven", "Lucia", "Tariq", "Nora", "Hugo",
+    )
+    last_names: Tuple[str, ...] = (
+        "Singh", "Garcia", "Turner", "Patel", "Davis", "Novak", "Kim", "Okafor", "Rossi", "Schmidt",
+        "Tanaka", "Silva", "Dubois", "Nguyen", "Kowalski", "Haddad", "Larsen", "Moreno", "Chen", "Ibrahim",
+        "Andersson", "Costa", "Yilmaz", "Murphy", "Fischer", "Sato", "Mendes", "Ivanova", "Brown", "Khan",
+        "Jensen", "Lopez", "Weber", "Ali", "Martin", "Bauer", "Nakamura", "Romero", "Walsh", "Ahmed",
+    )
+    # (title, core skills): every profile gets a few of its role's core skills.
+    roles: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+        ("Machine Learning Engineer", ("Python", "PyTorch", "TensorFlow", "MLOps", "SQL")),
+        ("Data Scientist", ("Python", "Pandas", "Statistics", "SQL", "scikit-learn")),
+        ("Data Engineer", ("Python", "Spark", "Airflow", "SQL", "Kafka")),
+        ("Backend Engineer", ("Go", "Java", "PostgreSQL", "Docker", "REST APIs")),
+        ("Frontend Engineer", ("TypeScript", "React", "CSS", "Next.js", "Accessibility")),
+        ("Full Stack Developer", ("TypeScript", "Node.js", "React", "PostgreSQL", "GraphQL")),
+        ("DevOps Engineer", ("Kubernetes", "Terraform", "AWS", "CI/CD", "Linux")),
+        ("Site Reliability Engineer", ("Kubernetes", "Prometheus", "Go", "Linux", "Incident Response")),
+        ("Security Analyst", ("SIEM", "Threat Modeling", "ISO27001", "Penetration Testing", "Python")),
+        ("Product Manager", ("Roadmapping", "User Research", "A/B Testing", "SQL", "Stakeholder Management")),
+        ("UX Designer", ("Figma", "User Research", "Prototyping", "Design Systems", "Accessibility")),
+        ("Mobile Developer", ("Kotlin", "Swift", "Flutter", "Firebase", "CI/CD")),
+        ("AI Researcher", ("Python", "PyTorch", "LLM Fine-tuning", "Reinforcement Learning", "Generative AI")),
+        ("Cloud Architect", ("AWS", "Azure", "GCP", "Terraform", "Networking")),
+        ("QA Engineer", ("Selenium", "Cypress", "Test Automation", "Python", "CI/CD")),
+        ("Embedded Software Engineer", ("C", "C++", "RTOS", "Embedded Linux", "Firmware")),
+    )
+    extra_skills: Tuple[str, ...] = (
+        "Git", "Agile", "Scrum", "Docker", "Kubernetes", "Rust", "Scala", "Java", "C#", ".NET",
+        "Prompt Engineering", "Generative AI", "LangChain", "Redis", "MongoDB", "Elasticsearch", "Bash",
+        "Jira", "Mentoring", "Public Speaking", "Technical Writing", "Data Visualization", "Tableau",
+        "Power BI", "FastAPI", "Django", "Flask", "Vue.js", "Angular", "gRPC", "Microservices",
+        "System Design", "Observability", "OpenTelemetry", "Snowflake", "dbt", "Hadoop", "CKA",
+    )
+    locations: Tuple[str, ...] = (
+        "Berlin, Germany", "Munich, Germany", "Hamburg, Germany", "London, United Kingdom",
+        "Manchester, United Kingdom", "Paris, France", "Lyon, France", "Madrid, Spain", "Barcelona, Spain",
+        "Lisbon, Portugal", "Amsterdam, Netherlands", "Warsaw, Poland", "Stockholm, Sweden",
+        "Copenhagen, Denmark", "Zurich, Switzerland", "Vienna, Austria", "Dublin, Ireland", "Milan, Italy",
+        "Austin, TX", "New York, NY", "San Francisco, CA", "Seattle, WA", "Toronto, Canada",
+        "Vancouver, Canada", "Bangalore, India", "Singapore", "Tokyo, Japan", "Sydney, Australia", "Remote",
+    )
+    companies: Tuple[str, ...] = (
+        "NovaTech Labs", "Quantum Solutions", "Bluepeak Analytics", "Orbital Systems", "Helix Health",
+        "Northwind Logistics", "Cobalt Finance", "Lumen Retail", "Vertex Mobility", "Aurora Energy",
+        "Pinecrest Media", "Ironbridge Security", "Silverline Cloud", "Tidewater Insurance", "Nimbus AI",
+        "Granite Manufacturing", "Evergreen Foods", "Crescent Telecom", "Summit Travel", "Atlas Robotics",
+        "Redwood Games", "Beacon Education", "Harbor Payments", "Polaris Biotech", "Meridian Consulting",
+    )
+    institutions: Tuple[str, ...] = (
+        "Metropolitan Institute of Technology", "Technical University of Munich", "University of Amsterdam",
+        "Imperial College London", "ETH Zurich", "University of Toronto", "KTH Royal Institute of Technology",
+        "Politecnico di Milano", "University of Texas at Austin", "National University of Singapore",
+        "University of Warsaw", "Sorbonne University", "University of Lisbon", "IIT Bombay",
+        "University of Tokyo", "University of Melbourne", "Trinity College Dublin", "University of Barcelona",
+    )
+    degrees: Tuple[str, ...] = (
+        "BSc Computer Science", "MSc Computer Science", "BEng Software Engineering", "MSc Data Science",
+        "BSc Mathematics", "MSc Artificial Intelligence", "BSc Information Systems", "MBA",
+        "BA Interaction Design", "PhD Machine Learning", "MSc Cybersecurity", "BSc Electrical Engineering",
+    )
+    languages: Tuple[str, ...] = (
+        "German", "Spanish", "French", "Portuguese", "Italian", "Dutch", "Polish", "Swedish",
+        "Mandarin", "Japanese", "Hindi", "Arabic", "Turkish", "Russian",
+    )
+    achievements: Tuple[str, ...] = (
+        "Cut {skill} deployment lead time by {pct}% across {teams} teams.",
+        "Led a {skill} migration that reduced infrastructure costs by {pct}%.",
+        "Built {skill} tooling adopted by {teams} product teams.",
+        "Improved service reliability to 99.9% uptime using {skill}.",
+        "Mentored {teams} engineers and introduced {skill} best practices.",
+        "Delivered a {skill} platform that grew weekly active users by {pct}%.",
+        "Automated {skill} workflows, saving {teams} hours of manual work per week.",
+        "Shipped {skill} features that increased conversion by {pct}%.",
+    )
+    summaries: Tuple[str, ...] = (
+        "Known for pragmatic delivery and clear communication with stakeholders.",
+        "Enjoys turning ambiguous problems into well-scoped, measurable projects.",
+        "Experienced in leading cross-functional teams through fast-moving product cycles.",
+        "Combines hands-on engineering with a strong focus on quality and mentoring.",
+        "Passionate about building reliable systems that scale with the business.",
+    )
+    genders: Tuple[str, ...] = ("female", "male", "non-binary")
+
+    @classmethod
+    def from_json(cls, path: Path) -> "CorpusVocabulary":
+        """Defaults overridden by the lists in a JSON object keyed by field name."""
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        known = {field.name for field in fields(cls)}
+        unknown = set(raw) - known
+        if unknown:
+            raise ValueError(f"Unknown vocabulary fields: {', '.join(sorted(unknown))}")
+        overrides = {}
+        for name, values in raw.items():
+            if name == "roles":
+                overrides[name] = tuple((str(title), tuple(core)) for title, core in values)
+            else:
+                overrides[name] = tuple(str(value) for value in values)
+        return cls(**overrides)
+
+
+class CorpusSynthesizer:
+    """Draws varied, reproducible :class:`CandidateProfile`s for scale testing.
+
+    Every categorical choice for a block of profiles is one vectorized numpy draw;
+    only assembling the profile objects is per-row Python.
+    """
+
+    def __init__(
+        self,
+        vocabulary: Optional[CorpusVocabulary] = None,
+        seed: int = 0,
+        reference_year: int = 2025,
+    ) -> None:
+        self.vocabulary = vocabulary or CorpusVocabulary()
+        self.seed = seed
+        self._reference_year = reference_year
+        vocab = self.vocabulary
+        self._skills = np.asarray(vocab.extra_skills, dtype=object)
+        self._core_sizes = np.asarray([len(core) for _, core in vocab.roles])
+        self._core_skills = np.full((len(vocab.roles), self._core_sizes.max()), "", dtype=object)
+        for position, (_, core) in enumerate(vocab.roles):
+            self._core_skills[position, : len(core)] = core
+
+    def profiles(self, count: int, start: int = 0) -> Iterator[CandidateProfile]:
+        """Profiles ``start .. start + count - 1`` of this seed's sequence."""
+        end = start + count
+        for block in range(start // SYNTHESIS_BLOCK_SIZE, (end - 1) // SYNTHESIS_BLOCK_SIZE + 1 if count else 0):
+            block_start = block * SYNTHESIS_BLOCK_SIZE
+            profiles = self._block(block)
+            yield from profiles[max(start - block_start, 0) : end - block_start]
+
+    def _block(self, block: int) -> List[CandidateProfile]:
+        vocab = self.vocabulary
+        rng = np.random.default_rng((self.seed, block))
+        n = SYNTHESIS_BLOCK_SIZE
+        year = self._reference_year
+
+        first = rng.integers(len(vocab.first_names), size=n)
+        last = rng.integers(len(vocab.last_names), size=n)
+        role = rng.integers(len(vocab.roles), size=n)
+        location = rng.integers(len(vocab.locations), size=n)
+        gender = rng.integers(len(vocab.genders), size=n)
+        institution = rng.integers(len(vocab.institutions), size=n)
+        degree = rng.integers(len(vocab.degrees), size=n)
+        summary = rng.integers(len(vocab.summaries), size=n)
+        graduation = rng.integers(year - 25, year, size=n)
+        career = year - graduation
+
+        # Job boundaries: evenly spaced through the career with jitter; at least three
+        # years per job keeps every job at least a year long after rounding.
+        jobs = np.minimum(rng.integers(1, MAX_JOBS + 1, size=n), np.maximum(career // 3, 1))
+        steps = np.arange(1, MAX_JOBS)[None, :] + rng.uniform(-0.3, 0.3, size=(n, MAX_JOBS - 1))
+        cuts = graduation[:, None] + np.rint(career[:, None] * steps / jobs[:, None]).astype(int)
+        company = rng.integers(len(vocab.companies), size=(n, MAX_JOBS))
+        achievement = rng.integers(len(vocab.achievements), size=(n, MAX_JOBS))
+        percent = rng.integers(10, 61, size=(n, MAX_JOBS))
+        teams = rng.integers(2, 13, size=(n, MAX_JOBS))
+
+        # Sampling without replacement = taking the smallest random keys per row.
+        core_keys = rng.random((n, self._core_skills.shape[1]))
+        core_keys[np.arange(self._core_skills.shape[1])[None, :] >= self._core_sizes[role][:, None]] = np.inf
+        core = np.argsort(core_keys, axis=1)[:, :CORE_SKILLS_PER_PROFILE]
+        extra_count = rng.integers(*EXTRA_SKILLS_RANGE, size=n)
+        extra = np.argsort(rng.random((n, len(self._skills))), axis=1)[:, : EXTRA_SKILLS_RANGE[1] - 1]
+        language_count = rng.integers(0, 3, size=n)
+        language = np.argsort(rng.random((n, len(vocab.languages))), axis=1)[:, :2]
+        speaks_english = rng.random(n) < 0.9
+
+        profiles: List[CandidateProfile] = []
+        for row in range(n):
+            name = f"{vocab.first_names[first[row]]} {vocab.last_names[last[row]]}"
+            title, _ = vocab.roles[role[row]]
+            role_skills = [skill for skill in self._core_skills[role[row], core[row]] if skill]
+            skills = list(dict.fromkeys(role_skills + list(self._skills[extra[row, : extra_count[row]]])))
+            bounds = [int(graduation[row]), *cuts[row, : jobs[row] - 1].tolist(), year]
+            experience = []
+            for job in range(jobs[row] - 1, -1, -1):
+                senior = job == jobs[row] - 1 and career[row] >= 8
+                experience.append(
+                    {
+                        "company": vocab.companies[company[row, job]],
+                        "role": f"Senior {title}" if senior else title,
+                        "duration": f"{bounds[job]} - {'Present' if job == jobs[row] - 1 else bounds[job + 1]}",
+                        "achievements": vocab.achievements[achievement[row, job]].format(
+                            skill=role_skills[job % len(role_skills)],
+                            pct=percent[row, job],
+                            teams=teams[row, job],
+                        ),
+                    }
+                )
+            languages = (["English"] if speaks_english[row] else []) + [
+                vocab.languages[index] for index in language[row, : language_count[row]]
+            ]
+            profiles.append(
+                CandidateProfile(
+                    name=name,
+                    title=title,
+                    summary=(
+                        f"{name} is a {title} with {career[row]} years of experience in "
+                        f"{', '.join(skills[:2])} and {skills[2] if len(skills) > 2 else skills[-1]}. "
+                        f"{vocab.summaries[summary[row]]}"
+                    ),
+                    contact={
+                        "email": f"{name.replace(' ', '.').lower()}.{block * n + row}@example.com",
+                        "phone": f"+1 (555) {(block * n + row) // 10000 % 1000:03d}-{(block * n + row) % 10000:04d}",
+                        "location": vocab.locations[location[row]],
+                    },
+                    experience=experience,
+                    education=[
+                        {
+                            "institution": vocab.institutions[institution[row]],
+                            "degree": vocab.degrees[degree[row]],
+                            "graduation_year": int(graduation[row]),
+                        }
+                    ],
+                    skills=skills,
+                    languages=languages or ["English"],
+                    gender=vocab.genders[gender[row]],
+                )
+            )
+        return profiles
+
+
+def synthetic_filename(seed: int, index: int) -> str:
+    return f"synthetic-{seed}-{index:07d}.pdf"
+
+
+def write_corpus(
+    synthesizer: CorpusSynthesizer,
+    count: int,
+    output_dir: Path,
+    renderer: Optional[CVPdfRenderer] = None,
+    photo_path: Optional[Path] = None,
+    start: int = 0,
+    on_progress: Optional[CorpusProgressCallback] = None,
+    io_workers: int = 8,
+) -> List[Path]:
+    """Write ``count`` synthetic CVs as PDFs plus profile records; returns the PDF paths.
+
+    With a ``renderer`` every PDF is rendered (in its process pool). Without one each
+    PDF is a shared one-line placeholder: ingest and the candidate index read the
+    profile records, so records-only corpora skip rendering entirely. Write them to a
+    scratch or benchmark directory, never to the served corpus. File names are
+    derived from seed and index, so re-running a seed rewrites the same files.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    logger = logging.getLogger("CorpusWriter")
+    placeholder = None if renderer is not None else _placeholder_pdf()
+    written: List[Path] = []
+    batch: List[Tuple[int, CandidateProfile]] = []
+
+    def flush(executor: ThreadPoolExecutor) -> None:
+        names = [synthetic_filename(synthesizer.seed, index) for index, _ in batch]
+        profiles = [profile for _, profile in batch]
+        if renderer is not None:
+            for profile in profiles:
+                profile.photo_path = photo_path
+            paths = renderer.render_many(profiles, filenames=names, output_dir=output_dir)
+        else:
+            paths = list(executor.map(lambda name: _write_bytes(output_dir / name, placeholder), names))
+        list(executor.map(write_profile_record, paths, profiles))
+        written.extend(paths)
+        batch.clear()
+        if on_progress is not None:
+            on_progress(len(written), count)
+
+    with ThreadPoolExecutor(max_workers=max(1, io_workers)) as executor:
+        for index, profile in enumerate(synthesizer.profiles(count, start=start), start=start):
+            batch.append((index, profile))
+            if len(batch) >= SYNTHESIS_BLOCK_SIZE:
+                flush(executor)
+        if batch:
+            flush(executor)
+    logger.info("Wrote %d synthetic CVs to %s.", len(written), output_dir)
+    return written
+
+
+def _write_bytes(path: Path, payload: bytes) -> Path:
+    path.write_bytes(payload)
+    return path
+
+
+def _placeholder_pdf() -> bytes:
+    pdf = FPDF()
+    # A fixed creation date keeps placeholder bytes (and so ingest digests) stable across runs.
+    pdf.set_creation_date(datetime(2000, 1, 1, tzinfo=timezone.utc))
+    pdf.add_page()
+    pdf.set_font("Helvetica", "", 11)
+    pdf.cell(0, 6, "Synthetic CV - see the profile record beside this file.")
+    return bytes(pdf.output())
@@ -0,0 +1,124 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.domain.models import CandidateProfile
+
+SECTIONS = ("Summary", "Experience", "Skills", "Education", "Languages")
+
+_SECTION_LOOKUP = {section.lower(): section for section in SECTIONS}
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+
+class CVSectionSplitter:
+    """Chunks CVs along the sections the PDF renderer emits.
+
+    Each section becomes one chunk, except Experience, which gets one chunk per job.
+    Chunks open with a short candidate/section header so they embed with their
+    context, and carry ``candidate``, ``title`` and ``section`` metadata. Only chunks
+    longer than ``chunk_size`` are split further, with ``chunk_overlap``; text without
+    recognisable sections falls back to plain recursive splitting.
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int) -> None:
+        self._fallback = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=["\n\n", "\n", ".", " "],
+        )
+        self._chunk_size = chunk_size
+
+    def split_profile(self, filename: str, profile: CandidateProfile) -> List[Document]:
+        contact = " | ".join(str(profile.contact.get(key) or "") for key in ("email", "phone", "location"))
+        entries: List[Tuple[str, str]] = [("Summary", f"{contact}\n{profile.summary}".strip(" |\n"))]
+        for job in profile.experience:
+            header = f"{job.get('role', '')} - {job.get('company', '')} ({job.get('duration', '')})"
+            entries.append(("Experience", f"{header}\n{job.get('achievements', '')}".strip()))
+        entries.append(("Skills", ", ".join(profile.skills)))
+        entries.append(
+            (
+                "Education",
+                "\n".join(
+                    f"{edu.get('institution', '')}: {edu.get('degree', '')} - {edu.get('graduation_year', '')}"
+                    for edu in profile.education
+                ),
+            )
+        )
+        entries.append(("Languages", ", ".join(profile.languages)))
+        return self._documents(filename, profile.name, profile.title, entries)
+
+    def split_text(self, filename: str, text: str) -> List[Document]:
+        lines = [line.strip() for line in text.splitlines()]
+        header, sections = self._parse_sections(lines)
+        if not sections:
+            return self._fallback.split_documents(
+                [Document(page_content=text.strip(), metadata={"filename": filename, "section": "Full text"})]
+            )
+
+        name = header[0] if header else ""
+        title = header[1] if len(header) > 1 else ""
+        contact = "\n".join(header[2:])
+        entries: List[Tuple[str, str]] = []
+        for section, body in sections:
+            if section == "Experience":
+                entries += [("Experience", job) for job in self._split_jobs(body)]
+            elif section == "Summary" and contact:
+                entries.append((section, f"{contact}\n" + "\n".join(body)))
+            else:
+                entries.append((section, "\n".join(body)))
+        return self._documents(filename, name, title, entries)
+
+    def _documents(
+        self,
+        filename: str,
+        candidate: str,
+        title: str,
+        entries: List[Tuple[str, str]],
+    ) -> List[Document]:
+        documents: List[Document] = []
+        for section, body in entries:
+            body = body.strip()
+            if not body:
+                continue
+            metadata: Dict[str, object] = {"filename": filename, "section": section}
+            if candidate:
+                metadata["candidate"] = candidate
+            if title:
+                metadata["title"] = title
+            heading = f"Candidate: {candidate} ({title})" if title else f"Candidate: {candidate}"
+            content = f"{heading}\nSection: {section}\n{body}" if candidate else f"Section: {section}\n{body}"
+            if len(content) > self._chunk_size:
+                documents += self._fallback.split_documents([Document(page_content=content, metadata=metadata)])
+            else:
+                documents.append(Document(page_content=content, metadata=metadata))
+        return documents
+
+    @staticmethod
+    def _parse_sections(lines: List[str]) -> Tuple[List[str], List[Tuple[str, List[str]]]]:
+        header: List[str] = []
+        sections: List[Tuple[str, List[str]]] = []
+        for line in lines:
+            section = _SECTION_LOOKUP.get(line.lower())
+            if section is not None:
+                sections.append((section, []))
+            elif not line:
+                continue
+            elif sections:
+                sections[-1][1].append(line)
+            else:
+                header.append(line)
+        return header, sections
+
+    @staticmethod
+    def _split_jobs(lines: List[str]) -> List[str]:
+        """Group Experience lines into jobs: a ``Role - Company`` line followed by a dated line."""
+        jobs: List[List[str]] = []
+        for position, line in enumerate(lines):
+            following: Optional[str] = lines[position + 1] if position + 1 < len(lines) else None
+            starts_job = " - " in line and not _YEAR.search(line) and following and _YEAR.search(following)
+            if starts_job or not jobs:
+                jobs.append([])
+            jobs[-1].append(line)
+        return ["\n".join(job) for job in jobs]
@@ -1,12 +1,19 @@
+import asyncio
 import logging
-import unicodedata
+import queue
+import threading
 from pathlib import Path
-from typing import Iterable, Optional, Protocol
-from uuid import uuid4
+from typing import Callable, Iterable, List, Optional, Protocol
 
-from fpdf import FPDF
+from app.core.metrics import StageListener, count_items, timed
+from app.domain.models import BatchItemResult, CandidateProfile
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.profile_records import write_profile_record
 
-from app.domain.models import CandidateProfile
+BatchProgressCallback = Callable[[BatchItemResult, int, int], None]
+
+# Queue sentinel telling a pipeline stage worker to exit.
+_STAGE_DONE = object()
 
 
 class CVTextGenerator(Protocol):
@@ -29,105 +36,186 @@ class CVGeneratorService:
         image_generator: CandidateImageGenerator,
         photo_dir: Path,
         photo_keep_names: Optional[Iterable[str]] = None,
+        photo_keep_dirs: Optional[Iterable[Path]] = None,
+        text_concurrency: int = 4,
+        image_concurrency: int = 2,
+        render_concurrency: int = 1,
+        pipeline_buffer: int = 8,
+        renderer: Optional[CVPdfRenderer] = None,
     ) -> None:
         self.output_dir = Path(storage_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.text_generator = text_generator
         self.image_generator = image_generator
+        self.renderer = renderer or CVPdfRenderer(self.output_dir)
         self._photo_dir = Path(photo_dir)
         self._photo_dir.mkdir(parents=True, exist_ok=True)
         self._photo_keep_names = set(photo_keep_names or [])
+        self._photo_keep_dirs = [Path(path).resolve() for path in photo_keep_dirs or []]
+        self._text_concurrency = max(1, text_concurrency)
+        self._image_concurrency = max(1, image_concurrency)
+        self._render_concurrency = max(1, render_concurrency)
+        self._pipeline_buffer = max(1, pipeline_buffer)
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def generate(self) -> Path:
+    def generate(self, on_stage: Optional[StageListener] = None) -> Path:
         self._logger.info("Starting CV generation pipeline.")
-        profile = self.text_generator.generate()
-        profile.photo_path = self.image_generator.generate(profile)
-        pdf_path = self._render_pdf(profile)
+        with timed("cv.text", on_stage):
+            profile = self.text_generator.generate()
+        with timed("cv.image", on_stage):
+            profile.photo_path = self.image_generator.generate(profile)
+        with timed("cv.render", on_stage):
+            pdf_path = self.renderer.render(profile)
+            write_profile_record(pdf_path, profile)
         self._cleanup_photo(profile.photo_path)
+        count_items("cvs_generated")
         self._logger.info("Generated CV at %s", pdf_path)
         return pdf_path
 
+    def generate_batch(
+        self,
+        count: int,
+        on_item: Optional[BatchProgressCallback] = None,
+    ) -> List[BatchItemResult]:
+        """Generate ``count`` CVs with text, image and render stages running concurrently.
+
+        Stages are connected by bounded queues, so a slow stage applies backpressure
+        upstream instead of letting finished profiles pile up in memory. A failing item
+        is reported and skipped without stopping the batch. ``on_item`` is called with
+        ``(result, completed, total)`` as each CV finishes.
+        """
+        self._logger.info("Starting batch CV generation for %d CVs.", count)
+        results: List[BatchItemResult] = []
+        results_lock = threading.Lock()
+
+        def record(index: int, file: Optional[str] = None, error: Optional[str] = None) -> None:
+            result = BatchItemResult(index=index, file=file, error=error)
+            # Report under the lock so progress counts reach the callback in order.
+            with results_lock:
+                results.append(result)
+                if on_item is None:
+                    return
+                # A failing progress callback must not turn a finished item into a failed one.
+                try:
+                    on_item(result, len(results), count)
+                except Exception:
+                    self._logger.warning("Batch progress callback failed for item %d.", index, exc_info=True)
+
+        # Generators that batch profiles per request are asked for chunks of that size,
+        # never more than the batch still needs.
+        chunk_size = max(1, getattr(self.text_generator, "profiles_per_request", 1))
+        generate_many = getattr(self.text_generator, "generate_many", None)
+
+        def text_stage(index: int, size: int) -> List[CandidateProfile]:
+            with timed("cv.text"):
+                if generate_many is not None and size > 1:
+                    return generate_many(size)
+                return [self.text_generator.generate()]
+
+        def image_stage(index: int, profile: CandidateProfile) -> CandidateProfile:
+            with timed("cv.image"):
+                profile.photo_path = self.image_generator.generate(profile)
+            return profile
+
+        def render_stage(index: int, profile: CandidateProfile) -> None:
+            try:
+                with timed("cv.render"):
+                    pdf_path = self.renderer.render(profile)
+                    write_profile_record(pdf_path, profile)
+            finally:
+                self._cleanup_photo(profile.photo_path)
+            count_items("cvs_generated")
+            record(index, file=pdf_path.name)
+
+        source: "queue.Queue" = queue.Queue()
+        for start in range(0, count, chunk_size):
+            source.put((start, min(chunk_size, count - start)))
+        profiles: "queue.Queue" = queue.Queue(maxsize=self._pipeline_buffer)
+        photos: "queue.Queue" = queue.Queue(maxsize=self._pipeline_buffer)
+
+        stages = [
+            (self._text_concurrency, source, profiles, text_stage, True),
+            (self._image_concurrency, profiles, photos, image_stage, False),
+            (self._render_concurrency, photos, None, render_stage, False),
+        ]
+        workers = [
+            self._start_stage(concurrency, inbox, outbox, work, record, fan_out)
+            for concurrency, inbox, outbox, work, fan_out in stages
+        ]
+        # Shut stages down upstream first so every queued item drains before its consumers exit.
+        for (_, inbox, _, _, _), stage_threads in zip(stages, workers):
+            for _ in stage_threads:
+                inbox.put(_STAGE_DONE)
+            for thread in stage_threads:
+                thread.join()
+
+        results.sort(key=lambda item: item.index)
+        failed = sum(1 for item in results if item.error)
+        self._logger.info("Batch generation finished: %d CVs, %d failed.", count - failed, failed)
+        return results
+
+    def render_profiles(self, profiles: List[CandidateProfile]) -> List[Path]:
+        """Render already-generated profiles to PDFs in parallel, in input order."""
+        try:
+            with timed("cv.render_many"):
+                paths = self.renderer.render_many(profiles)
+                for profile, pdf_path in zip(profiles, paths):
+                    write_profile_record(pdf_path, profile)
+            count_items("cvs_generated", len(paths))
+            return paths
+        finally:
+            for profile in profiles:
+                self._cleanup_photo(profile.photo_path)
+
     def list_pdf_files(self) -> list[str]:
         return sorted(path.name for path in self.output_dir.glob("*.pdf"))
 
-    def _render_pdf(self, profile: CandidateProfile) -> Path:
-        filename = f"{profile.name.replace(' ', '_')}-{uuid4().hex[:8]}.pdf"
-        path = self.output_dir / filename
+    async def alist_pdf_files(self) -> list[str]:
+        return await asyncio.to_thread(self.list_pdf_files)
 
-        pdf = FPDF()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        pdf.add_page()
-
-        photo_inserted = False
-        if profile.photo_path and Path(profile.photo_path).exists():
-            try:
-                pdf.image(str(profile.photo_path), x=150, y=20, w=40, h=40)
-                photo_inserted = True
-            except RuntimeError:
-                pass
-
-        pdf.set_xy(10, 20)
-        pdf.set_font("Helvetica", "B", 18)
-        pdf.cell(120, 12, self._safe_text(profile.name), ln=1)
-        pdf.set_font("Helvetica", "", 14)
-        pdf.cell(120, 10, self._safe_text(profile.title), ln=1)
-
-        pdf.set_font("Helvetica", size=11)
-        contact_line = (
-            f"{profile.contact.get('email', '')} | "
-            f"{profile.contact.get('phone', '')} | "
-            f"{profile.contact.get('location', '')}"
-        )
-        pdf.multi_cell(120, 6, self._safe_text(contact_line))
-        pdf.ln(2 if photo_inserted else 5)
-
-        if photo_inserted and pdf.get_y() < 65:
-            pdf.set_xy(10, 65)
-
-        self._section_header(pdf, "Summary")
-        pdf.multi_cell(0, 6, self._safe_text(profile.summary))
-        pdf.ln(2)
-
-        self._section_header(pdf, "Experience")
-        for job in profile.experience:
-            pdf.set_font("Helvetica", "B", 11)
-            job_header = f"{job.get('role', '')} - {job.get('company', '')}"
-            pdf.cell(0, 6, self._safe_text(job_header), ln=1)
-            pdf.set_font("Helvetica", "I", 10)
-            pdf.cell(0, 5, self._safe_text(job.get("duration", "")), ln=1)
-            pdf.set_font("Helvetica", "", 10)
-            pdf.multi_cell(0, 5, self._safe_text(job.get("achievements", "")))
-            pdf.ln(1)
-
-        self._section_header(pdf, "Skills")
-        pdf.set_font("Helvetica", "", 11)
-        pdf.multi_cell(0, 6, self._safe_text(", ".join(profile.skills)))
-        pdf.ln(2)
-
-        self._section_header(pdf, "Education")
-        for edu in profile.education:
-            pdf.set_font("Helvetica", "B", 11)
-            pdf.cell(0, 6, self._safe_text(edu.get("institution", "")), ln=1)
-            pdf.set_font("Helvetica", "", 10)
-            degree = f"{edu.get('degree', '')} - {edu.get('graduation_year', '')}"
-            pdf.multi_cell(0, 5, self._safe_text(degree))
-            pdf.ln(1)
-
-        self._section_header(pdf, "Languages")
-        pdf.set_font("Helvetica", "", 11)
-        pdf.multi_cell(0, 6, self._safe_text(", ".join(profile.languages)))
-
-        pdf.output(path)
-        return path
-
-    def _section_header(self, pdf: FPDF, title: str) -> None:
-        pdf.set_font("Helvetica", "B", 13)
-        pdf.cell(0, 8, self._safe_text(title), ln=1)
-        pdf.set_draw_color(100, 100, 100)
-        pdf.set_line_width(0.4)
-        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
-        pdf.ln(2)
+    def _start_stage(
+        self,
+        concurrency: int,
+        inbox: "queue.Queue",
+        outbox: Optional["queue.Queue"],
+        work: Callable,
+        record: Callable[..., None],
+        fan_out: bool = False,
+    ) -> List[threading.Thread]:
+        """Start ``concurrency`` threads feeding ``inbox`` items through ``work``.
+
+        A ``fan_out`` stage receives ``(first_index, size)`` chunks and returns one
+        output per item, which are passed on under consecutive indexes.
+        """
+
+        def run() -> None:
+            while True:
+                item = inbox.get()
+                if item is _STAGE_DONE:
+                    return
+                index, payload = item
+                indexes = range(index, index + payload) if fan_out else [index]
+                try:
+                    output = work(index, payload)
+                except Exception as exc:
+                    self._logger.exception("Batch items %s failed in %s.", list(indexes), work.__name__)
+                    for failed in indexes:
+                        record(failed, error=str(exc) or exc.__class__.__name__)
+                    continue
+                outputs = list(output) if fan_out else [output]
+                for missing in indexes[len(outputs) :]:
+                    record(missing, error=f"{work.__name__} returned too few results")
+                if outbox is not None:
+                    for item_index, value in zip(indexes, outputs):
+                        outbox.put((item_index, value))
+
+        threads = [
+            threading.Thread(target=run, name=f"cv-{work.__name__}-{position}", daemon=True)
+            for position in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
 
     def _cleanup_photo(self, photo_path: Optional[Path]) -> None:
         if not photo_path:
@@ -138,13 +226,8 @@ class CVGeneratorService:
                 return
             if photo_path.name in self._photo_keep_names:
                 return
+            if any(photo_path.resolve().is_relative_to(path) for path in self._photo_keep_dirs):
+                return
             photo_path.unlink()
         except OSError:
             self._logger.warning("Failed to delete temp photo %s", photo_path)
-
-    def _safe_text(self, value: Optional[str]) -> str:
-        if not value:
-            return ""
-        normalized = unicodedata.normalize("NFKD", value)
-        ascii_bytes = normalized.encode("latin-1", "ignore")
-        return ascii_bytes.decode("latin-1")
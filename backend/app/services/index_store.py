@@ -0,0 +1,114 @@
+import fcntl
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+from uuid import uuid4
+
+
+@dataclass(frozen=True)
+class IndexVersion:
+    """A fully written index directory and the generation it was published as."""
+
+    generation: int
+    path: Path
+
+
+class IndexVersionStore:
+    """Versioned on-disk layout for the RAG index with an atomically swapped pointer.
+
+    Every ingest writes a complete index into ``versions/<generation>-<suffix>`` and
+    then replaces the ``CURRENT`` pointer file with ``os.replace``. Readers in other
+    processes therefore see either the previous or the new version, never a partially
+    written one, and can detect a new version by comparing generation numbers.
+    """
+
+    POINTER_FILENAME = "CURRENT"
+    VERSIONS_DIRNAME = "versions"
+    LOCK_FILENAME = ".ingest.lock"
+    SUPERSEDED_MARKER = ".superseded"
+
+    def __init__(self, root: Path, grace_period_seconds: float = 600) -> None:
+        self.root = Path(root)
+        self._versions_dir = self.root / self.VERSIONS_DIRNAME
+        self._grace_period_seconds = grace_period_seconds
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def current(self) -> Optional[IndexVersion]:
+        """Return the published version, or ``None`` if nothing has been published yet."""
+        pointer = self.root / self.POINTER_FILENAME
+        try:
+            payload = json.loads(pointer.read_text(encoding="utf-8"))
+            version = IndexVersion(
+                generation=int(payload["generation"]),
+                path=self._versions_dir / str(payload["version"]),
+            )
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError):
+            self._logger.warning("Ignoring unreadable index pointer %s", pointer)
+            return None
+        if not version.path.is_dir():
+            self._logger.warning("Index pointer references missing version %s", version.path)
+            return None
+        return version
+
+    def stage(self, generation: int) -> IndexVersion:
+        """Create an empty directory for the next version; it stays invisible until published."""
+        path = self._versions_dir / f"{generation:08d}-{uuid4().hex[:8]}"
+        path.mkdir(parents=True)
+        return IndexVersion(generation=generation, path=path)
+
+    def publish(self, version: IndexVersion) -> None:
+        """Atomically point ``CURRENT`` at ``version`` and mark the previous one superseded."""
+        previous = self.current()
+        pointer = self.root / self.POINTER_FILENAME
+        tmp_path = self.root / f".{self.POINTER_FILENAME}.{uuid4().hex[:8]}.tmp"
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"generation": version.generation, "version": version.path.name}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, pointer)
+        if previous is not None and previous.path != version.path:
+            (previous.path / self.SUPERSEDED_MARKER).touch()
+        self._logger.info("Published RAG index generation %d at %s", version.generation, version.path)
+
+    def collect_garbage(self) -> int:
+        """Delete versions superseded (or abandoned) longer ago than the grace period."""
+        if not self._versions_dir.exists():
+            return 0
+        current = self.current()
+        now = time.time()
+        removed = 0
+        for path in self._versions_dir.iterdir():
+            if not path.is_dir() or (current is not None and path == current.path):
+                continue
+            marker = path / self.SUPERSEDED_MARKER
+            reference = marker if marker.exists() else path
+            try:
+                age = now - reference.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if age < self._grace_period_seconds:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        if removed:
+            self._logger.info("Removed %d expired RAG index versions.", removed)
+        return removed
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Serialize writers across processes sharing the index volume."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        with (self.root / self.LOCK_FILENAME).open("w") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,59 @@
+import logging
+import uuid
+from typing import Callable, Tuple
+
+# Delete ``KEYS[1]`` only while it still holds ``ARGV[1]`` (a task id).
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class IngestCoalescer:
+    """Keeps at most one RAG ingest running and one pending.
+
+    ``submit`` enqueues a new ingest only when none is pending; otherwise the caller
+    attaches to the pending task's id, since that run will index everything on disk
+    when it starts. A task moves from pending to running with :meth:`start`, which
+    frees the pending slot for the next request, and leaves with :meth:`finish`.
+
+    Both slots are Redis keys holding a task id, with a TTL so a lost message or a
+    killed worker cannot block ingest forever.
+    """
+
+    def __init__(self, client, lock_ttl_seconds: int, prefix: str = "cv_screener:rag_ingest") -> None:
+        self._client = client
+        self._lock_ttl_seconds = max(1, int(lock_ttl_seconds))
+        self._pending_key = f"{prefix}:pending"
+        self._running_key = f"{prefix}:running"
+        self._release = client.register_script(_RELEASE_SCRIPT)
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def submit(self, enqueue: Callable[[str], None]) -> Tuple[str, bool]:
+        """Return ``(task_id, coalesced)``; ``enqueue(task_id)`` is called for new ingests."""
+        while True:
+            task_id = str(uuid.uuid4())
+            if self._client.set(self._pending_key, task_id, nx=True, ex=self._lock_ttl_seconds):
+                try:
+                    enqueue(task_id)
+                except BaseException:
+                    self._release(keys=[self._pending_key], args=[task_id])
+                    raise
+                return task_id, False
+            pending = self._client.get(self._pending_key)
+            # The pending ingest may have started between the two calls; claim the slot again.
+            if pending is not None:
+                self._logger.info("Ingest request coalesced into pending task %s.", pending.decode())
+                return pending.decode(), True
+
+    def start(self, task_id: str) -> bool:
+        """Claim the running slot; ``False`` (still pending) while another ingest runs."""
+        if not self._client.set(self._running_key, task_id, nx=True, ex=self._lock_ttl_seconds):
+            return self._client.get(self._running_key) == task_id.encode()
+        self._release(keys=[self._pending_key], args=[task_id])
+        return True
+
+    def finish(self, task_id: str) -> None:
+        self._release(keys=[self._running_key], args=[task_id])
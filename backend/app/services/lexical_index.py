@@ -0,0 +1,108 @@
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+TERMS_FILENAME = "bm25.terms.json"
+INDPTR_FILENAME = "bm25.indptr.npy"
+ROWS_FILENAME = "bm25.rows.npy"
+FREQS_FILENAME = "bm25.freqs.npy"
+LENGTHS_FILENAME = "bm25.lengths.npy"
+
+# Keeps tokens such as "c++", "c#", "node.js" and "iso27001" intact.
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class LexicalSearchConfig:
+    """BM25 scoring knobs and how lexical hits are fused with dense ones."""
+
+    enabled: bool = True
+    candidates: int = 20
+    rrf_k: int = 60
+    k1: float = 1.2
+    b: float = 0.75
+
+
+class BM25Index:
+    """Read-only BM25 index stored as CSR postings beside a mapped index version.
+
+    ``indptr[t]:indptr[t + 1]`` slices ``rows``/``freqs`` for term ``t``. Per-posting
+    BM25 weights are computed once at load, so a query is a dictionary lookup plus a
+    weighted ``bincount`` over the postings of its terms.
+    """
+
+    def __init__(self, path: Path, config: LexicalSearchConfig) -> None:
+        self._terms: Dict[str, int] = {
+            term: position
+            for position, term in enumerate(json.loads((path / TERMS_FILENAME).read_text(encoding="utf-8")))
+        }
+        self._indptr = np.load(path / INDPTR_FILENAME, mmap_mode="r")
+        self._rows = np.load(path / ROWS_FILENAME, mmap_mode="r")
+        lengths = np.load(path / LENGTHS_FILENAME, mmap_mode="r")
+        self._count = len(lengths)
+
+        freqs = np.asarray(np.load(path / FREQS_FILENAME, mmap_mode="r"), dtype=np.float32)
+        document_frequency = np.diff(np.asarray(self._indptr)).astype(np.float32)
+        idf = np.log1p((self._count - document_frequency + 0.5) / (document_frequency + 0.5))
+        average_length = float(lengths.mean()) if self._count else 1.0
+        norm = config.k1 * (1 - config.b + config.b * lengths[self._rows] / (average_length or 1.0))
+        self._weights = np.repeat(idf, np.diff(np.asarray(self._indptr))) * freqs * (config.k1 + 1) / (freqs + norm)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Top ``k`` ``(row, bm25 score)`` pairs for ``query``, best first."""
+        term_ids = [self._terms[token] for token in set(tokenize(query)) if token in self._terms]
+        if not term_ids or k <= 0:
+            return []
+        slices = [slice(int(self._indptr[term]), int(self._indptr[term + 1])) for term in term_ids]
+        rows = np.concatenate([self._rows[part] for part in slices])
+        weights = np.concatenate([self._weights[part] for part in slices])
+        scores = np.bincount(rows, weights=weights, minlength=self._count)
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(row), float(scores[row])) for row in matched]
+
+    @staticmethod
+    def write(path: Path, texts: Sequence[str]) -> None:
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        lengths = np.zeros(len(texts), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = Counter(tokenize(text))
+            lengths[row] = sum(counts.values())
+            for term, freq in counts.items():
+                postings.setdefault(term, []).append((row, freq))
+
+        terms = sorted(postings)
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(postings[term]) for term in terms])
+        rows = np.empty(indptr[-1], dtype=np.int32)
+        freqs = np.empty(indptr[-1], dtype=np.float32)
+        for position, term in enumerate(terms):
+            entries = np.asarray(postings[term])
+            rows[indptr[position] : indptr[position + 1]] = entries[:, 0]
+            freqs[indptr[position] : indptr[position + 1]] = entries[:, 1]
+
+        (path / TERMS_FILENAME).write_text(json.dumps(terms), encoding="utf-8")
+        np.save(path / INDPTR_FILENAME, indptr)
+        np.save(path / ROWS_FILENAME, rows)
+        np.save(path / FREQS_FILENAME, freqs)
+        np.save(path / LENGTHS_FILENAME, lengths)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int, rrf_k: int) -> List[int]:
+    """Fuse ranked row lists by summing ``1 / (rrf_k + rank)``; returns the top ``k`` rows."""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking, start=1):
+            scores[row] = scores.get(row, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores, key=lambda row: -scores[row])[:k]
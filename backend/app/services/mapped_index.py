@@ -0,0 +1,282 @@
+import asyncio
+import json
+import mmap
+import threading
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+
+from app.core.metrics import timed
+from app.services.lexical_index import BM25Index, LexicalSearchConfig, reciprocal_rank_fusion
+from app.services.vector_index import VectorIndexConfig, build_index, configure_search
+
+VECTORS_FILENAME = "vectors.npy"
+ANN_INDEX_FILENAME = "index.faiss"
+CHUNKS_FILENAME = "chunks.bin"
+OFFSETS_FILENAME = "chunks.offsets.npy"
+CHUNK_FILES_FILENAME = "chunk_files.npy"
+FILES_FILENAME = "files.json"
+SCREEN_VECTORS_FILENAME = "screen_vectors.npy"
+SCREEN_SCALES_FILENAME = "screen_scales.npy"
+# Layout of a written version (files and their encoding); bump it when that changes so
+# the next ingest rewrites the published version from its vectors, without re-embedding.
+INDEX_FORMAT_VERSION = 2
+# Rows of int8 screening vectors widened to float32 at a time by ``score_files``.
+_SCREEN_BLOCK_ROWS = 16_384
+
+
+class ChunkStore:
+    """Read-only, offset-indexed chunk records backed by a memory-mapped file.
+
+    Row ``i`` is the UTF-8 JSON record ``{"id", "text", "metadata"}`` stored between
+    ``offsets[i]`` and ``offsets[i + 1]`` of ``chunks.bin``. Nothing is unpickled and
+    every process reading the same version shares the page cache.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._offsets = np.load(path / OFFSETS_FILENAME, mmap_mode="r")
+        with (path / CHUNKS_FILENAME).open("rb") as handle:
+            size = handle.seek(0, 2)
+            self._data = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def record(self, row: int) -> Dict[str, object]:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return json.loads(self._data[start:end])
+
+    def document(self, row: int) -> Document:
+        record = self.record(row)
+        return Document(id=record["id"], page_content=record["text"], metadata=record["metadata"])
+
+    @staticmethod
+    def write(path: Path, documents: Sequence[Document]) -> None:
+        offsets = np.zeros(len(documents) + 1, dtype=np.int64)
+        with (path / CHUNKS_FILENAME).open("wb") as handle:
+            for row, document in enumerate(documents):
+                record = {"id": document.id, "text": document.page_content, "metadata": document.metadata}
+                handle.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+                offsets[row + 1] = handle.tell()
+        np.save(path / OFFSETS_FILENAME, offsets)
+
+
+class MappedVectorIndex:
+    """Serving view of one index version with vectors and chunks memory-mapped.
+
+    Flat search runs ``faiss.knn`` directly over the mapped ``vectors.npy``; IVF indexes
+    are opened with ``IO_FLAG_MMAP`` so their inverted lists stay on the page cache.
+    HNSW graphs are still read into process memory, as FAISS cannot map them. With an
+    ANN index the float32 vectors are only mapped for ingest (:meth:`to_vectorstore`);
+    ``/screen`` scores int8 unit vectors, a quarter of their size.
+    When lexical search is enabled, :meth:`retrieve` fuses dense and BM25 rankings.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        config: Optional[VectorIndexConfig] = None,
+        lexical_config: Optional[LexicalSearchConfig] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.chunks = ChunkStore(self.path)
+        self._file_groups: Optional[_FileGroups] = None
+        self._file_groups_lock = threading.Lock()
+        self._ann: Optional[faiss.Index] = None
+        ann_path = self.path / ANN_INDEX_FILENAME
+        if ann_path.exists():
+            self._ann = faiss.read_index(str(ann_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            configure_search(self._ann, config or VectorIndexConfig())
+        self._lexical_config = lexical_config or LexicalSearchConfig(enabled=False)
+        self.lexical: Optional[BM25Index] = None
+        if self._lexical_config.enabled:
+            self.lexical = BM25Index(self.path, self._lexical_config)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @cached_property
+    def vectors(self) -> np.ndarray:
+        """Exact float32 vectors; read by flat search and ingest only."""
+        return np.load(self.path / VECTORS_FILENAME, mmap_mode="r")
+
+    @cached_property
+    def screen_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Int8 unit vectors and their per-row scales (``unit ≈ int8 * scale``)."""
+        return (
+            np.load(self.path / SCREEN_VECTORS_FILENAME, mmap_mode="r"),
+            np.load(self.path / SCREEN_SCALES_FILENAME, mmap_mode="r"),
+        )
+
+    def search(self, vector: Sequence[float], k: int) -> List[Tuple[int, float]]:
+        """Return up to ``k`` ``(row, squared L2 distance)`` pairs, nearest first."""
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        query = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        if self._ann is not None:
+            distances, rows = self._ann.search(query, k)
+        else:
+            distances, rows = faiss.knn(query, self.vectors, k)
+        return [(int(row), float(distance)) for row, distance in zip(rows[0], distances[0]) if row >= 0]
+
+    def retrieve(self, query: str, vector: Sequence[float], k: int) -> List[int]:
+        """Rows for the top ``k`` chunks: dense only, or dense and BM25 fused with RRF."""
+        if self.lexical is None:
+            return [row for row, _ in self.search(vector, k)]
+        depth = max(k, self._lexical_config.candidates)
+        dense = [row for row, _ in self.search(vector, depth)]
+        lexical = [row for row, _ in self.lexical.search(query, depth)]
+        return reciprocal_rank_fusion([dense, lexical], k, self._lexical_config.rrf_k)
+
+    def document(self, row: int) -> Document:
+        return self.chunks.document(row)
+
+    def score_files(self, vector: Sequence[float], aggregate: str = "max") -> Tuple[List[str], np.ndarray]:
+        """Cosine similarity of ``vector`` to every chunk, aggregated per source file.
+
+        The int8 unit vectors are scored block by block (bounded memory, one byte per
+        dimension read); chunk scores are then reduced per file with ``max`` or ``mean``.
+        """
+        groups = self._groups()
+        if not len(groups.order):
+            return groups.files, np.empty(0, dtype=np.float32)
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+        quantized, scales = self.screen_vectors
+        scores = np.empty(len(quantized), dtype=np.float32)
+        for start in range(0, len(quantized), _SCREEN_BLOCK_ROWS):
+            end = start + _SCREEN_BLOCK_ROWS
+            scores[start:end] = (quantized[start:end].astype(np.float32) @ query) * scales[start:end]
+        ordered = scores[groups.order]
+        if aggregate == "mean":
+            return groups.files, np.add.reduceat(ordered, groups.starts) / groups.counts
+        return groups.files, np.maximum.reduceat(ordered, groups.starts)
+
+    def to_vectorstore(self, embeddings: Embeddings) -> FAISS:
+        """Materialize an editable in-memory FAISS store (used by ingest, not serving)."""
+        index = faiss.IndexFlatL2(self.vectors.shape[1])
+        index.add(np.ascontiguousarray(self.vectors))
+        documents = [self.chunks.document(row) for row in range(len(self.chunks))]
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore({document.id: document for document in documents}),
+            index_to_docstore_id={row: document.id for row, document in enumerate(documents)},
+        )
+
+    def _groups(self) -> "_FileGroups":
+        if self._file_groups is None:
+            with self._file_groups_lock:
+                if self._file_groups is None:
+                    self._file_groups = _FileGroups.load(self)
+        return self._file_groups
+
+
+@dataclass(frozen=True)
+class _FileGroups:
+    """Chunk rows grouped by source file, precomputed once per loaded version."""
+
+    files: List[str]
+    order: np.ndarray
+    starts: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def load(cls, index: MappedVectorIndex) -> "_FileGroups":
+        files = json.loads((index.path / FILES_FILENAME).read_text(encoding="utf-8"))
+        file_ids = np.load(index.path / CHUNK_FILES_FILENAME)
+        order = np.argsort(file_ids, kind="stable")
+        counts = np.bincount(file_ids, minlength=len(files)).astype(np.float32)
+        starts = np.searchsorted(file_ids[order], np.arange(len(files)))
+        return cls(files=files, order=order, starts=starts, counts=counts)
+
+
+def _file_map(filenames: Sequence[str]) -> Tuple[List[str], np.ndarray]:
+    files = sorted(set(filenames))
+    positions = {name: position for position, name in enumerate(files)}
+    return files, np.asarray([positions[name] for name in filenames], dtype=np.int32)
+
+
+def _screen_quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit-normalize rows and store them as int8 with a per-row scale."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    units = vectors / norms
+    scales = np.abs(units).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    quantized = np.rint(units / scales[:, None]).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def write_index_version(path: Path, vectorstore: FAISS, config: VectorIndexConfig, lexical: bool = False) -> None:
+    """Write ``vectorstore`` in the mapped format, building the configured serving index.
+
+    BM25 postings are only written when ``lexical`` (hybrid retrieval) is set.
+    """
+    exact_index = vectorstore.index
+    vectors = exact_index.reconstruct_n(0, exact_index.ntotal)
+    documents = [_docstore_document(vectorstore, row) for row in range(exact_index.ntotal)]
+    np.save(path / VECTORS_FILENAME, vectors)
+    quantized, scales = _screen_quantize(vectors)
+    np.save(path / SCREEN_VECTORS_FILENAME, quantized)
+    np.save(path / SCREEN_SCALES_FILENAME, scales)
+    ChunkStore.write(path, documents)
+    files, file_ids = _file_map([str(document.metadata.get("filename", "unknown")) for document in documents])
+    (path / FILES_FILENAME).write_text(json.dumps(files), encoding="utf-8")
+    np.save(path / CHUNK_FILES_FILENAME, file_ids)
+    if lexical:
+        BM25Index.write(path, [document.page_content for document in documents])
+    if config.uses_ann(len(vectors)):
+        faiss.write_index(build_index(vectors, config), str(path / ANN_INDEX_FILENAME))
+
+
+def _docstore_document(vectorstore: FAISS, row: int) -> Document:
+    doc_id = vectorstore.index_to_docstore_id[row]
+    document = vectorstore.docstore.search(doc_id)
+    return Document(id=doc_id, page_content=document.page_content, metadata=document.metadata)
+
+
+class MappedIndexRetriever(BaseRetriever):
+    """LangChain retriever over a :class:`MappedVectorIndex`."""
+
+    index: MappedVectorIndex
+    embeddings: Embeddings
+    k: int = 4
+
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        with timed("rag.query_embedding"):
+            vector = self.embeddings.embed_query(query)
+        with timed("rag.search"):
+            rows = self.index.retrieve(query, vector, self.k)
+        return [self.index.document(row) for row in rows]
+
+    async def _aget_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: AsyncCallbackManagerForRetrieverRun,
+    ) -> List[Document]:
+        with timed("rag.query_embedding"):
+            vector = await self.embeddings.aembed_query(query)
+        with timed("rag.search"):
+            rows = await asyncio.to_thread(self.index.retrieve, query, vector, self.k)
+        return [self.index.document(row) for row in rows]
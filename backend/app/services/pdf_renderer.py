@@ -0,0 +1,228 @@
+import io
+import logging
+import multiprocessing
+import threading
+import unicodedata
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from PIL import Image, ImageOps
+
+from app.domain.models import CandidateProfile
+
+# A layout is a flat list of drawing operations, computed in the calling process so
+# render workers only replay it; every element is picklable.
+LayoutOp = Tuple[object, ...]
+
+PHOTO_BOX_MM = (150, 20, 40, 40)
+# Below this y (mm) the body would overlap the headshot.
+PHOTO_BOTTOM_MM = 65
+
+
+@lru_cache(maxsize=8192)
+def safe_text(value: Optional[str]) -> str:
+    """Fold text to what the core PDF fonts can encode (latin-1)."""
+    if not value:
+        return ""
+    normalized = unicodedata.normalize("NFKD", value)
+    return normalized.encode("latin-1", "ignore").decode("latin-1")
+
+
+@lru_cache(maxsize=256)
+def _prepared_photo(path: str, mtime_ns: int, size_px: int, quality: int) -> Optional[bytes]:
+    try:
+        with Image.open(path) as image:
+            fitted = ImageOps.fit(image.convert("RGB"), (size_px, size_px), Image.LANCZOS)
+    except (OSError, ValueError):
+        return None
+    buffer = io.BytesIO()
+    fitted.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def prepare_photo(path: Optional[Path], size_px: int, quality: int) -> Optional[bytes]:
+    """Downscale a headshot to its printed size and JPEG-encode it; cached per file version."""
+    if not path:
+        return None
+    try:
+        mtime_ns = Path(path).stat().st_mtime_ns
+    except OSError:
+        return None
+    return _prepared_photo(str(path), mtime_ns, size_px, quality)
+
+
+def build_layout(profile: CandidateProfile, photo: Optional[bytes]) -> List[LayoutOp]:
+    ops: List[LayoutOp] = []
+    if photo:
+        ops.append(("image", photo, *PHOTO_BOX_MM))
+
+    ops += [
+        ("xy", 10, 20),
+        ("font", "B", 18),
+        ("cell", 120, 12, safe_text(profile.name)),
+        ("font", "", 14),
+        ("cell", 120, 10, safe_text(profile.title)),
+        ("font", "", 11),
+    ]
+    contact_line = (
+        f"{profile.contact.get('email', '')} | "
+        f"{profile.contact.get('phone', '')} | "
+        f"{profile.contact.get('location', '')}"
+    )
+    ops.append(("multi", 120, 6, safe_text(contact_line)))
+    ops.append(("ln", 2 if photo else 5))
+    if photo:
+        ops.append(("min_y", PHOTO_BOTTOM_MM))
+
+    ops.append(("header", "Summary"))
+    ops += [("multi", 0, 6, safe_text(profile.summary)), ("ln", 2)]
+
+    ops.append(("header", "Experience"))
+    for job in profile.experience:
+        ops += [
+            ("font", "B", 11),
+            ("cell", 0, 6, safe_text(f"{job.get('role', '')} - {job.get('company', '')}")),
+            ("font", "I", 10),
+            ("cell", 0, 5, safe_text(str(job.get("duration", "")))),
+            ("font", "", 10),
+            ("multi", 0, 5, safe_text(str(job.get("achievements", "")))),
+            ("ln", 1),
+        ]
+
+    ops += [
+        ("header", "Skills"),
+        ("font", "", 11),
+        ("multi", 0, 6, safe_text(", ".join(profile.skills))),
+        ("ln", 2),
+    ]
+
+    ops.append(("header", "Education"))
+    for edu in profile.education:
+        ops += [
+            ("font", "B", 11),
+            ("cell", 0, 6, safe_text(str(edu.get("institution", "")))),
+            ("font", "", 10),
+            ("multi", 0, 5, safe_text(f"{edu.get('degree', '')} - {edu.get('graduation_year', '')}")),
+            ("ln", 1),
+        ]
+
+    ops += [
+        ("header", "Languages"),
+        ("font", "", 11),
+        ("multi", 0, 6, safe_text(", ".join(profile.languages))),
+    ]
+    return ops
+
+
+def write_pdf(layout: Sequence[LayoutOp], path: str) -> str:
+    """Replay ``layout`` onto a fresh page and write it to ``path`` (runs in render workers)."""
+    pdf = FPDF()
+    pdf.set_compression(True)
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    for op, *args in layout:
+        if op == "font":
+            pdf.set_font("Helvetica", args[0], args[1])
+        elif op == "cell":
+            pdf.cell(args[0], args[1], args[2], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        elif op == "multi":
+            pdf.multi_cell(args[0], args[1], args[2], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        elif op == "ln":
+            pdf.ln(args[0])
+        elif op == "xy":
+            pdf.set_xy(args[0], args[1])
+        elif op == "min_y":
+            if pdf.get_y() < args[0]:
+                pdf.set_xy(10, args[0])
+        elif op == "image":
+            photo, x, y, w, h = args
+            pdf.image(io.BytesIO(photo), x=x, y=y, w=w, h=h)
+        elif op == "header":
+            pdf.set_font("Helvetica", "B", 13)
+            pdf.cell(0, 8, args[0], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.set_draw_color(100, 100, 100)
+            pdf.set_line_width(0.4)
+            pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+            pdf.ln(2)
+    pdf.output(path)
+    return path
+
+
+class CVPdfRenderer:
+    """Renders candidate profiles to PDF, optionally across a process pool.
+
+    Headshots are downscaled and JPEG-encoded once per source file, and text is
+    sanitized while building the layout, so workers only replay drawing operations.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_workers: int = 1,
+        photo_size_px: int = 236,
+        photo_quality: int = 80,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._max_workers = max(1, max_workers)
+        self._photo_size_px = photo_size_px
+        self._photo_quality = photo_quality
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def render(self, profile: CandidateProfile) -> Path:
+        layout, path = self._prepare(profile)
+        if not self._parallel():
+            return Path(write_pdf(layout, path))
+        return Path(self._pool().submit(write_pdf, layout, path).result())
+
+    def render_many(
+        self,
+        profiles: Sequence[CandidateProfile],
+        filenames: Optional[Sequence[str]] = None,
+        output_dir: Optional[Path] = None,
+    ) -> List[Path]:
+        """Render ``profiles`` in parallel; output order matches input order.
+
+        ``filenames`` fixes the output names (default: candidate name plus a random suffix);
+        ``output_dir`` overrides the renderer's directory for this call.
+        """
+        names: Sequence[Optional[str]] = filenames if filenames is not None else [None] * len(profiles)
+        jobs = [self._prepare(profile, name, output_dir) for profile, name in zip(profiles, names)]
+        if not self._parallel() or len(jobs) == 1:
+            return [Path(write_pdf(layout, path)) for layout, path in jobs]
+        futures = [self._pool().submit(write_pdf, layout, path) for layout, path in jobs]
+        return [Path(future.result()) for future in futures]
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def _prepare(
+        self,
+        profile: CandidateProfile,
+        filename: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+    ) -> Tuple[List[LayoutOp], str]:
+        photo = prepare_photo(profile.photo_path, self._photo_size_px, self._photo_quality)
+        filename = filename or f"{profile.name.replace(' ', '_')}-{uuid4().hex[:8]}.pdf"
+        return build_layout(profile, photo), str(Path(output_dir or self.output_dir) / filename)
+
+    def _parallel(self) -> bool:
+        # Daemonic processes (Celery prefork workers) may not start children; render inline there.
+        return self._max_workers > 1 and not multiprocessing.current_process().daemon
+
+    def _pool(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._logger.info("Starting PDF render pool with %d workers.", self._max_workers)
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            return self._executor
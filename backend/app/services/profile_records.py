@@ -0,0 +1,72 @@
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from app.domain.models import CandidateProfile
+
+PROFILE_RECORD_SUFFIX = ".profile.json"
+PROFILE_RECORD_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def profile_record_path(pdf_path: Path) -> Path:
+    """Sidecar location for a generated CV: ``<stem>.profile.json`` beside the PDF."""
+    pdf_path = Path(pdf_path)
+    return pdf_path.with_name(f"{pdf_path.stem}{PROFILE_RECORD_SUFFIX}")
+
+
+def write_profile_record(pdf_path: Path, profile: CandidateProfile) -> Path:
+    """Persist the profile a PDF was rendered from as one compact JSON record."""
+    path = profile_record_path(pdf_path)
+    record = {
+        "version": PROFILE_RECORD_VERSION,
+        "file": Path(pdf_path).name,
+        "profile": profile.model_dump(mode="json"),
+    }
+    tmp_path = path.with_name(f"{path.name}.{uuid4().hex[:8]}.tmp")
+    tmp_path.write_text(json.dumps(record, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp_path.replace(path)
+    return path
+
+
+def read_profile_record(pdf_path: Path) -> Optional[CandidateProfile]:
+    """Load a PDF's sidecar profile; ``None`` when it is missing or unreadable."""
+    path = profile_record_path(pdf_path)
+    try:
+        record = json.loads(path.read_text(encoding="utf-8"))
+        if record.get("version") != PROFILE_RECORD_VERSION:
+            return None
+        return CandidateProfile.model_validate(record["profile"])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, ValidationError):
+        logger.warning("Ignoring unreadable profile record %s", path)
+        return None
+
+
+def profile_to_text(profile: CandidateProfile) -> str:
+    """Plain-text CV with the same sections as the rendered PDF."""
+    contact = " | ".join(
+        str(profile.contact.get(key) or "") for key in ("email", "phone", "location")
+    )
+    sections = [
+        "\n".join(line for line in (profile.name, profile.title, contact) if line.strip(" |")),
+        f"Summary\n{profile.summary}",
+        "Experience\n" + "\n\n".join(
+            f"{job.get('role', '')} - {job.get('company', '')} ({job.get('duration', '')})\n"
+            f"{job.get('achievements', '')}".strip()
+            for job in profile.experience
+        ),
+        f"Skills\n{', '.join(profile.skills)}",
+        "Education\n" + "\n".join(
+            f"{edu.get('institution', '')}: {edu.get('degree', '')} - {edu.get('graduation_year', '')}"
+            for edu in profile.education
+        ),
+        f"Languages\n{', '.join(profile.languages)}",
+    ]
+    return "\n\n".join(section.strip() for section in sections if section.strip())
@@ -1,6 +1,13 @@
 import logging
+import random
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from google import genai
@@ -36,42 +43,200 @@ class MockImageGenerator(CandidateImageGenerator):
         image.save(self.seed_file)
 
 
+PoolKey = Tuple[str, str]
+
+# Keyword -> role family used to bucket pooled headshots; first match wins.
+ROLE_FAMILIES = (
+    ("data", ("data", "machine learning", "ml", "ai", "scientist", "analytics", "research", "researcher")),
+    ("security", ("security", "cyber", "compliance")),
+    ("design", ("design", "designer", "ux", "ui", "creative")),
+    ("product", ("product", "program", "project")),
+    ("leadership", ("head", "director", "vp", "chief", "cto", "ceo", "manager", "lead")),
+    ("engineering", ("engineer", "developer", "architect", "devops", "sre", "programmer", "frontend", "backend")),
+    ("business", ("sales", "marketing", "account", "finance", "operations", "consultant", "hr")),
+)
+
+
+def role_family(title: str) -> str:
+    words = " ".join(re.findall(r"[a-z0-9]+", (title or "").lower()))
+    for family, keywords in ROLE_FAMILIES:
+        if any(re.search(rf"\b{keyword}\b", words) for keyword in keywords):
+            return family
+    return "general"
+
+
+class HeadshotPool:
+    """Disk-backed pool of reusable headshots bucketed by (gender descriptor, role family).
+
+    Each bucket is topped up to ``variants_per_key`` images and then served at random.
+    Images older than ``max_age_seconds`` are dropped, and the oldest images go first
+    once the pool holds more than ``max_images``.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        variants_per_key: int = 6,
+        max_images: int = 500,
+        max_age_seconds: float = 7 * 24 * 3600,
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._variants_per_key = max(1, variants_per_key)
+        self._max_images = max(1, max_images)
+        self._max_age_seconds = max_age_seconds
+        self._random = random.Random()
+        self._key_locks: Dict[PoolKey, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def key_lock(self, key: PoolKey) -> threading.Lock:
+        """Lock held while a bucket is being filled, so concurrent misses share one request."""
+        with self._lock:
+            return self._key_locks[key]
+
+    def shortfall(self, key: PoolKey) -> int:
+        return max(0, self._variants_per_key - len(self._images(key)))
+
+    def new_path(self, key: PoolKey) -> Path:
+        bucket = self._bucket(key)
+        bucket.mkdir(parents=True, exist_ok=True)
+        return bucket / f"photo-{uuid4().hex[:8]}.png"
+
+    def draw(self, key: PoolKey, target_dir: Path) -> Optional[Path]:
+        """Pin a random image of ``key`` as a private file in ``target_dir``.
+
+        The file is a hard link (or a copy across filesystems), so a concurrent
+        :meth:`evict` cannot remove the photo before the caller has rendered it.
+        """
+        images = self._images(key)
+        self._random.shuffle(images)
+        target = Path(target_dir) / f"photo-{uuid4().hex[:8]}.png"
+        for image in images:
+            try:
+                _pin(image, target)
+            except FileNotFoundError:
+                # Evicted since it was listed; try another image from the bucket.
+                continue
+            return target
+        return None
+
+    def evict(self) -> int:
+        """Apply age and size limits across the pool; returns the number of images removed."""
+        images = sorted(self.root.glob("*/*.png"), key=self._mtime)
+        now = time.time()
+        expired = [path for path in images if now - self._mtime(path) > self._max_age_seconds]
+        live = images[len(expired):]
+        overflow = live[: max(0, len(live) - self._max_images)]
+        removed = 0
+        for path in expired + overflow:
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                self._logger.warning("Failed to evict pooled photo %s", path)
+        return removed
+
+    def _images(self, key: PoolKey) -> List[Path]:
+        now = time.time()
+        return [
+            path
+            for path in self._bucket(key).glob("*.png")
+            if now - self._mtime(path) <= self._max_age_seconds
+        ]
+
+    def _bucket(self, key: PoolKey) -> Path:
+        return self.root / "--".join(re.sub(r"[^a-z0-9]+", "-", part.lower()).strip("-") for part in key)
+
+    @staticmethod
+    def _mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+
+def _pin(source: Path, target: Path) -> None:
+    try:
+        os.link(source, target)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(source, target)
+
+
 class GeminiImageGenerator(CandidateImageGenerator):
-    """Gemini-powered headshot generator."""
+    """Gemini-powered headshot generator, optionally drawing from a :class:`HeadshotPool`."""
 
-    def __init__(self, api_key: str, model_name: str, photos_dir: Path) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        photos_dir: Path,
+        pool: Optional[HeadshotPool] = None,
+        images_per_request: int = 4,
+    ) -> None:
         self.photos_dir = Path(photos_dir)
         self.photos_dir.mkdir(parents=True, exist_ok=True)
         self.client = genai.Client(api_key=api_key) if api_key and model_name else None
         self._logger = logging.getLogger(self.__class__.__name__)
         self.model_name = model_name
+        self.pool = pool
+        self._images_per_request = max(1, images_per_request)
 
     def generate(self, profile: CandidateProfile) -> Path:
         if not self.client or not self.model_name:
             raise RuntimeError("Gemini credentials are not configured; cannot generate photo.")
 
-        self._logger.info("Generating candidate photo via Gemini image model.")
         descriptor = self._gender_descriptor(profile.gender)
+        if self.pool is None:
+            self._logger.info("Generating candidate photo via Gemini image model.")
+            prompt = (
+                f"Professional corporate headshot of a {descriptor}, medium close-up, neutral background, "
+                f"role: {profile.title}."
+            )
+            return self._request_images(prompt, [self.photos_dir / f"photo-{uuid4().hex[:8]}.png"])[0]
+
+        key = (descriptor, role_family(profile.title))
+        with self.pool.key_lock(key):
+            missing = self.pool.shortfall(key)
+            if missing:
+                self._fill_pool(key, min(missing, self._images_per_request))
+        photo = self.pool.draw(key, self.photos_dir)
+        if photo is None:
+            raise RuntimeError("Gemini returned no images for the request.")
+        return photo
+
+    def _fill_pool(self, key: PoolKey, count: int) -> None:
+        descriptor, family = key
+        self._logger.info("Filling headshot pool %s with %d images.", key, count)
         prompt = (
             f"Professional corporate headshot of a {descriptor}, medium close-up, neutral background, "
-            f"role: {profile.title}."
+            f"working in {family}. Each image shows a different person."
         )
+        self._request_images(prompt, [self.pool.new_path(key) for _ in range(count)])
+        self.pool.evict()
+
+    def _request_images(self, prompt: str, targets: List[Path]) -> List[Path]:
+        saved: List[Path] = []
         try:
             response = self.client.models.generate_images(
                 model=self.model_name,
                 prompt=prompt,
-                config=genai_types.GenerateImagesConfig(number_of_images=1),
+                config=genai_types.GenerateImagesConfig(number_of_images=len(targets)),
             )
             for generated_image in getattr(response, "generated_images", []) or []:
                 image_obj = getattr(generated_image, "image", None)
-                if hasattr(image_obj, "save"):
-                    filename = self.photos_dir / f"photo-{uuid4().hex[:8]}.png"
+                if hasattr(image_obj, "save") and len(saved) < len(targets):
+                    filename = targets[len(saved)]
                     image_obj.save(filename)
-                    return filename
+                    saved.append(filename)
         except Exception as exc:
             self._logger.exception("Gemini image generation failed.")
             raise RuntimeError("Failed to generate photo via Gemini.") from exc
-        raise RuntimeError("Gemini returned no images for the request.")
+        if not saved:
+            raise RuntimeError("Gemini returned no images for the request.")
+        return saved
 
     def _placeholder_photo(self, profile: CandidateProfile) -> Path:
         filename = self.photos_dir / f"placeholder-{uuid4().hex[:8]}.png"
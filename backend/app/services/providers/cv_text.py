@@ -1,7 +1,7 @@
 import json
 import logging
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Union
 
 from google import genai
 from google.genai import types as genai_types
@@ -13,8 +13,8 @@ from app.services.cv_generator import CVTextGenerator
 class MockCVTextGenerator(CVTextGenerator):
     """Deterministic-ish fallback profile generator used in dev and tests."""
 
-    def __init__(self) -> None:
-        self._random = random.Random()
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self._random = random.Random(seed)
 
     def generate(self) -> CandidateProfile:
         first_names = ["Avery", "Kai", "Morgan", "Sage", "River"]
@@ -82,14 +82,25 @@ class MockCVTextGenerator(CVTextGenerator):
 class GeminiCVTextGenerator(CVTextGenerator):
     """Gemini-powered profile generator with JSON schema enforcement."""
 
-    def __init__(self, api_key: str, model_name: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        profiles_per_request: int = 1,
+        max_attempts: int = 3,
+    ) -> None:
         self._client = genai.Client(api_key=api_key) if api_key and model_name else None
         self._model_name = model_name
+        self._profiles_per_request = max(1, profiles_per_request)
+        self._max_attempts = max(1, max_attempts)
         self._logger = logging.getLogger(self.__class__.__name__)
 
+    @property
+    def profiles_per_request(self) -> int:
+        return self._profiles_per_request
+
     def generate(self) -> CandidateProfile:
-        if not self._client or not self._model_name:
-            raise RuntimeError("Gemini credentials are not configured; cannot generate CV.")
+        self._ensure_client()
 
         config = genai_types.GenerateContentConfig(
             response_mime_type="application/json",
@@ -111,6 +122,73 @@ class GeminiCVTextGenerator(CVTextGenerator):
             raise RuntimeError("Failed to generate CV via Gemini.") from exc
         raise RuntimeError("Gemini returned empty payload for CV generation.")
 
+    def generate_many(self, count: int) -> List[CandidateProfile]:
+        """Generate ``count`` profiles, asking Gemini for up to K of them per structured call.
+
+        Elements are validated one by one and duplicates are dropped; only the missing
+        ones are requested again, giving up after ``max_attempts`` short responses.
+        """
+        self._ensure_client()
+        profiles: List[CandidateProfile] = []
+        failed_rounds = 0
+        while len(profiles) < count:
+            requested = min(count - len(profiles), self._profiles_per_request)
+            produced = self._request_profiles(requested, exclude={profile.name for profile in profiles})
+            profiles.extend(produced)
+            if len(produced) < requested:
+                failed_rounds += 1
+                self._logger.warning(
+                    "Gemini returned %d valid profiles out of %d requested; re-requesting the rest.",
+                    len(produced),
+                    requested,
+                )
+                if failed_rounds >= self._max_attempts:
+                    raise RuntimeError(
+                        f"Gemini produced {len(profiles)} valid profiles out of {count} after "
+                        f"{self._max_attempts} attempts."
+                    )
+        return profiles
+
+    def _request_profiles(self, count: int, exclude: Set[str]) -> List[CandidateProfile]:
+        config = genai_types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=genai_types.Schema(
+                type=genai_types.Type.ARRAY,
+                items=self._get_schema(),
+                min_items=count,
+                max_items=count,
+            ),
+        )
+        try:
+            response = self._client.models.generate_content(
+                model=self._model_name,
+                contents=self._batch_prompt(count),
+                config=config,
+            )
+        except Exception as exc:  # pragma: no cover - network failures already logged
+            self._logger.exception("Gemini batch text generation failed.")
+            raise RuntimeError("Failed to generate CVs via Gemini.") from exc
+
+        payload = self._extract_json(response)
+        items = payload if isinstance(payload, list) else [payload] if payload else []
+        profiles: List[CandidateProfile] = []
+        for item in items[:count]:
+            if not isinstance(item, dict):
+                continue
+            try:
+                profile = self._profile_from_payload(item)
+            except ValueError:
+                continue
+            if profile.name in exclude:
+                continue
+            exclude.add(profile.name)
+            profiles.append(profile)
+        return profiles
+
+    def _ensure_client(self) -> None:
+        if not self._client or not self._model_name:
+            raise RuntimeError("Gemini credentials are not configured; cannot generate CV.")
+
     def _profile_from_payload(self, payload: Dict[str, object]) -> CandidateProfile:
         def _ensure_list(value: object) -> List:
             if isinstance(value, list):
@@ -177,6 +255,13 @@ class GeminiCVTextGenerator(CVTextGenerator):
             "Include a gender value inferred from the name (female, male, non-binary)."
         )
 
+    def _batch_prompt(self, count: int) -> str:
+        return (
+            f"You are a CV-writing assistant. Produce a JSON array of exactly {count} realistic candidates. "
+            "Every candidate must be distinct: vary names, job titles, industries, and seniority levels. "
+            "Include for each a gender value inferred from the name (female, male, non-binary)."
+        )
+
     def _get_schema(self) -> genai_types.Schema:
         return genai_types.Schema(
             type=genai_types.Type.OBJECT,
@@ -227,7 +312,7 @@ class GeminiCVTextGenerator(CVTextGenerator):
             },
         )
 
-    def _extract_json(self, response) -> Optional[Dict[str, object]]:
+    def _extract_json(self, response) -> Optional[Union[Dict[str, object], List[object]]]:
         if hasattr(response, "text") and response.text:
             try:
                 return json.loads(response.text)
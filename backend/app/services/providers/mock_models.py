@@ -0,0 +1,126 @@
+import asyncio
+import hashlib
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_WORD = re.compile(r"\w[\w+#.]*")
+_CONTEXT = re.compile(r"<context>(.*?)</context>", re.DOTALL)
+
+
+class MockEmbeddings(Embeddings):
+    """Deterministic offline embeddings: signed feature hashing of lower-cased words.
+
+    Texts sharing words get similar vectors, so retrieval behaves plausibly without
+    a model. ``latency_seconds`` is slept once per call to stand in for a remote API.
+    """
+
+    def __init__(self, size: int = 768, latency_seconds: float = 0.0) -> None:
+        self.size = size
+        self.latency_seconds = latency_seconds
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def _vector(self, text: str) -> List[float]:
+        words = _WORD.findall(text.lower())
+        vector = np.zeros(self.size, dtype=np.float32)
+        if not words:
+            return vector.tolist()
+        hashes = np.frombuffer(
+            b"".join(hashlib.blake2b(word.encode(), digest_size=8).digest() for word in words),
+            dtype=np.uint64,
+        )
+        signs = np.where(hashes & np.uint64(1), 1.0, -1.0).astype(np.float32)
+        np.add.at(vector, (hashes >> np.uint64(1)) % np.uint64(self.size), signs)
+        return (vector / (np.linalg.norm(vector) or 1.0)).tolist()
+
+
+class MockChatModel(BaseChatModel):
+    """Deterministic offline chat model that answers with the opening words of the prompt context.
+
+    ``latency_seconds`` is slept before the first token and ``token_latency_seconds``
+    between tokens, in both blocking and async/streaming calls.
+    """
+
+    latency_seconds: float = 0.0
+    token_latency_seconds: float = 0.0
+    response_words: int = 40
+
+    @property
+    def _llm_type(self) -> str:
+        return "mock-chat"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        words = self._reply(messages)
+        time.sleep(self.latency_seconds + self.token_latency_seconds * len(words))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(words)))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        words = self._reply(messages)
+        await asyncio.sleep(self.latency_seconds + self.token_latency_seconds * len(words))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=" ".join(words)))])
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency_seconds)
+        for position, word in enumerate(self._reply(messages)):
+            if position and self.token_latency_seconds:
+                time.sleep(self.token_latency_seconds)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if not position else f" {word}"))
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency_seconds)
+        for position, word in enumerate(self._reply(messages)):
+            if position and self.token_latency_seconds:
+                await asyncio.sleep(self.token_latency_seconds)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word if not position else f" {word}"))
+
+    def _reply(self, messages: List[BaseMessage]) -> List[str]:
+        prompt = str(messages[-1].content) if messages else ""
+        match = _CONTEXT.search(prompt)
+        words = (match.group(1) if match else prompt).split()
+        return words[: self.response_words] or ["No", "context."]
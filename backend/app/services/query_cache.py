@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, List, Optional, Protocol, Tuple, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+V = TypeVar("V")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    """Canonical cache key form: case-folded, single-spaced, without trailing punctuation."""
+    return _WHITESPACE.sub(" ", question.casefold()).strip().rstrip("?!. ")
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe LRU cache with optional TTL and hit/miss counters."""
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None) -> None:
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._ttl_seconds and time.monotonic() - entry[0] > self._ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: V) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class AnswerCache(Protocol):
+    def get(self, generation: int, question: str) -> Optional[str]:
+        ...
+
+    def set(self, generation: int, question: str, answer: str) -> None:
+        ...
+
+    async def aget(self, generation: int, question: str) -> Optional[str]:
+        ...
+
+    async def aset(self, generation: int, question: str, answer: str) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        ...
+
+
+class InMemoryAnswerCache(AnswerCache):
+    """Per-process answer cache with size-based LRU eviction and TTL."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._cache: LRUCache[str] = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get(self, generation: int, question: str) -> Optional[str]:
+        return self._cache.get((generation, normalize_question(question)))
+
+    def set(self, generation: int, question: str, answer: str) -> None:
+        self._cache.set((generation, normalize_question(question)), answer)
+
+    async def aget(self, generation: int, question: str) -> Optional[str]:
+        # An in-process dict lookup; cheaper than a thread hop.
+        return self.get(generation, question)
+
+    async def aset(self, generation: int, question: str, answer: str) -> None:
+        self.set(generation, question, answer)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+
+class RedisAnswerCache(AnswerCache):
+    """Answer cache shared by all API workers through Redis.
+
+    Keys embed the index generation, so publishing a new version makes old entries
+    unreachable; they expire by TTL and are subject to the server's maxmemory policy.
+    Redis outages degrade to cache misses rather than failing the chat request, so the
+    client should be built with short socket timeouts. The async methods run the
+    blocking client in a thread to keep Redis round trips off the event loop.
+    """
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "cv_screener:answer") -> None:
+        self._client = client
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def get(self, generation: int, question: str) -> Optional[str]:
+        try:
+            value = self._client.get(self._key(generation, question))
+        except Exception:
+            self._logger.warning("Answer cache lookup failed.", exc_info=True)
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+    def set(self, generation: int, question: str, answer: str) -> None:
+        try:
+            self._client.set(self._key(generation, question), answer, ex=self._ttl_seconds)
+        except Exception:
+            self._logger.warning("Answer cache write failed.", exc_info=True)
+
+    async def aget(self, generation: int, question: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, generation, question)
+
+    async def aset(self, generation: int, question: str, answer: str) -> None:
+        await asyncio.to_thread(self.set, generation, question, answer)
+
+    def clear(self) -> None:
+        """No-op: keys embed the generation, so a new index version never reads old entries."""
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": -1}
+
+    def _key(self, generation: int, question: str) -> str:
+        digest = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()
+        return f"{self._prefix}:{generation}:{digest}"
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Wraps query embeddings with an LRU keyed by the normalized question."""
+
+    def __init__(self, embeddings: Embeddings, cache: LRUCache[List[float]]) -> None:
+        self._embeddings = embeddings
+        self._cache = cache
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_question(text)
+        vector = self._cache.get(key)
+        if vector is None:
+            vector = self._embeddings.embed_query(text)
+            self._cache.set(key, vector)
+        return vector
+
+    async def aembed_query(self, text: str) -> List[float]:
+        key = normalize_question(text)
+        vector = self._cache.get(key)
+        if vector is None:
+            vector = await self._embeddings.aembed_query(text)
+            self._cache.set(key, vector)
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embeddings.embed_documents(texts)
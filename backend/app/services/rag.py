@@ -1,12 +1,34 @@
+import asyncio
+import hashlib
+import json
 import logging
-import shutil
+import multiprocessing
+import signal
+import sqlite3
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
 
+import numpy as np
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models import BaseChatModel
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import Runnable
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.vectorstores import FAISS
 from langchain_google_genai import (
@@ -15,35 +37,458 @@ from langchain_google_genai import (
 )
 from PyPDF2 import PdfReader
 
+from app.core.metrics import StageListener, count_items, timed
+from app.domain.models import CandidateProfile
+from app.services.context_packer import ContextPacker
+from app.services.cv_chunker import CVSectionSplitter
+from app.services.index_store import IndexVersion, IndexVersionStore
+from app.services.lexical_index import LexicalSearchConfig
+from app.services.mapped_index import (
+    INDEX_FORMAT_VERSION,
+    MappedIndexRetriever,
+    MappedVectorIndex,
+    write_index_version,
+)
+from app.services.profile_records import profile_record_path, profile_to_text, read_profile_record
+from app.services.query_cache import AnswerCache, CachedQueryEmbeddings, LRUCache
+from app.services.vector_index import VectorIndexConfig
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _time_limit(seconds: float) -> Iterator[None]:
+    """Raise ``TimeoutError`` in the current process after ``seconds`` (main thread only)."""
+    if seconds <= 0 or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _raise_timeout(signum, frame):
+        raise TimeoutError(f"PDF text extraction exceeded {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _read_pdf_text(pdf_path: str, timeout_seconds: float) -> str:
+    """Parse a PDF's text; module level so process pool workers can run it."""
+    with _time_limit(timeout_seconds):
+        with open(pdf_path, "rb") as file_obj:
+            reader = PdfReader(file_obj)
+            chunks = []
+            for page in reader.pages:
+                text = page.extract_text() or ""
+                if text:
+                    chunks.append(text.strip())
+            return "\n\n".join(chunks).strip()
+
+
+class ExtractionCache:
+    """On-disk cache of extracted PDF text keyed by content hash.
+
+    A stat index maps each file name to its (mtime, size, hash) so unchanged files
+    are neither re-parsed nor re-hashed on later ingests.
+    """
+
+    INDEX_FILENAME = "index.json"
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self._stats: Dict[str, Dict[str, object]] = self._load_stats()
+        self._dirty = False
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        entry = self._stats.get(path.name)
+        if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return str(entry["hash"])
+        digest = file_digest(path)
+        self._stats[path.name] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": digest}
+        self._dirty = True
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        try:
+            return self._text_path(digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, digest: str, text: str) -> None:
+        path = self._text_path(digest)
+        tmp_path = path.with_name(f"{path.name}.{uuid4().hex[:8]}.tmp")
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(path)
+
+    def flush(self, live_names: Iterable[str]) -> None:
+        """Persist the stat index and drop entries for files that no longer exist."""
+        live = set(live_names)
+        for name in [name for name in self._stats if name not in live]:
+            del self._stats[name]
+            self._dirty = True
+        if not self._dirty:
+            return
+        live_digests = {str(entry["hash"]) for entry in self._stats.values()}
+        for path in self._cache_dir.glob("*.txt"):
+            if path.stem not in live_digests:
+                path.unlink(missing_ok=True)
+        index_path = self._cache_dir / self.INDEX_FILENAME
+        tmp_path = index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._stats), encoding="utf-8")
+        tmp_path.replace(index_path)
+        self._dirty = False
+
+    def _load_stats(self) -> Dict[str, Dict[str, object]]:
+        try:
+            return json.loads((self._cache_dir / self.INDEX_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _text_path(self, digest: str) -> Path:
+        return self._cache_dir / f"{digest}.txt"
+
 
 class CVTextExtractor:
-    """Extracts text from PDF CV files stored in a static directory."""
+    """Extracts text from PDF CV files stored in a static directory.
 
-    def __init__(self, static_dir: Path) -> None:
+    Generated CVs carry a structured profile sidecar; those are read via
+    :meth:`load_profiles` and only sidecar-less (uploaded) PDFs need text extraction.
+    """
+
+    def __init__(
+        self,
+        static_dir: Path,
+        cache: Optional[ExtractionCache] = None,
+        max_workers: int = 1,
+        timeout_seconds: float = 30.0,
+    ) -> None:
         self._static_dir = static_dir
+        self._cache = cache
+        self._max_workers = max_workers
+        self._timeout_seconds = timeout_seconds
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def extract_texts(self) -> Dict[str, str]:
+    def list_pdfs(self) -> List[Path]:
+        return [path for path in sorted(self._static_dir.glob("*.pdf")) if path.is_file()]
+
+    def file_digests(self) -> Dict[str, str]:
+        """Content hash per PDF (and its profile sidecar), reusing cached hashes for unchanged files."""
+        pdfs = self.list_pdfs()
+        digests = {path.name: self._digest(path) for path in pdfs}
+        for path in pdfs:
+            record_path = profile_record_path(path)
+            if record_path.exists():
+                digests[path.name] = f"{digests[path.name]}+{self._digest(record_path)}"
+        if self._cache is not None:
+            self._cache.flush(self._live_names(pdfs))
+        return digests
+
+    def load_profiles(self, filenames: Iterable[str]) -> Dict[str, CandidateProfile]:
+        """Structured profiles for the given PDFs that have a readable sidecar record."""
+        profiles: Dict[str, CandidateProfile] = {}
+        for name in filenames:
+            profile = read_profile_record(self._static_dir / name)
+            if profile is not None:
+                profiles[name] = profile
+        return profiles
+
+    def extract_texts(self, filenames: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Text of each selected PDF; files that failed to parse are left out."""
+        selected = set(filenames) if filenames is not None else None
+        pdfs = self.list_pdfs()
+        paths = [path for path in pdfs if selected is None or path.name in selected]
+
         texts: Dict[str, str] = {}
-        for pdf_path in sorted(self._static_dir.glob("*.pdf")):
-            if not pdf_path.is_file():
+        digests: Dict[str, str] = {}
+        missing: List[Path] = []
+        for pdf_path in paths:
+            if self._cache is not None:
+                digests[pdf_path.name] = self._cache.digest(pdf_path)
+                cached = self._cache.get(digests[pdf_path.name])
+                if cached is not None:
+                    texts[pdf_path.name] = cached
+                    continue
+            missing.append(pdf_path)
+
+        for name, text in self._extract_many(missing).items():
+            if text is None:
                 continue
-            texts[pdf_path.name] = self._extract_pdf_text(pdf_path)
-        return texts
-
-    def _extract_pdf_text(self, pdf_path: Path) -> str:
+            if self._cache is not None:
+                self._cache.put(digests[name], text)
+            texts[name] = text
+        if self._cache is not None:
+            self._cache.flush(self._live_names(pdfs))
+        return {path.name: texts[path.name] for path in paths if path.name in texts}
+
+    def _digest(self, path: Path) -> str:
+        return self._cache.digest(path) if self._cache is not None else file_digest(path)
+
+    @staticmethod
+    def _live_names(pdfs: List[Path]) -> List[str]:
+        names = [path.name for path in pdfs]
+        return names + [profile_record_path(path).name for path in pdfs]
+
+    def _extract_many(self, paths: List[Path]) -> Dict[str, Optional[str]]:
+        """Parse PDFs, in a process pool when configured; ``None`` marks a failed file."""
+        # Daemonic processes (Celery prefork workers) may not start children; parse serially there.
+        if self._max_workers <= 1 or len(paths) <= 1 or multiprocessing.current_process().daemon:
+            return {path.name: self._extract_pdf_text(path) for path in paths}
+
+        results: Dict[str, Optional[str]] = {}
+        executor = ProcessPoolExecutor(max_workers=min(self._max_workers, len(paths)))
         try:
-            with pdf_path.open("rb") as file_obj:
-                reader = PdfReader(file_obj)
-                chunks = []
-                for page in reader.pages:
-                    text = page.extract_text() or ""
-                    if text:
-                        chunks.append(text.strip())
-                return "\n\n".join(chunks).strip()
+            futures = {
+                executor.submit(_read_pdf_text, str(path), self._timeout_seconds): path
+                for path in paths
+            }
+        except Exception:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._logger.warning("Could not start the PDF extraction pool; parsing serially.", exc_info=True)
+            return {path.name: self._extract_pdf_text(path) for path in paths}
+        with executor:
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    results[pdf_path.name] = future.result()
+                except Exception:
+                    self._logger.exception("Failed to extract text from %s", pdf_path)
+                    results[pdf_path.name] = None
+        return results
+
+    def _extract_pdf_text(self, pdf_path: Path) -> Optional[str]:
+        try:
+            return _read_pdf_text(str(pdf_path), self._timeout_seconds)
         except Exception:
             self._logger.exception("Failed to extract text from %s", pdf_path)
-            return ""
+            return None
+
+
+class EmbeddingCache:
+    """Compact SQLite store of float32 vectors keyed by (model, task type, text hash)."""
+
+    _QUERY_BATCH = 500
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, task_type: str, text: str) -> str:
+        digest = hashlib.sha256(f"{model}\x00{task_type}\x00".encode("utf-8"))
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), self._QUERY_BATCH):
+                batch = keys[start : start + self._QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        rows = [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        return self._conn
+
+
+class RateLimiter:
+    """Spaces out calls so no more than ``per_minute`` start in any minute (0 disables)."""
+
+    def __init__(self, per_minute: int) -> None:
+        self._interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class EmbeddingPipeline:
+    """Embeds texts in rate-limited concurrent batches, reusing cached vectors.
+
+    ``embed`` is a generator yielding ``(positions, vectors)`` as each batch becomes
+    available, so callers can stream vectors into the index instead of waiting for
+    the whole corpus.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        task_type: str,
+        cache: Optional[EmbeddingCache] = None,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        requests_per_minute: int = 0,
+        max_retries: int = 3,
+    ) -> None:
+        self._embeddings = embeddings
+        self._model = model
+        self._task_type = task_type
+        self._cache = cache
+        self._batch_size = max(1, batch_size)
+        self._max_concurrency = max(1, max_concurrency)
+        self._rate_limiter = RateLimiter(requests_per_minute)
+        self._max_retries = max_retries
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def embed(self, texts: List[str]) -> Iterator[Tuple[List[int], List[List[float]]]]:
+        keys = [EmbeddingCache.key(self._model, self._task_type, text) for text in texts]
+        cached = self._cache.get_many(keys) if self._cache is not None else {}
+        hits = [position for position, key in enumerate(keys) if key in cached]
+        if hits:
+            yield hits, [cached[keys[position]] for position in hits]
+
+        # Identical chunk texts (e.g. boilerplate) are embedded once.
+        misses: Dict[str, List[int]] = {}
+        for position, key in enumerate(keys):
+            if key not in cached:
+                misses.setdefault(key, []).append(position)
+        unique = list(misses.items())
+        batches = [unique[start : start + self._batch_size] for start in range(0, len(unique), self._batch_size)]
+        self._logger.info(
+            "Embedding %d texts: %d cached, %d unique in %d batches.",
+            len(texts),
+            len(hits),
+            len(unique),
+            len(batches),
+        )
+
+        pending_batches = iter(batches)
+        with ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            in_flight: Dict[Future, List[Tuple[str, List[int]]]] = {}
+
+            def _submit_next() -> None:
+                batch = next(pending_batches, None)
+                if batch is not None:
+                    texts_batch = [texts[positions[0]] for _, positions in batch]
+                    in_flight[executor.submit(self._embed_batch, texts_batch)] = batch
+
+            # Keep a bounded window of batches in flight so memory stays flat on huge corpora.
+            for _ in range(self._max_concurrency * 2):
+                _submit_next()
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    vectors = future.result()
+                    if self._cache is not None:
+                        self._cache.put_many((key, vector) for (key, _), vector in zip(batch, vectors))
+                    positions: List[int] = []
+                    batch_vectors: List[List[float]] = []
+                    for (_, key_positions), vector in zip(batch, vectors):
+                        positions.extend(key_positions)
+                        batch_vectors.extend([vector] * len(key_positions))
+                    yield positions, batch_vectors
+                    _submit_next()
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        attempt = 0
+        while True:
+            self._rate_limiter.acquire()
+            try:
+                return self._embeddings.embed_documents(texts)
+            except Exception:
+                if attempt >= self._max_retries:
+                    raise
+                delay = min(2**attempt, 30)
+                self._logger.warning("Embedding batch failed; retrying in %ss.", delay, exc_info=True)
+                time.sleep(delay)
+                attempt += 1
+
+
+class IndexManifest:
+    """Records which PDF revisions are embedded in the index and their docstore chunk IDs."""
+
+    FILENAME = "manifest.json"
+
+    def __init__(
+        self,
+        fingerprint: Dict[str, object],
+        files: Optional[Dict[str, Dict[str, object]]] = None,
+        index_params: Optional[Dict[str, object]] = None,
+        format_version: int = 0,
+        lexical: bool = False,
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.files: Dict[str, Dict[str, object]] = files or {}
+        self.index_params: Dict[str, object] = index_params or {}
+        self.format_version = format_version
+        # Whether the version carries BM25 postings (written only with hybrid retrieval).
+        self.lexical = lexical
+
+    @classmethod
+    def load(cls, index_dir: Path) -> Optional["IndexManifest"]:
+        path = index_dir / cls.FILENAME
+        if not path.exists():
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return cls(
+            fingerprint=payload.get("fingerprint", {}),
+            files=payload.get("files", {}),
+            index_params=payload.get("index_params", {}),
+            format_version=payload.get("format_version", 0),
+            lexical=payload.get("lexical", False),
+        )
+
+    def save(self, index_dir: Path) -> None:
+        path = index_dir / self.FILENAME
+        tmp_path = path.with_suffix(".tmp")
+        payload = {
+            "fingerprint": self.fingerprint,
+            "files": self.files,
+            "index_params": self.index_params,
+            "format_version": self.format_version,
+            "lexical": self.lexical,
+        }
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+        tmp_path.replace(path)
+
+    def document_count(self) -> int:
+        return sum(1 for entry in self.files.values() if entry.get("chunk_ids"))
 
 
 class RAGServiceError(Exception):
@@ -62,60 +507,188 @@ class RAGEmptyCorpusError(RAGServiceError):
     """Raised when no usable CV text is available for ingestion."""
 
 
+@dataclass(frozen=True)
+class LoadedIndex:
+    """Everything served from one published index version."""
+
+    generation: int
+    index: MappedVectorIndex
+    retriever: BaseRetriever
+    chain: Runnable
+
+
 class RAGService:
     """Handles CV ingestion into FAISS and answers chat queries via RAG."""
 
     def __init__(
         self,
         text_extractor: CVTextExtractor,
-        index_dir: Path,
+        index_store: IndexVersionStore,
         embedding_model: str,
         chat_model: str,
         google_api_key: Optional[str],
         chunk_size: int,
         chunk_overlap: int,
         retriever_k: int,
+        reload_interval_seconds: float = 2.0,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedding_batch_size: int = 100,
+        embedding_concurrency: int = 4,
+        embedding_requests_per_minute: int = 0,
+        embedding_max_retries: int = 3,
+        vector_index: Optional[VectorIndexConfig] = None,
+        query_embedding_cache_size: int = 1024,
+        answer_cache: Optional[AnswerCache] = None,
+        chunking: str = "sections",
+        lexical_search: Optional[LexicalSearchConfig] = None,
+        context_packer: Optional[ContextPacker] = None,
+        context_candidates: Optional[int] = None,
+        embeddings_factory: Optional[Callable[[str], Embeddings]] = None,
+        chat_llm: Optional[BaseChatModel] = None,
     ) -> None:
         self._text_extractor = text_extractor
-        self._index_dir = index_dir
+        self._index_store = index_store
         self._embedding_model = embedding_model
         self._chat_model = chat_model
         self._api_key = google_api_key or ""
-        self._rag_chain = None
         self._chunk_size = chunk_size
         self._chunk_overlap = chunk_overlap
         self._retriever_k = retriever_k
+        self._reload_interval_seconds = reload_interval_seconds
+        self._embedding_cache = embedding_cache
+        self._embedding_batch_size = embedding_batch_size
+        self._embedding_concurrency = embedding_concurrency
+        self._embedding_requests_per_minute = embedding_requests_per_minute
+        self._embedding_max_retries = embedding_max_retries
+        self._vector_index = vector_index or VectorIndexConfig()
+        self._query_embeddings: LRUCache[List[float]] = LRUCache(max_size=query_embedding_cache_size)
+        self._answer_cache = answer_cache
+        self._chunking = chunking
+        self._lexical_search = lexical_search or LexicalSearchConfig()
+        self._context_packer = context_packer
+        # Retrieval depth while packing; the packer's budget decides how many are used.
+        self._context_candidates = context_candidates or retriever_k
+        # Offline stand-ins for Gemini (benchmarks, local runs); used instead of the API when set.
+        self._embeddings_factory = embeddings_factory
+        self._chat_llm = chat_llm
+        self._loaded: Optional[LoadedIndex] = None
+        self._last_reload_check = float("-inf")
+        self._chain_lock = threading.Lock()
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    def ingest(self) -> int:
-        """Rebuild FAISS index from CV PDFs, returning number of CVs ingested."""
-        self._ensure_api_key()
-        cv_texts = self._text_extractor.extract_texts()
+    @property
+    def is_warm(self) -> bool:
+        """Whether the FAISS index and chat chain are already loaded in memory."""
+        return self._loaded is not None
 
-        documents = self._build_documents(cv_texts)
-        if not documents:
-            raise RAGEmptyCorpusError("No CV texts found to ingest.")
+    @property
+    def index_generation(self) -> Optional[int]:
+        """Generation of the index version currently served from memory."""
+        loaded = self._loaded
+        return loaded.generation if loaded is not None else None
 
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self._chunk_size,
-            chunk_overlap=self._chunk_overlap,
-            separators=["\n\n", "\n", ".", " "],
+    def warm_up(self) -> None:
+        """Load the index and build the chat chain ahead of the first request."""
+        self._get_loaded()
+
+    def ingest(self, on_stage: Optional[StageListener] = None) -> int:
+        """Sync the FAISS index with CV PDFs, returning number of CVs indexed.
+
+        Only new or changed PDFs (by content hash) are extracted and embedded;
+        vectors of changed or deleted PDFs are removed by their docstore IDs.
+        """
+        self._ensure_api_key()
+        with timed("rag.ingest"), self._index_store.lock():
+            documents = self._sync_index(on_stage)
+            self._index_store.collect_garbage()
+        return documents
+
+    def _sync_index(self, on_stage: Optional[StageListener] = None) -> int:
+        """Build the next index version from the current one and publish it."""
+        digests = self._text_extractor.file_digests()
+        embeddings = self._embeddings("RETRIEVAL_DOCUMENT")
+        current = self._index_store.current()
+        manifest, vectorstore = self._load_for_update(current, embeddings)
+
+        stale = [name for name, entry in manifest.files.items() if digests.get(name) != entry.get("hash")]
+        pending = [
+            name
+            for name, digest in digests.items()
+            if manifest.files.get(name, {}).get("hash") != digest
+        ]
+        index_params = self._vector_index.build_params()
+        up_to_date = (
+            manifest.index_params == index_params
+            and manifest.format_version == INDEX_FORMAT_VERSION
+            and (manifest.lexical or not self._lexical_search.enabled)
         )
-        chunks = splitter.split_documents(documents)
-        if not chunks:
-            raise RAGEmptyCorpusError("Unable to create chunks from CV texts.")
+        if vectorstore is not None and not stale and not pending and up_to_date:
+            self._logger.info("RAG index is up to date; nothing to ingest.")
+            return manifest.document_count()
+
+        stale_ids = [chunk_id for name in stale for chunk_id in manifest.files.pop(name).get("chunk_ids", [])]
+        if vectorstore is not None and stale_ids:
+            vectorstore.delete(stale_ids)
+
+        with timed("rag.extract", on_stage):
+            profiles = self._text_extractor.load_profiles(pending)
+            cv_texts = self._text_extractor.extract_texts([name for name in pending if name not in profiles])
+        count_items("pdfs_extracted", len(cv_texts))
+        with timed("rag.chunk", on_stage):
+            chunks = self._chunk_documents(profiles, cv_texts)
+        chunks_by_file: Dict[str, List[Document]] = {}
+        for chunk in chunks:
+            chunks_by_file.setdefault(chunk.metadata["filename"], []).append(chunk)
+
+        new_ids: List[str] = []
+        new_chunks: List[Document] = []
+        # Files that failed to parse stay out of the manifest, so the next sync retries them.
+        failed = {name for name in pending if name not in profiles and name not in cv_texts}
+        if failed:
+            self._logger.warning("Skipped %d CVs whose text could not be extracted.", len(failed))
+            if vectorstore is not None and not stale and up_to_date and len(failed) == len(pending):
+                return manifest.document_count()
+        for name in pending:
+            if name in failed:
+                continue
+            chunks = chunks_by_file.get(name, [])
+            chunk_ids = [uuid4().hex for _ in chunks]
+            manifest.files[name] = {"hash": digests[name], "chunk_ids": chunk_ids}
+            new_ids.extend(chunk_ids)
+            new_chunks.extend(chunks)
 
-        self._clear_index_dir()
+        if manifest.document_count() == 0:
+            raise RAGEmptyCorpusError("No CV texts found to ingest.")
 
-        embeddings = GoogleGenerativeAIEmbeddings(
-            model=self._embedding_model,
-            task_type="RETRIEVAL_DOCUMENT",
-            google_api_key=self._api_key,
+        pipeline = self._embedding_pipeline(embeddings, "RETRIEVAL_DOCUMENT")
+        with timed("rag.embed", on_stage):
+            for positions, vectors in pipeline.embed([chunk.page_content for chunk in new_chunks]):
+                batch = [new_chunks[position] for position in positions]
+                text_embeddings = [(chunk.page_content, vector) for chunk, vector in zip(batch, vectors)]
+                metadatas = [chunk.metadata for chunk in batch]
+                ids = [new_ids[position] for position in positions]
+                if vectorstore is None:
+                    vectorstore = FAISS.from_embeddings(text_embeddings, embeddings, metadatas=metadatas, ids=ids)
+                else:
+                    vectorstore.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+        count_items("chunks_embedded", len(new_chunks))
+
+        version = self._index_store.stage(current.generation + 1 if current else 1)
+        manifest.index_params = index_params
+        manifest.format_version = INDEX_FORMAT_VERSION
+        manifest.lexical = self._lexical_search.enabled
+        with timed("rag.write_index", on_stage):
+            write_index_version(version.path, vectorstore, self._vector_index, lexical=manifest.lexical)
+            manifest.save(version.path)
+        self._index_store.publish(version)
+        self._last_reload_check = float("-inf")
+        self._logger.info(
+            "Embedded %d chunks from %d new/changed CVs; removed %d stale chunks.",
+            len(new_chunks),
+            len(pending),
+            len(stale_ids),
         )
-        vectorstore = FAISS.from_documents(chunks, embeddings)
-        vectorstore.save_local(str(self._index_dir))
-        self._rag_chain = None
-        return len(documents)
+        return manifest.document_count()
 
     def answer(self, question: str) -> str:
         """Return an answer using the RAG chain."""
@@ -123,16 +696,169 @@ class RAGService:
         if not question:
             raise ValueError("Question must not be empty.")
 
-        chain = self._get_chain()
-        return chain.invoke(question).strip()
+        loaded = self._get_loaded()
+        if self._answer_cache is not None:
+            cached = self._answer_cache.get(loaded.generation, question)
+            if cached is not None:
+                return cached
+        docs = self._context_documents(loaded.retriever.invoke(question))
+        with timed("rag.llm"):
+            response = loaded.chain.invoke(self._chain_input(question, docs)).strip()
+        if self._answer_cache is not None:
+            self._answer_cache.set(loaded.generation, question, response)
+        return response
+
+    def retrieve(self, question: str) -> List[Document]:
+        """Context documents the chain would see for ``question`` (no LLM call)."""
+        return self._context_documents(self._get_loaded().retriever.invoke(question))
+
+    async def aanswer(self, question: str) -> str:
+        """Async :meth:`answer`: retrieval is offloaded and the LLM is awaited via its async client."""
+        question = question.strip()
+        if not question:
+            raise ValueError("Question must not be empty.")
 
-    def _get_chain(self):
-        if self._rag_chain is None:
-            self._rag_chain = self._build_chain()
-        return self._rag_chain
+        loaded = await self._aget_loaded()
+        if self._answer_cache is not None:
+            cached = await self._answer_cache.aget(loaded.generation, question)
+            if cached is not None:
+                return cached
+        docs = self._context_documents(await loaded.retriever.ainvoke(question))
+        with timed("rag.llm"):
+            response = (await loaded.chain.ainvoke(self._chain_input(question, docs))).strip()
+        if self._answer_cache is not None:
+            await self._answer_cache.aset(loaded.generation, question, response)
+        return response
+
+    async def astream_answer(self, question: str) -> AsyncIterator[Tuple[str, object]]:
+        """Yield ``("token", text)`` events as the LLM produces them, then ``("sources", filenames)``."""
+        question = question.strip()
+        if not question:
+            raise ValueError("Question must not be empty.")
 
-    def _build_chain(self):
-        retriever = self._load_retriever()
+        loaded = await self._aget_loaded()
+        docs = self._context_documents(await loaded.retriever.ainvoke(question))
+        cached = await self._answer_cache.aget(loaded.generation, question) if self._answer_cache is not None else None
+        if cached is not None:
+            yield "token", cached
+        else:
+            parts: List[str] = []
+            # Includes time the client takes to consume tokens; streams are not buffered.
+            with timed("rag.llm_stream"):
+                async for token in loaded.chain.astream(self._chain_input(question, docs)):
+                    parts.append(token)
+                    yield "token", token
+            if self._answer_cache is not None:
+                await self._answer_cache.aset(loaded.generation, question, "".join(parts).strip())
+        yield "sources", self._source_files(docs)
+
+    async def ascreen(
+        self,
+        job_description: str,
+        aggregate: str = "max",
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[int, List[Tuple[str, float]]]:
+        """Rank every indexed CV against a job description, without any LLM call.
+
+        The description is embedded once and compared with all chunk vectors; chunk
+        scores are aggregated per file. Returns the candidate count and one page of
+        ``(filename, score)`` pairs, best first.
+        """
+        job_description = job_description.strip()
+        if not job_description:
+            raise ValueError("Job description must not be empty.")
+
+        loaded = await self._aget_loaded()
+        with timed("rag.query_embedding"):
+            vector = await loaded.retriever.embeddings.aembed_query(job_description)
+        with timed("rag.screen"):
+            files, scores = await asyncio.to_thread(loaded.index.score_files, vector, aggregate)
+        top = min(offset + limit, len(scores))
+        if top <= 0:
+            return len(files), []
+        # Only the requested prefix of the ranking needs a full sort.
+        candidates = np.argpartition(-scores, top - 1)[:top] if top < len(scores) else np.arange(len(scores))
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")][offset:]
+        return len(files), [(files[row], float(scores[row])) for row in ranked]
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters for the query embedding and answer caches."""
+        stats = {"query_embeddings": self._query_embeddings.stats()}
+        if self._answer_cache is not None:
+            stats["answers"] = self._answer_cache.stats()
+        return stats
+
+    async def _aget_loaded(self) -> LoadedIndex:
+        loaded = self._loaded
+        if loaded is not None and not self._reload_due():
+            return loaded
+        return await asyncio.to_thread(self._get_loaded)
+
+    def _reload_due(self) -> bool:
+        return time.monotonic() - self._last_reload_check >= self._reload_interval_seconds
+
+    def _get_loaded(self) -> LoadedIndex:
+        loaded = self._loaded
+        if loaded is not None and not self._reload_due():
+            return loaded
+        # A cold service must wait for the first load; a warm one keeps answering from
+        # the version it has while a single thread swaps in a newly published one.
+        if not self._chain_lock.acquire(blocking=loaded is None):
+            return loaded
+        try:
+            self._last_reload_check = time.monotonic()
+            version = self._index_store.current()
+            loaded = self._loaded
+            if version is None:
+                if loaded is None:
+                    raise RAGIndexNotFoundError("RAG index is not built yet.")
+                return loaded
+            if loaded is not None and version.generation == loaded.generation:
+                return loaded
+            try:
+                new_loaded = self._load_version(version)
+            except Exception:
+                if loaded is None:
+                    raise
+                self._logger.exception(
+                    "Failed to load RAG index generation %d; keeping the previous one.",
+                    version.generation,
+                )
+                return loaded
+            self._loaded = new_loaded
+            if self._answer_cache is not None:
+                self._answer_cache.clear()
+            self._logger.info("Loaded RAG index generation %d.", version.generation)
+            return new_loaded
+        finally:
+            self._chain_lock.release()
+
+    def _load_version(self, version: IndexVersion) -> LoadedIndex:
+        self._ensure_api_key()
+        lexical_search = self._lexical_search
+        manifest = IndexManifest.load(version.path)
+        if lexical_search.enabled and (manifest is None or not manifest.lexical):
+            self._logger.warning(
+                "RAG index generation %d has no BM25 postings; serving dense results until the next ingest.",
+                version.generation,
+            )
+            lexical_search = replace(lexical_search, enabled=False)
+        index = MappedVectorIndex(version.path, self._vector_index, lexical_search)
+        retriever = MappedIndexRetriever(
+            index=index,
+            embeddings=CachedQueryEmbeddings(self._embeddings("RETRIEVAL_QUERY"), self._query_embeddings),
+            k=self._context_candidates if self._context_packer is not None else self._retriever_k,
+        )
+        return LoadedIndex(
+            generation=version.generation,
+            index=index,
+            retriever=retriever,
+            chain=self._build_chain(),
+        )
+
+    def _build_chain(self) -> Runnable:
+        """Prompt → LLM → text chain taking ``{"question", "context"}``."""
         prompt = ChatPromptTemplate.from_template(
             """
 You are an AI assistant helping with CV screening and candidate analysis.
@@ -148,38 +874,95 @@ User question:
 {question}
 """.strip()
         )
-        llm = ChatGoogleGenerativeAI(
+        llm = self._chat_llm or ChatGoogleGenerativeAI(
             model=self._chat_model,
             temperature=0.1,
             google_api_key=self._api_key,
         )
-        chain = (
-            {
-                "question": RunnablePassthrough(),
-                "context": retriever | self._format_docs,
-            }
-            | prompt
-            | llm
-            | StrOutputParser()
-        )
-        return chain
+        return prompt | llm | StrOutputParser()
 
-    def _load_retriever(self):
-        self._ensure_api_key()
-        if not self._index_dir.exists():
-            raise RAGIndexNotFoundError("RAG index is not built yet.")
+    def _context_documents(self, docs: List[Document]) -> List[Document]:
+        """Merge, group and budget retrieved chunks when a context packer is configured."""
+        return self._context_packer.pack(docs) if self._context_packer is not None else docs
+
+    def _chain_input(self, question: str, docs: List[Document]) -> Dict[str, str]:
+        return {"question": question, "context": self._format_docs(docs)}
 
-        embeddings = GoogleGenerativeAIEmbeddings(
+    def _source_files(self, docs: List[Document]) -> List[str]:
+        return list(dict.fromkeys(doc.metadata.get("filename", "unknown") for doc in docs))
+
+    def _load_for_update(
+        self,
+        current: Optional[IndexVersion],
+        embeddings,
+    ) -> Tuple[IndexManifest, Optional[FAISS]]:
+        """Load the published index for incremental updates, or start a fresh one."""
+        fingerprint = self._index_fingerprint()
+        manifest = IndexManifest.load(current.path) if current else None
+        if manifest is not None and manifest.fingerprint == fingerprint:
+            try:
+                return manifest, MappedVectorIndex(current.path).to_vectorstore(embeddings)
+            except Exception:
+                self._logger.warning("Existing RAG index is unreadable; rebuilding.", exc_info=True)
+        elif manifest is not None:
+            self._logger.info("Embedding or chunking settings changed; rebuilding RAG index.")
+        return IndexManifest(fingerprint=fingerprint), None
+
+    def _index_fingerprint(self) -> Dict[str, object]:
+        """Settings that invalidate every stored vector when they change."""
+        return {
+            "embedding_model": self._embedding_model,
+            "chunk_size": self._chunk_size,
+            "chunk_overlap": self._chunk_overlap,
+            "chunking": self._chunking,
+        }
+
+    def _embeddings(self, task_type: str) -> Embeddings:
+        if self._embeddings_factory is not None:
+            return self._embeddings_factory(task_type)
+        return GoogleGenerativeAIEmbeddings(
             model=self._embedding_model,
-            task_type="RETRIEVAL_QUERY",
+            task_type=task_type,
             google_api_key=self._api_key,
         )
-        vectorstore = FAISS.load_local(
-            str(self._index_dir),
-            embeddings,
-            allow_dangerous_deserialization=True,
+
+    def _embedding_pipeline(self, embeddings: Embeddings, task_type: str) -> EmbeddingPipeline:
+        return EmbeddingPipeline(
+            embeddings=embeddings,
+            model=self._embedding_model,
+            task_type=task_type,
+            cache=self._embedding_cache,
+            batch_size=self._embedding_batch_size,
+            max_concurrency=self._embedding_concurrency,
+            requests_per_minute=self._embedding_requests_per_minute,
+            max_retries=self._embedding_max_retries,
+        )
+
+    def _chunk_documents(
+        self,
+        profiles: Dict[str, CandidateProfile],
+        cv_texts: Dict[str, str],
+    ) -> List[Document]:
+        if self._chunking == "recursive":
+            documents = self._build_profile_documents(profiles) + self._build_documents(cv_texts)
+            return self._split_documents(documents)
+
+        splitter = CVSectionSplitter(chunk_size=self._chunk_size, chunk_overlap=self._chunk_overlap)
+        chunks: List[Document] = []
+        for filename, profile in profiles.items():
+            chunks.extend(splitter.split_profile(filename, profile))
+        for filename, text in cv_texts.items():
+            if text.strip():
+                chunks.extend(splitter.split_text(filename, text))
+        return chunks
+
+    def _split_documents(self, documents: List[Document]) -> List[Document]:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self._chunk_size,
+            chunk_overlap=self._chunk_overlap,
+            separators=["\n\n", "\n", ".", " "],
         )
-        return vectorstore.as_retriever(search_kwargs={"k": self._retriever_k})
+        return splitter.split_documents(documents)
 
     def _build_documents(self, cv_texts: Dict[str, str]) -> List[Document]:
         documents: List[Document] = []
@@ -192,23 +975,26 @@ User question:
             )
         return documents
 
+    def _build_profile_documents(self, profiles: Dict[str, CandidateProfile]) -> List[Document]:
+        return [
+            Document(
+                page_content=profile_to_text(profile),
+                metadata={"filename": filename, "candidate": profile.name, "title": profile.title},
+            )
+            for filename, profile in profiles.items()
+        ]
+
     def _format_docs(self, docs: List[Document]) -> str:
         if not docs:
             return "No CV context retrieved."
+        if self._context_packer is not None:
+            return self._context_packer.format(docs)
         formatted = []
         for doc in docs:
             filename = doc.metadata.get("filename", "unknown")
             formatted.append(f"File: {filename}\n{doc.page_content}")
         return "\n\n".join(formatted)
 
-    def _clear_index_dir(self) -> None:
-        self._index_dir.mkdir(parents=True, exist_ok=True)
-        for child in self._index_dir.iterdir():
-            if child.is_file() or child.is_symlink():
-                child.unlink()
-            elif child.is_dir():
-                shutil.rmtree(child)
-
     def _ensure_api_key(self) -> None:
-        if not self._api_key:
+        if not self._api_key and (self._embeddings_factory is None or self._chat_llm is None):
             raise RAGConfigurationError("Google API key is required for RAG features.")
@@ -0,0 +1,103 @@
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, Optional
+
+TERMINAL_EVENTS = ("succeeded", "failed")
+
+
+class TaskEventPublisher:
+    """Publishes task lifecycle and progress events to Redis pub/sub.
+
+    Every event is also stored as the task's latest snapshot (with a TTL), so clients
+    that connect late, and ``GET /tasks/{id}``, can read the current state from Redis
+    instead of the result backend. Redis outages are logged and never fail a task.
+    """
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "cv_screener:task_events") -> None:
+        self._client = client
+        self._ttl_seconds = max(1, int(ttl_seconds))
+        self._prefix = prefix
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def publish(self, task_id: str, event_type: str, **data: object) -> None:
+        event = {"task_id": task_id, "type": event_type, "timestamp": time.time(), **data}
+        payload = json.dumps(event, default=str)
+        try:
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.set(snapshot_key(self._prefix, task_id), payload, ex=self._ttl_seconds)
+            pipeline.publish(channel_name(self._prefix, task_id), payload)
+            pipeline.execute()
+        except Exception:
+            self._logger.warning("Failed to publish %s event for task %s.", event_type, task_id, exc_info=True)
+
+    def reporter(self, task_id: str) -> "TaskProgressReporter":
+        return TaskProgressReporter(self, task_id)
+
+
+class TaskProgressReporter:
+    """Task-scoped helpers for the events a running task emits."""
+
+    def __init__(self, publisher: Optional[TaskEventPublisher], task_id: str) -> None:
+        self._publisher = publisher
+        self._task_id = task_id
+
+    def stage(self, stage: str, status: str) -> None:
+        if self._publisher is not None:
+            self._publisher.publish(self._task_id, "stage", stage=stage, status=status)
+
+    def progress(self, completed: int, total: int, **data: object) -> None:
+        if self._publisher is not None:
+            percent = round(100.0 * completed / total, 1) if total else 100.0
+            self._publisher.publish(
+                self._task_id, "progress", completed=completed, total=total, percent=percent, **data
+            )
+
+
+class TaskEventStream:
+    """Async reader side: the latest snapshot and live events for one task."""
+
+    def __init__(self, client, prefix: str = "cv_screener:task_events") -> None:
+        self._client = client
+        self._prefix = prefix
+
+    async def latest(self, task_id: str) -> Optional[Dict[str, object]]:
+        payload = await self._client.get(snapshot_key(self._prefix, task_id))
+        return json.loads(payload) if payload else None
+
+    async def follow(self, task_id: str, keepalive_seconds: float) -> AsyncIterator[Optional[Dict[str, object]]]:
+        """Current snapshot, then live events until a terminal one.
+
+        Yields ``None`` when there is nothing new (no snapshot yet, or ``keepalive_seconds``
+        without events) so callers can send keep-alives or check the result backend.
+        Subscribes before reading the snapshot, so no event is missed.
+        """
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(channel_name(self._prefix, task_id))
+        try:
+            snapshot = await self.latest(task_id)
+            yield snapshot
+            if snapshot is not None and snapshot["type"] in TERMINAL_EVENTS:
+                return
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive_seconds)
+                if message is None:
+                    yield None
+                    continue
+                event = json.loads(message["data"])
+                if snapshot is not None and event["timestamp"] <= snapshot["timestamp"]:
+                    continue
+                yield event
+                if event["type"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+
+def snapshot_key(prefix: str, task_id: str) -> str:
+    return f"{prefix}:latest:{task_id}"
+
+
+def channel_name(prefix: str, task_id: str) -> str:
+    return f"{prefix}:{task_id}"
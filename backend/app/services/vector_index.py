@@ -0,0 +1,91 @@
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict
+
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "hnsw_sq8", "ivf_sq8", "ivf_pq")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class VectorIndexConfig:
+    """FAISS index layout used for serving, plus its build and search knobs."""
+
+    index_type: str = "flat"
+    min_vectors: int = 10_000
+    nlist: int = 1024
+    nprobe: int = 16
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 80
+    hnsw_ef_search: int = 64
+    pq_m: int = 64
+    pq_nbits: int = 8
+
+    def __post_init__(self) -> None:
+        if self.index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type {self.index_type!r}; expected one of {INDEX_TYPES}.")
+
+    def uses_ann(self, count: int) -> bool:
+        """Whether a corpus of ``count`` vectors gets an approximate index."""
+        return self.index_type != "flat" and count >= self.min_vectors
+
+    def build_params(self) -> Dict[str, object]:
+        """Parameters baked into a built index (search-time knobs excluded)."""
+        params = asdict(self)
+        params.pop("nprobe")
+        params.pop("hnsw_ef_search")
+        return params
+
+
+def build_index(vectors: np.ndarray, config: VectorIndexConfig) -> faiss.Index:
+    """Build the serving index for ``vectors``; row ``i`` keeps FAISS id ``i``.
+
+    Corpora smaller than ``config.min_vectors`` stay on an exact flat index, where
+    linear search is already fast and quantizers would be badly under-trained.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    count, dimension = vectors.shape
+    if not config.uses_ann(count):
+        index = faiss.IndexFlatL2(dimension)
+        index.add(vectors)
+        return index
+
+    index = faiss.index_factory(dimension, _factory_string(config, count, dimension))
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = config.hnsw_ef_construction
+    if not index.is_trained:
+        logger.info("Training %s index on %d vectors.", config.index_type, count)
+        index.train(vectors)
+    index.add(vectors)
+    configure_search(index, config)
+    return index
+
+
+def configure_search(index: faiss.Index, config: VectorIndexConfig) -> None:
+    """Apply search-time knobs (nprobe / efSearch) to a loaded index."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(config.nprobe, ivf.nlist)
+        return
+    downcast = faiss.downcast_index(index)
+    if isinstance(downcast, faiss.IndexHNSW):
+        downcast.hnsw.efSearch = config.hnsw_ef_search
+
+
+def _factory_string(config: VectorIndexConfig, count: int, dimension: int) -> str:
+    if config.index_type == "hnsw":
+        return f"HNSW{config.hnsw_m}"
+    if config.index_type == "hnsw_sq8":
+        # HNSWFlat keeps every float32 vector in RAM; SQ8 storage is 4x smaller.
+        return f"HNSW{config.hnsw_m},SQ8"
+    # Keep ~39+ training points per centroid, as recommended by FAISS.
+    nlist = max(1, min(config.nlist, count // 39))
+    if config.index_type == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if config.index_type == "ivf_sq8":
+        return f"IVF{nlist},SQ8"
+    pq_m = max(m for m in range(1, min(config.pq_m, dimension) + 1) if dimension % m == 0)
+    return f"IVF{nlist},PQ{pq_m}x{config.pq_nbits}"
@@ -1,31 +1,124 @@
+from celery.signals import task_failure, task_prerun, task_success
+
 from app.core.celery_app import celery_app
 from app.core.config import AppSettings
+from app.core.metrics import instrumented
+from app.services.corpus_synthesizer import write_corpus
+from app.services.providers.cv_image import MockImageGenerator
+from app.services.task_events import TaskProgressReporter
 from app.wiring.container import (
+    build_corpus_synthesizer,
     build_cv_generator,
+    build_ingest_coalescer,
     build_mock_cv_generator,
+    build_pdf_renderer,
     build_rag_service,
+    build_task_event_publisher,
 )
 
 settings = AppSettings()
 settings.ensure_directories()
+events = build_task_event_publisher(settings)
+ingest_coalescer = build_ingest_coalescer(settings)
+
+
+@task_prerun.connect
+def _publish_task_started(task_id=None, task=None, **_kwargs):
+    if events is not None:
+        events.publish(task_id, "started", task=task.name)
+
+
+@task_success.connect
+def _publish_task_succeeded(sender=None, result=None, **_kwargs):
+    # Sent after the result backend stored the result, so polling agrees with the event.
+    if events is not None:
+        events.publish(sender.request.id, "succeeded", result=result)
 
 
-@celery_app.task(name="cv.generate")
-def generate_cv_task():
+@task_failure.connect
+def _publish_task_failed(task_id=None, exception=None, **_kwargs):
+    if events is not None:
+        events.publish(task_id, "failed", error=str(exception) or exception.__class__.__name__)
+
+
+@celery_app.task(name="cv.generate", bind=True)
+@instrumented("task.cv.generate")
+def generate_cv_task(self):
     service = build_cv_generator(settings)
-    pdf_path = service.generate()
+    pdf_path = service.generate(on_stage=TaskProgressReporter(events, self.request.id).stage)
     return {"message": "Generated CV", "file": pdf_path.name}
 
 
-@celery_app.task(name="cv.generate_mock")
-def generate_mock_cv_task():
+@celery_app.task(name="cv.generate_mock", bind=True)
+@instrumented("task.cv.generate_mock")
+def generate_mock_cv_task(self):
     service = build_mock_cv_generator(settings)
-    pdf_path = service.generate()
+    pdf_path = service.generate(on_stage=TaskProgressReporter(events, self.request.id).stage)
     return {"message": "Generated mock CV", "file": pdf_path.name}
 
 
-@celery_app.task(name="rag.ingest")
-def ingest_rag_task():
+@celery_app.task(name="cv.generate_batch", bind=True)
+@instrumented("task.cv.generate_batch")
+def generate_cv_batch_task(self, count: int, mock: bool = False):
+    service = build_mock_cv_generator(settings) if mock else build_cv_generator(settings)
+    reporter = TaskProgressReporter(events, self.request.id)
+
+    def report(item, completed, total):
+        reporter.progress(completed, total, last=item.model_dump())
+        self.update_state(
+            state="PROGRESS",
+            meta={"completed": completed, "total": total, "last": item.model_dump()},
+        )
+
+    results = service.generate_batch(count, on_item=report)
+    return {
+        "message": f"Generated {sum(1 for item in results if item.file)} of {count} CVs",
+        "files": [item.file for item in results if item.file],
+        "failed": sum(1 for item in results if item.error),
+        "errors": [item.model_dump() for item in results if item.error],
+    }
+
+
+@celery_app.task(name="cv.synthesize_corpus", bind=True)
+@instrumented("task.cv.synthesize_corpus")
+def synthesize_corpus_task(self, count: int, seed: int = 0, render: bool = False):
+    synthesizer = build_corpus_synthesizer(settings, seed)
+    reporter = TaskProgressReporter(events, self.request.id)
+
+    def report(completed, total):
+        reporter.progress(completed, total)
+        self.update_state(state="PROGRESS", meta={"completed": completed, "total": total})
+
+    paths = write_corpus(
+        synthesizer,
+        count,
+        settings.cv_synthetic_dir,
+        renderer=build_pdf_renderer(settings) if render else None,
+        photo_path=MockImageGenerator(photos_dir=settings.photos_dir).seed_file if render else None,
+        on_progress=report,
+    )
+    return {
+        "message": f"Synthesized {len(paths)} CVs",
+        "seed": seed,
+        "rendered": render,
+        "directory": str(settings.cv_synthetic_dir),
+    }
+
+
+@celery_app.task(name="rag.ingest", bind=True, max_retries=None)
+def ingest_rag_task(self):
+    if ingest_coalescer is not None and not ingest_coalescer.start(self.request.id):
+        # Another ingest is still running; stay the pending one so new requests keep attaching.
+        raise self.retry(countdown=settings.rag_ingest_retry_seconds)
+    try:
+        return _ingest_rag(self.request.id)
+    finally:
+        if ingest_coalescer is not None:
+            ingest_coalescer.finish(self.request.id)
+
+
+@instrumented("task.rag.ingest")
+def _ingest_rag(task_id: str):
     service = build_rag_service(settings)
-    documents = service.ingest()
+    documents = service.ingest(on_stage=TaskProgressReporter(events, task_id).stage)
     return {"message": "RAG index rebuilt.", "documents": documents}
@@ -1,8 +1,26 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import redis
+import redis.asyncio
+
 from app.core.config import AppSettings
+from app.services.candidate_index import CandidateDirectory
+from app.services.context_packer import ContextPacker
+from app.services.corpus_synthesizer import CorpusSynthesizer, CorpusVocabulary
 from app.services.cv_generator import CVGeneratorService
-from app.services.providers.cv_image import GeminiImageGenerator, MockImageGenerator
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.providers.cv_image import GeminiImageGenerator, HeadshotPool, MockImageGenerator
 from app.services.providers.cv_text import GeminiCVTextGenerator, MockCVTextGenerator
-from app.services.rag import CVTextExtractor, RAGService
+from app.services.providers.mock_models import MockChatModel, MockEmbeddings
+from app.services.index_store import IndexVersionStore
+from app.services.ingest_coalescer import IngestCoalescer
+from app.services.lexical_index import LexicalSearchConfig
+from app.services.query_cache import AnswerCache, InMemoryAnswerCache, RedisAnswerCache
+from app.services.rag import CVTextExtractor, EmbeddingCache, ExtractionCache, RAGService
+from app.services.task_events import TaskEventPublisher, TaskEventStream
+from app.services.vector_index import VectorIndexConfig
 
 
 def build_cv_generator(settings: AppSettings) -> CVGeneratorService:
@@ -10,19 +28,35 @@ def build_cv_generator(settings: AppSettings) -> CVGeneratorService:
     if settings.use_mock_generators or not settings.google_genai_api_key:
         return build_mock_cv_generator(settings)
 
+    pool = (
+        HeadshotPool(
+            root=settings.photos_dir / "pool",
+            variants_per_key=settings.cv_photo_pool_variants_per_key,
+            max_images=settings.cv_photo_pool_max_images,
+            max_age_seconds=settings.cv_photo_pool_max_age_seconds,
+        )
+        if settings.cv_photo_pool_enabled
+        else None
+    )
     return CVGeneratorService(
         storage_dir=settings.static_dir,
         text_generator=GeminiCVTextGenerator(
             api_key=settings.google_genai_api_key,
             model_name=settings.google_genai_model_name,
+            profiles_per_request=settings.cv_text_profiles_per_request,
+            max_attempts=settings.cv_text_max_attempts,
         ),
         image_generator=GeminiImageGenerator(
             api_key=settings.google_genai_api_key,
             model_name=settings.google_genai_image_model_name,
             photos_dir=settings.photos_dir,
+            pool=pool,
+            images_per_request=settings.cv_photo_images_per_request,
         ),
         photo_dir=settings.photos_dir,
         photo_keep_names={settings.placeholder_photo},
+        photo_keep_dirs=[pool.root] if pool else None,
+        **_batch_pipeline_options(settings),
     )
 
 
@@ -34,18 +68,181 @@ def build_mock_cv_generator(settings: AppSettings) -> CVGeneratorService:
         image_generator=MockImageGenerator(photos_dir=settings.photos_dir),
         photo_dir=settings.photos_dir,
         photo_keep_names={settings.placeholder_photo},
+        **_batch_pipeline_options(settings),
+    )
+
+
+def _batch_pipeline_options(settings: AppSettings) -> dict:
+    return {
+        "text_concurrency": settings.cv_batch_text_concurrency,
+        "image_concurrency": settings.cv_batch_image_concurrency,
+        # Render threads only hand layouts to the process pool; keep every worker busy.
+        "render_concurrency": max(settings.cv_batch_render_concurrency, settings.cv_render_workers),
+        "pipeline_buffer": settings.cv_batch_pipeline_buffer,
+        "renderer": build_pdf_renderer(settings),
+    }
+
+
+def build_pdf_renderer(settings: AppSettings) -> CVPdfRenderer:
+    return _get_pdf_renderer(
+        settings.static_dir,
+        settings.cv_render_workers,
+        settings.cv_render_photo_size_px,
+        settings.cv_render_photo_quality,
+    )
+
+
+@lru_cache
+def _get_pdf_renderer(output_dir: Path, workers: int, photo_size_px: int, photo_quality: int) -> CVPdfRenderer:
+    # One render pool per process, shared by every generator built with these options.
+    return CVPdfRenderer(
+        output_dir=output_dir,
+        max_workers=workers,
+        photo_size_px=photo_size_px,
+        photo_quality=photo_quality,
+    )
+
+
+def build_corpus_synthesizer(settings: AppSettings, seed: int) -> CorpusSynthesizer:
+    vocabulary = (
+        CorpusVocabulary.from_json(Path(settings.cv_synthetic_vocabulary_path))
+        if settings.cv_synthetic_vocabulary_path
+        else None
+    )
+    return CorpusSynthesizer(vocabulary=vocabulary, seed=seed)
+
+
+def build_candidate_directory(settings: AppSettings) -> CandidateDirectory:
+    settings.ensure_directories()
+    return CandidateDirectory(
+        static_dir=settings.static_dir,
+        refresh_interval_seconds=settings.candidate_index_refresh_seconds,
+        max_listed=settings.candidate_answer_max_listed,
+        exact_answers=settings.candidate_exact_answers,
     )
 
 
 def build_rag_service(settings: AppSettings) -> RAGService:
     settings.ensure_directories()
     return RAGService(
-        text_extractor=CVTextExtractor(static_dir=settings.static_dir),
-        index_dir=settings.rag_index_dir,
-        embedding_model=settings.google_rag_embedding_model,
+        text_extractor=CVTextExtractor(
+            static_dir=settings.static_dir,
+            cache=ExtractionCache(settings.rag_cache_dir / "extraction"),
+            max_workers=settings.rag_extraction_workers,
+            timeout_seconds=settings.rag_extraction_timeout_seconds,
+        ),
+        index_store=IndexVersionStore(
+            root=settings.rag_index_dir,
+            grace_period_seconds=settings.rag_index_gc_grace_seconds,
+        ),
+        embedding_model=(
+            f"mock-hash-{settings.rag_mock_embedding_size}"
+            if settings.use_mock_rag_models
+            else settings.google_rag_embedding_model
+        ),
         chat_model=settings.google_genai_model_name,
         google_api_key=settings.google_genai_api_key,
         chunk_size=settings.rag_chunk_size,
         chunk_overlap=settings.rag_chunk_overlap,
+        chunking=settings.rag_chunking,
         retriever_k=settings.rag_retriever_k,
+        reload_interval_seconds=settings.rag_reload_interval_seconds,
+        embedding_cache=EmbeddingCache(settings.rag_cache_dir / "embeddings.sqlite3"),
+        embedding_batch_size=settings.rag_embedding_batch_size,
+        embedding_concurrency=settings.rag_embedding_concurrency,
+        embedding_requests_per_minute=settings.rag_embedding_requests_per_minute,
+        embedding_max_retries=settings.rag_embedding_max_retries,
+        vector_index=VectorIndexConfig(
+            index_type=settings.rag_index_type,
+            min_vectors=settings.rag_ann_min_vectors,
+            nlist=settings.rag_ivf_nlist,
+            nprobe=settings.rag_ivf_nprobe,
+            hnsw_m=settings.rag_hnsw_m,
+            hnsw_ef_construction=settings.rag_hnsw_ef_construction,
+            hnsw_ef_search=settings.rag_hnsw_ef_search,
+            pq_m=settings.rag_pq_m,
+            pq_nbits=settings.rag_pq_nbits,
+        ),
+        lexical_search=LexicalSearchConfig(
+            enabled=settings.rag_retrieval_mode == "hybrid",
+            candidates=settings.rag_hybrid_candidates,
+            rrf_k=settings.rag_rrf_k,
+            k1=settings.rag_bm25_k1,
+            b=settings.rag_bm25_b,
+        ),
+        context_packer=(
+            ContextPacker(
+                token_budget=settings.rag_context_token_budget,
+                max_chunks=settings.rag_context_max_chunks,
+            )
+            if settings.rag_context_token_budget > 0
+            else None
+        ),
+        context_candidates=settings.rag_context_candidates,
+        query_embedding_cache_size=settings.rag_query_embedding_cache_size,
+        answer_cache=build_answer_cache(settings),
+        **_mock_rag_model_options(settings),
+    )
+
+
+def _mock_rag_model_options(settings: AppSettings) -> dict:
+    if not settings.use_mock_rag_models:
+        return {}
+    embeddings = MockEmbeddings(
+        size=settings.rag_mock_embedding_size,
+        latency_seconds=settings.rag_mock_embedding_latency_seconds,
+    )
+    return {
+        "embeddings_factory": lambda task_type: embeddings,
+        "chat_llm": MockChatModel(
+            latency_seconds=settings.rag_mock_chat_latency_seconds,
+            token_latency_seconds=settings.rag_mock_chat_token_latency_seconds,
+        ),
+    }
+
+
+def _cache_redis(settings: AppSettings, asynchronous: bool = False):
+    client_class = redis.asyncio.Redis if asynchronous else redis.Redis
+    return client_class.from_url(
+        settings.cache_redis_url,
+        socket_timeout=settings.cache_redis_timeout_seconds,
+        socket_connect_timeout=settings.cache_redis_timeout_seconds,
     )
+
+
+def build_answer_cache(settings: AppSettings) -> Optional[AnswerCache]:
+    if settings.rag_answer_cache_backend == "redis":
+        return RedisAnswerCache(
+            client=_cache_redis(settings),
+            ttl_seconds=settings.rag_answer_cache_ttl_seconds,
+        )
+    if settings.rag_answer_cache_backend == "memory":
+        return InMemoryAnswerCache(
+            max_size=settings.rag_answer_cache_size,
+            ttl_seconds=settings.rag_answer_cache_ttl_seconds,
+        )
+    return None
+
+
+def build_task_event_publisher(settings: AppSettings) -> Optional[TaskEventPublisher]:
+    if settings.task_events_backend != "redis":
+        return None
+    return TaskEventPublisher(
+        client=_cache_redis(settings),
+        ttl_seconds=settings.task_events_ttl_seconds,
+    )
+
+
+def build_ingest_coalescer(settings: AppSettings) -> Optional[IngestCoalescer]:
+    if not settings.rag_ingest_coalescing:
+        return None
+    return IngestCoalescer(
+        client=_cache_redis(settings),
+        lock_ttl_seconds=settings.rag_ingest_lock_ttl_seconds,
+    )
+
+
+def build_task_event_stream(settings: AppSettings) -> Optional[TaskEventStream]:
+    if settings.task_events_backend != "redis":
+        return None
+    return TaskEventStream(client=_cache_redis(settings, asynchronous=True))
@@ -1,10 +1,51 @@
+import asyncio
+import json
+import threading
 from pathlib import Path
 
+import billiard.pool
+import faiss
+import numpy as np
 from fpdf import FPDF
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from PIL import Image
+from prometheus_client import REGISTRY
+from PyPDF2 import PdfReader
 
+from app.api.routes.tasks import _status_from_event
+from app.benchmarks.suite import BenchmarkConfig, run_benchmarks
+from app.core.celery_app import task_routes, worker_pool_options
+from app.core.config import AppSettings
+from app.core.metrics import render_metrics, timed
 from app.domain.models import CandidateProfile
+from app.services.candidate_index import CandidateDirectory, CandidateQuery
+from app.services.context_packer import ContextPacker, estimate_tokens
+from app.services.corpus_synthesizer import CorpusSynthesizer, CorpusVocabulary, write_corpus
+from app.services.cv_chunker import CVSectionSplitter
 from app.services.cv_generator import CVGeneratorService
-from app.services.rag import CVTextExtractor
+from app.services.index_store import IndexVersionStore
+from app.services.ingest_coalescer import IngestCoalescer
+from app.services.lexical_index import LexicalSearchConfig
+from app.services.task_events import TaskEventPublisher, snapshot_key
+from app.services.pdf_renderer import CVPdfRenderer
+from app.services.profile_records import profile_record_path, write_profile_record
+from app.services.providers.cv_image import GeminiImageGenerator, HeadshotPool, role_family
+from app.services.providers.cv_text import GeminiCVTextGenerator
+from app.services.providers.mock_models import MockEmbeddings
+from app.services.mapped_index import MappedVectorIndex
+from app.services.vector_index import VectorIndexConfig, build_index
+from app.services import rag as rag_module
+from app.services.query_cache import InMemoryAnswerCache, RedisAnswerCache
+from app.services.rag import (
+    CVTextExtractor,
+    EmbeddingCache,
+    EmbeddingPipeline,
+    ExtractionCache,
+    IndexManifest,
+    LoadedIndex,
+    RAGService,
+)
 
 
 class DummyTextGenerator:
@@ -74,6 +115,199 @@ def test_cv_generator_generate_creates_pdf(tmp_path):
     assert generated.name in service.list_pdf_files()
 
 
+def test_cv_generator_records_stage_metrics(tmp_path):
+    def sample(name, stage):
+        return REGISTRY.get_sample_value(name, {"stage": stage}) or 0.0
+
+    before = {stage: sample("cv_screener_stage_duration_seconds_count", stage) for stage in ("cv.text", "cv.image", "cv.render")}
+    service = build_service(tmp_path / "static", tmp_path / "photos")
+    service.generate()
+
+    for stage, count in before.items():
+        assert sample("cv_screener_stage_duration_seconds_count", stage) == count + 1
+        assert sample("cv_screener_stage_in_flight", stage) == 0
+    exposition = render_metrics().decode()
+    assert 'cv_screener_stage_duration_seconds_bucket{le="0.001",stage="cv.render"}' in exposition
+    assert "cv_screener_items_total" in exposition
+
+
+def test_cv_generator_batch_reports_progress_and_isolates_failures(tmp_path):
+    class FlakyImageGenerator(DummyImageGenerator):
+        def __init__(self, photos_dir: Path) -> None:
+            super().__init__(photos_dir)
+            self.calls = 0
+
+        def generate(self, profile: CandidateProfile) -> Path:
+            self.calls += 1
+            if self.calls == 3:
+                raise RuntimeError("image quota exceeded")
+            return super().generate(profile)
+
+    photos_dir = tmp_path / "photos"
+    service = CVGeneratorService(
+        storage_dir=tmp_path / "static",
+        text_generator=DummyTextGenerator(),
+        image_generator=FlakyImageGenerator(photos_dir),
+        photo_dir=photos_dir,
+        photo_keep_names={"placeholder.png"},
+        text_concurrency=3,
+        image_concurrency=1,
+        render_concurrency=2,
+        pipeline_buffer=1,
+    )
+    progress = []
+
+    results = service.generate_batch(6, on_item=lambda item, done, total: progress.append((done, total)))
+
+    assert [item.index for item in results] == list(range(6))
+    assert sum(1 for item in results if item.error == "image quota exceeded") == 1
+    assert sorted(item.file for item in results if item.file) == service.list_pdf_files()
+    assert progress == [(done, 6) for done in range(1, 7)]
+
+    def failing_callback(item, done, total):
+        raise RuntimeError("progress publish failed")
+
+    results = service.generate_batch(2, on_item=failing_callback)
+    assert [(item.index, item.error) for item in results] == [(0, None), (1, None)]
+
+
+def test_cv_generator_renders_profiles_in_parallel_with_compact_photos(tmp_path):
+    photo = tmp_path / "photos" / "headshot.png"
+    photo.parent.mkdir()
+    Image.frombytes("RGB", (768, 768), np.random.default_rng(0).bytes(768 * 768 * 3)).save(photo)
+    service = CVGeneratorService(
+        storage_dir=tmp_path / "static",
+        text_generator=DummyTextGenerator(),
+        image_generator=DummyImageGenerator(photo.parent),
+        photo_dir=photo.parent,
+        photo_keep_names={"headshot.png"},
+        renderer=CVPdfRenderer(tmp_path / "static", max_workers=2),
+    )
+    profiles = [
+        DummyTextGenerator(name).generate().model_copy(update={"photo_path": photo})
+        for name in ("Ana Lee", "Ben Ode", "Cy Park")
+    ]
+
+    paths = service.render_profiles(profiles)
+    service.renderer.close()
+
+    assert [path.name.split("-")[0] for path in paths] == ["Ana_Lee", "Ben_Ode", "Cy_Park"]
+    assert all(path.stat().st_size < photo.stat().st_size / 10 for path in paths)
+    assert "Ben Ode" in PdfReader(str(paths[1])).pages[0].extract_text()
+    assert photo.exists()
+
+
+def _render_in_pool_worker(output_dir: str):
+    renderer = CVPdfRenderer(Path(output_dir), max_workers=2)
+    profiles = [DummyTextGenerator(name).generate() for name in ("Ana Lee", "Ben Ode")]
+    try:
+        return [path.name for path in renderer.render_many(profiles)]
+    finally:
+        renderer.close()
+
+
+def test_pdf_renderer_renders_inline_inside_celery_pool_workers(tmp_path):
+    # Prefork workers are daemonic and may not start a render pool of their own.
+    pool = billiard.pool.Pool(processes=1)
+    try:
+        names = pool.apply(_render_in_pool_worker, (str(tmp_path),))
+    finally:
+        pool.terminate()
+
+    assert [name.split("-")[0] for name in names] == ["Ana_Lee", "Ben_Ode"]
+    assert all((tmp_path / name).exists() for name in names)
+
+
+def test_gemini_text_generator_rerequests_only_invalid_profiles():
+    responses = [
+        [{"name": "Ana Lee", "title": "Data Engineer"}, {"name": "", "title": "Broken"}, {"name": "Ana Lee", "title": "Dup"}],
+        [{"name": "Ben Ode", "title": "SRE"}, {"name": "Cy Park", "title": "PM"}],
+    ]
+    requested = []
+
+    class FakeModels:
+        def generate_content(self, model, contents, config):
+            requested.append(config.response_schema.max_items)
+            return type("Response", (), {"text": json.dumps(responses.pop(0))})()
+
+    generator = GeminiCVTextGenerator(api_key="key", model_name="gemini", profiles_per_request=3)
+    generator._client = type("Client", (), {"models": FakeModels()})()
+
+    names = {profile.name for profile in generator.generate_many(3)}
+
+    assert names == {"Ana Lee", "Ben Ode", "Cy Park"}
+    assert requested == [3, 2]
+
+
+def test_cv_generator_batch_requests_profiles_in_chunks_of_the_remaining_count(tmp_path):
+    class BatchingTextGenerator(DummyTextGenerator):
+        profiles_per_request = 4
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.requested = []
+
+        def generate(self) -> CandidateProfile:
+            raise AssertionError("batches must use generate_many")
+
+        def generate_many(self, count):
+            self.requested.append(count)
+            return [DummyTextGenerator(f"Candidate {index}").generate() for index in range(count)]
+
+    text_generator = BatchingTextGenerator()
+    service = CVGeneratorService(
+        storage_dir=tmp_path / "static",
+        text_generator=text_generator,
+        image_generator=DummyImageGenerator(tmp_path / "photos"),
+        photo_dir=tmp_path / "photos",
+        text_concurrency=3,
+    )
+
+    results = service.generate_batch(10)
+
+    assert [(item.index, item.error) for item in results] == [(index, None) for index in range(10)]
+    assert sorted(text_generator.requested) == [2, 4, 4]
+
+
+def test_gemini_image_generator_reuses_pooled_headshots(tmp_path):
+    requested = []
+
+    class FakeModels:
+        def generate_images(self, model, prompt, config):
+            requested.append(config.number_of_images)
+            images = [type("Generated", (), {"image": Image.new("RGB", (8, 8))})() for _ in range(config.number_of_images)]
+            return type("Response", (), {"generated_images": images})()
+
+    pool = HeadshotPool(tmp_path / "photos" / "pool", variants_per_key=3, max_images=4)
+    generator = GeminiImageGenerator(
+        api_key="key", model_name="imagen", photos_dir=tmp_path / "photos", pool=pool, images_per_request=2
+    )
+    generator.client = type("Client", (), {"models": FakeModels()})()
+    service = CVGeneratorService(
+        storage_dir=tmp_path / "static",
+        text_generator=DummyTextGenerator(),
+        image_generator=generator,
+        photo_dir=tmp_path / "photos",
+        photo_keep_dirs=[pool.root],
+    )
+
+    for _ in range(5):
+        service.generate()
+    engineer = DummyTextGenerator().generate().model_copy(update={"title": "Senior Backend Engineer", "gender": "male"})
+    generator.generate(engineer)
+
+    assert role_family("AI Researcher") == "data"
+    assert role_family(engineer.title) == "engineering"
+    assert requested == [2, 1, 2]
+    assert len(list(pool.root.glob("*/*.png"))) == 4
+
+    # A drawn photo is pinned outside the pool and survives eviction of its source.
+    pinned = pool.draw(("male professional", "engineering"), tmp_path / "photos")
+    for path in pool.root.glob("*/*.png"):
+        path.unlink()
+    assert pinned.parent == tmp_path / "photos" and Image.open(pinned).size == (8, 8)
+
+
 def test_cv_text_extractor_reads_text(tmp_path):
     static_dir = tmp_path / "static"
     static_dir.mkdir()
@@ -89,3 +323,702 @@ def test_cv_text_extractor_reads_text(tmp_path):
     texts = extractor.extract_texts()
     assert "cv.pdf" in texts
     assert "Hello" in texts["cv.pdf"]
+
+
+class CountingEmbedding(DeterministicFakeEmbedding):
+    embedded_texts: list = []
+
+    def embed_documents(self, texts):
+        self.embedded_texts.extend(texts)
+        return super().embed_documents(texts)
+
+
+def write_pdf(path: Path, text: str) -> None:
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=12)
+    pdf.cell(0, 10, text)
+    pdf.output(path)
+
+
+def test_cv_text_extractor_caches_and_parallelizes(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    for name in ("a", "b", "c"):
+        write_pdf(static_dir / f"{name}.pdf", f"Candidate {name}")
+
+    extractor = CVTextExtractor(
+        static_dir=static_dir,
+        cache=ExtractionCache(tmp_path / "cache"),
+        max_workers=2,
+    )
+    texts = extractor.extract_texts()
+    assert texts == {"a.pdf": "Candidate a", "b.pdf": "Candidate b", "c.pdf": "Candidate c"}
+
+    parsed = []
+    monkeypatch.setattr(rag_module, "_read_pdf_text", lambda path, timeout: parsed.append(path) or "")
+    reloaded = CVTextExtractor(static_dir=static_dir, cache=ExtractionCache(tmp_path / "cache"))
+    assert reloaded.extract_texts() == texts
+    assert parsed == []
+
+
+def _extract_in_pool_worker(static_dir: str):
+    return CVTextExtractor(static_dir=Path(static_dir), max_workers=2).extract_texts()
+
+
+def test_cv_text_extractor_parses_serially_when_no_pool_can_start(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        write_pdf(tmp_path / f"{name}.pdf", f"Candidate {name}")
+    expected = {"a.pdf": "Candidate a", "b.pdf": "Candidate b"}
+
+    pool = billiard.pool.Pool(processes=1)
+    try:
+        assert pool.apply(_extract_in_pool_worker, (str(tmp_path),)) == expected
+    finally:
+        pool.terminate()
+
+    def refuse_to_start(self, *args, **kwargs):
+        raise OSError("cannot fork")
+
+    monkeypatch.setattr(rag_module.ProcessPoolExecutor, "submit", refuse_to_start)
+    assert CVTextExtractor(static_dir=tmp_path, max_workers=2).extract_texts() == expected
+
+
+def build_rag_service(tmp_path: Path) -> RAGService:
+    return RAGService(
+        text_extractor=CVTextExtractor(static_dir=tmp_path / "static"),
+        index_store=IndexVersionStore(tmp_path / "index"),
+        embedding_model="models/text-embedding-004",
+        chat_model="gemini-2.0-flash",
+        google_api_key="test-key",
+        chunk_size=1000,
+        chunk_overlap=200,
+        retriever_k=4,
+    )
+
+
+def test_rag_service_builds_chain_once(tmp_path, monkeypatch):
+    service = build_rag_service(tmp_path)
+    built = []
+    service._index_store.publish(service._index_store.stage(1))
+    monkeypatch.setattr(
+        service,
+        "_load_version",
+        lambda version: built.append(version) or LoadedIndex(version.generation, None, None, None),
+    )
+
+    assert not service.is_warm
+    service.warm_up()
+    service.warm_up()
+    assert service.is_warm
+    assert len(built) == 1
+
+
+def test_rag_ingest_only_embeds_new_and_changed_cvs(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    write_pdf(static_dir / "a.pdf", "Alice knows Python")
+    write_pdf(static_dir / "b.pdf", "Bob knows Kubernetes")
+
+    service = build_rag_service(tmp_path)
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+
+    assert service.ingest() == 2
+    assert len(embedding.embedded_texts) == 2
+
+    embedding.embedded_texts.clear()
+    write_pdf(static_dir / "c.pdf", "Carol knows Rust")
+    (static_dir / "a.pdf").unlink()
+    assert service.ingest() == 2
+    assert embedding.embedded_texts == ["Carol knows Rust"]
+
+    embedding.embedded_texts.clear()
+    assert service.ingest() == 2
+    assert embedding.embedded_texts == []
+
+
+def test_rag_ingest_retries_cvs_that_failed_to_extract(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    write_pdf(static_dir / "a.pdf", "Alice knows Python")
+    (static_dir / "b.pdf").write_bytes(b"not a pdf")
+
+    service = build_rag_service(tmp_path)
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+
+    assert service.ingest() == 1
+    assert "b.pdf" not in IndexManifest.load(service._index_store.current().path).files
+    generation = service._index_store.current().generation
+    assert service.ingest() == 1
+    assert service._index_store.current().generation == generation
+
+    write_pdf(static_dir / "b.pdf", "Bob knows Kubernetes")
+    assert service.ingest() == 2
+
+
+def test_rag_ingest_reads_profile_sidecars_instead_of_parsing_pdfs(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    generated = build_service(static_dir, tmp_path / "photos").generate()
+    write_pdf(static_dir / "uploaded.pdf", "Uploaded CV knows Go")
+    assert profile_record_path(generated).exists()
+
+    parsed = []
+    read_pdf_text = rag_module._read_pdf_text
+    monkeypatch.setattr(
+        rag_module, "_read_pdf_text", lambda path, timeout: parsed.append(Path(path).name) or read_pdf_text(path, timeout)
+    )
+    service = build_rag_service(tmp_path)
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+
+    assert service.ingest() == 2
+    assert parsed == ["uploaded.pdf"]
+    assert (
+        "Candidate: Jordan Doe (AI Engineer)\nSection: Experience\nEngineer - NovaTech (2020 - Present)\nShips things."
+        in embedding.embedded_texts
+    )
+
+
+def test_section_splitter_chunks_rendered_cv_text_per_section_and_job(tmp_path):
+    profile = DummyTextGenerator().generate()
+    profile.experience.append(
+        {"company": "Orbit", "role": "Intern", "duration": "2018 - 2019", "achievements": "Learned things."}
+    )
+    pdf_path = CVPdfRenderer(tmp_path).render(profile)
+    text = CVTextExtractor(static_dir=tmp_path).extract_texts()[pdf_path.name]
+
+    chunks = CVSectionSplitter(chunk_size=1000, chunk_overlap=200).split_text(pdf_path.name, text)
+
+    assert [chunk.metadata["section"] for chunk in chunks] == [
+        "Summary", "Experience", "Experience", "Skills", "Education", "Languages"
+    ]
+    assert all(chunk.metadata["candidate"] == "Jordan Doe" for chunk in chunks)
+    assert chunks[2].page_content.endswith("Intern - Orbit\n2018 - 2019\nLearned things.")
+    assert "jordan@example.com" in chunks[0].page_content
+
+
+def test_candidate_directory_filters_and_answers_count_questions(tmp_path):
+    static_dir = tmp_path / "static"
+    renderer = CVPdfRenderer(static_dir)
+    people = [
+        ("Ana Lee", ["Python", "Kubernetes"], "Berlin, Germany", 2019),
+        ("Ben Ode", ["Python"], "Austin, TX", 2015),
+        ("Cy Park", ["Rust", "Kubernetes"], "Berlin, Germany", 2021),
+    ]
+    for name, skills, location, year in people:
+        profile = DummyTextGenerator(name).generate().model_copy(
+            update={
+                "skills": skills,
+                "contact": {"location": location},
+                "education": [{"institution": "Uni", "degree": "MSc", "graduation_year": year}],
+            }
+        )
+        write_profile_record(renderer.render(profile), profile)
+    directory = CandidateDirectory(static_dir, refresh_interval_seconds=0)
+
+    total, records = directory.search(CandidateQuery(skills=["kubernetes"], location="berlin"), limit=1)
+    assert total == 2
+    assert [record.name for record in records] == ["Ana Lee"]
+    assert directory.search(CandidateQuery(skills=["Python"], graduated_after=2016))[0] == 1
+
+    assert directory.answer("How many candidates know Python?").startswith("2 candidates match skills Python:")
+    listed = directory.answer("List candidates in Berlin with Kubernetes")
+    assert "Ana Lee" in listed and "Cy Park" in listed and "Ben Ode" not in listed
+    assert directory.answer("What does Ana Lee do?") is None
+    for question in (
+        "Which candidates know Python but not Kubernetes?",
+        "Which candidates know Python or Rust?",
+        "How many candidates have more than 5 years of Python?",
+        "Which candidate is the best fit for a senior Python role?",
+        "Which candidates worked at NovaTech and know Python?",
+        "List candidates in Paris with Python",
+    ):
+        assert directory.answer(question) is None, question
+    assert directory.answer("Which candidates graduated after 2016 and know Python?").startswith("1 candidate match")
+    disabled = CandidateDirectory(static_dir, refresh_interval_seconds=0, exact_answers=False)
+    assert disabled.answer("How many candidates know Python?") is None
+
+    write_pdf(static_dir / "uploaded.pdf", "Uploaded CV")
+    assert directory.answer("How many candidates know Python?") is None
+
+
+def test_rag_service_hot_swaps_published_index(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    write_pdf(static_dir / "a.pdf", "Alice knows Python")
+
+    service = build_rag_service(tmp_path)
+    service._reload_interval_seconds = 0
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+    service.ingest()
+    service.warm_up()
+    first = service._get_loaded()
+    assert service.index_generation == 1
+
+    write_pdf(static_dir / "b.pdf", "Bob knows Kubernetes")
+    writer = build_rag_service(tmp_path)
+    monkeypatch.setattr(writer, "_embeddings", lambda task_type: embedding)
+    writer.ingest()
+
+    assert service._get_loaded() is not first
+    assert service.index_generation == 2
+
+
+def test_index_store_collects_superseded_versions(tmp_path):
+    store = IndexVersionStore(tmp_path, grace_period_seconds=0)
+    first = store.stage(1)
+    store.publish(first)
+    second = store.stage(2)
+    store.publish(second)
+
+    assert store.current() == second
+    assert store.collect_garbage() == 1
+    assert not first.path.exists()
+    assert second.path.exists()
+
+
+def test_embedding_pipeline_batches_and_reuses_cache(tmp_path):
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite3")
+    texts = ["alpha", "beta", "alpha", "gamma", "delta"]
+
+    pipeline = EmbeddingPipeline(embedding, "model", "RETRIEVAL_DOCUMENT", cache=cache, batch_size=2)
+    results = {}
+    for positions, vectors in pipeline.embed(texts):
+        results.update(zip(positions, vectors))
+    assert sorted(results) == [0, 1, 2, 3, 4]
+    assert results[0] == results[2]
+    assert sorted(embedding.embedded_texts) == ["alpha", "beta", "delta", "gamma"]
+
+    embedding.embedded_texts.clear()
+    batches = list(pipeline.embed(texts + ["epsilon"]))
+    assert embedding.embedded_texts == ["epsilon"]
+    assert sum(len(positions) for positions, _ in batches) == 6
+
+
+def test_build_index_supports_ann_modes():
+    vectors = np.random.default_rng(0).random((2000, 32), dtype=np.float32)
+    for index_type in ("flat", "ivf_flat", "hnsw", "hnsw_sq8", "ivf_sq8", "ivf_pq"):
+        config = VectorIndexConfig(index_type=index_type, min_vectors=1, nlist=16, pq_m=8, pq_nbits=4)
+        index = build_index(vectors, config)
+        assert index.ntotal == len(vectors)
+        _, ids = index.search(vectors[:5], 1)
+        assert ids[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+    small = build_index(vectors[:10], VectorIndexConfig(index_type="ivf_pq", min_vectors=100))
+    assert isinstance(small, faiss.IndexFlatL2)
+
+
+def test_rag_ingest_publishes_ann_index_and_updates_incrementally(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    write_pdf(static_dir / "a.pdf", "Alice knows Python")
+    write_pdf(static_dir / "b.pdf", "Bob knows Kubernetes")
+
+    service = build_rag_service(tmp_path)
+    service._vector_index = VectorIndexConfig(index_type="ivf_flat", min_vectors=1)
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+    service.ingest()
+
+    version = service._index_store.current()
+    assert not (version.path / "index.pkl").exists()
+    assert faiss.try_extract_index_ivf(faiss.read_index(str(version.path / "index.faiss"))) is not None
+
+    (static_dir / "a.pdf").unlink()
+    assert service.ingest() == 1
+    index = MappedVectorIndex(service._index_store.current().path)
+    assert len(index) == 1
+    assert index.screen_vectors[0].dtype == np.int8
+    assert index.document(0).page_content == "Bob knows Kubernetes"
+    query = embedding.embed_query("Bob knows Kubernetes")
+    assert index.search(query, 4) == [(0, 0.0)]
+    assert "vectors" not in vars(index)  # ANN serving never maps the float32 vectors
+
+    # A format change rewrites the published version from its vectors, without re-embedding.
+    generation = service._index_store.current().generation
+    embedding.embedded_texts.clear()
+    monkeypatch.setattr(rag_module, "INDEX_FORMAT_VERSION", rag_module.INDEX_FORMAT_VERSION + 1)
+    assert service.ingest() == 1
+    assert service._index_store.current().generation == generation + 1
+    assert embedding.embedded_texts == []
+
+
+def test_rag_answer_cache_is_scoped_to_index_generation(tmp_path, monkeypatch):
+    service = build_rag_service(tmp_path)
+    service._answer_cache = InMemoryAnswerCache(max_size=8, ttl_seconds=60)
+    service._reload_interval_seconds = 0
+    calls = []
+
+    class FakeChain:
+        def invoke(self, payload):
+            calls.append(payload["question"])
+            return f"answer {len(calls)}"
+
+    class FakeRetriever:
+        def invoke(self, question):
+            return []
+
+    monkeypatch.setattr(
+        service,
+        "_load_version",
+        lambda version: LoadedIndex(version.generation, None, FakeRetriever(), FakeChain()),
+    )
+    store = service._index_store
+    store.publish(store.stage(1))
+
+    assert service.answer("Who knows Kubernetes?") == "answer 1"
+    assert service.answer("  who knows   kubernetes ") == "answer 1"
+    assert len(calls) == 1
+
+    store.publish(store.stage(2))
+    assert service.answer("Who knows Kubernetes?") == "answer 2"
+    assert service.cache_stats()["answers"]["hits"] == 1
+
+
+def test_rag_astream_answer_yields_tokens_then_sources(tmp_path, monkeypatch):
+    service = build_rag_service(tmp_path)
+
+    class FakeChain:
+        async def astream(self, payload):
+            for token in ("Alice ", "knows ", "Python."):
+                yield token
+
+    class FakeRetriever:
+        async def ainvoke(self, question):
+            return [
+                Document(page_content="Alice", metadata={"filename": "a.pdf"}),
+                Document(page_content="Alice again", metadata={"filename": "a.pdf"}),
+            ]
+
+    monkeypatch.setattr(
+        service,
+        "_load_version",
+        lambda version: LoadedIndex(version.generation, None, FakeRetriever(), FakeChain()),
+    )
+    service._index_store.publish(service._index_store.stage(1))
+
+    async def collect():
+        return [event async for event in service.astream_answer("Who knows Python?")]
+
+    assert asyncio.run(collect()) == [
+        ("token", "Alice "),
+        ("token", "knows "),
+        ("token", "Python."),
+        ("sources", ["a.pdf"]),
+    ]
+
+
+def test_rag_aanswer_retrieves_concurrently_off_the_event_loop(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    write_pdf(static_dir / "a.pdf", "Alice knows Python")
+    write_pdf(static_dir / "b.pdf", "Bob knows Kubernetes")
+
+    service = build_rag_service(tmp_path)
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+    service.ingest()
+
+    class EchoContextChain:
+        async def ainvoke(self, payload):
+            return payload["context"]
+
+    monkeypatch.setattr(service, "_build_chain", lambda: EchoContextChain())
+    service.warm_up()
+    index = service._loaded.index
+    retrieve = index.retrieve
+    barrier = threading.Barrier(2, timeout=5)
+
+    def blocking_retrieve(query, vector, k):
+        # Both requests must be retrieving at once, or the barrier times out.
+        barrier.wait()
+        return retrieve(query, vector, k)
+
+    monkeypatch.setattr(index, "retrieve", blocking_retrieve)
+
+    async def ask_twice():
+        return await asyncio.gather(service.aanswer("Bob knows Kubernetes"), service.aanswer("Alice knows Python"))
+
+    bob, alice = asyncio.run(ask_twice())
+    assert bob.startswith("File: b.pdf\nBob knows Kubernetes")
+    assert alice.startswith("File: a.pdf\nAlice knows Python")
+
+
+def test_rag_screen_ranks_every_cv_against_job_description(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    for name, text in (("a", "Alice knows Python"), ("b", "Bob knows Kubernetes"), ("c", "Carol knows Rust")):
+        write_pdf(static_dir / f"{name}.pdf", text)
+
+    service = build_rag_service(tmp_path)
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: CountingEmbedding(size=8, embedded_texts=[]))
+    monkeypatch.setattr(service, "_build_chain", lambda: None)
+    service.ingest()
+
+    total, ranked = asyncio.run(service.ascreen("Bob knows Kubernetes", limit=2))
+    assert total == 3
+    assert ranked[0][0] == "b.pdf"
+    # Screening scores int8 unit vectors, accurate to well under 1%.
+    assert abs(ranked[0][1] - 1.0) < 5e-3
+    assert len(ranked) == 2 and ranked[1][1] <= ranked[0][1]
+
+    _, everything = asyncio.run(service.ascreen("Bob knows Kubernetes", limit=5))
+    _, page = asyncio.run(service.ascreen("Bob knows Kubernetes", aggregate="mean", offset=1, limit=5))
+    assert page == everything[1:]
+
+
+def test_hybrid_retrieval_finds_exact_terms_dense_search_misses(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    texts = {f"cv{i}": f"Candidate {i} builds web services" for i in range(6)}
+    texts["cv3"] = "Candidate 3 holds ISO27001 and CKA certifications"
+    for name, text in texts.items():
+        write_pdf(static_dir / f"{name}.pdf", text)
+
+    service = build_rag_service(tmp_path)
+    service._retriever_k = 1
+    embedding = CountingEmbedding(size=8, embedded_texts=[])
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: embedding)
+    monkeypatch.setattr(service, "_build_chain", lambda: None)
+    # Dense-only versions carry no BM25 postings; enabling hybrid adds them without re-embedding.
+    service._lexical_search = LexicalSearchConfig(enabled=False)
+    service.ingest()
+    assert not list(service._index_store.current().path.glob("bm25.*"))
+    embedding.embedded_texts.clear()
+    service._lexical_search = LexicalSearchConfig()
+    service.ingest()
+    assert embedding.embedded_texts == []
+
+    loaded = service._get_loaded()
+    assert loaded.index.lexical is not None
+    hits = loaded.index.lexical.search("iso27001 cka", 5)
+    assert [loaded.index.document(row).metadata["filename"] for row, _ in hits] == ["cv3.pdf"]
+    docs = loaded.retriever.invoke("Which candidates are ISO27001 certified?")
+    assert [doc.metadata["filename"] for doc in docs] == ["cv3.pdf"]
+
+
+def test_rag_packing_retrieves_its_own_candidate_depth(tmp_path, monkeypatch):
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    for index in range(8):
+        write_pdf(static_dir / f"cv{index}.pdf", f"Candidate {index} builds web services")
+    service = build_rag_service(tmp_path)
+    monkeypatch.setattr(service, "_embeddings", lambda task_type: CountingEmbedding(size=8, embedded_texts=[]))
+    monkeypatch.setattr(service, "_build_chain", lambda: None)
+    service.ingest()
+    assert len(service._get_loaded().retriever.invoke("web services")) == 4
+
+    packed = RAGService(
+        text_extractor=CVTextExtractor(static_dir=static_dir),
+        index_store=IndexVersionStore(tmp_path / "index"),
+        embedding_model="models/text-embedding-004",
+        chat_model="gemini-2.0-flash",
+        google_api_key="test-key",
+        chunk_size=1000,
+        chunk_overlap=200,
+        retriever_k=4,
+        context_packer=ContextPacker(token_budget=3000, max_chunks=24),
+        context_candidates=8,
+    )
+    monkeypatch.setattr(packed, "_embeddings", lambda task_type: CountingEmbedding(size=8, embedded_texts=[]))
+    monkeypatch.setattr(packed, "_build_chain", lambda: None)
+    assert len(packed._get_loaded().retriever.invoke("web services")) == 8
+
+
+def test_context_packer_merges_overlaps_groups_candidates_and_respects_budget():
+    def chunk(filename, text, **metadata):
+        return Document(page_content=text, metadata={"filename": filename, **metadata})
+
+    ranked = [
+        chunk("a.pdf", "Candidate: Ana Lee (SRE)\nSection: Skills\nPython, Go", candidate="Ana Lee", title="SRE"),
+        chunk("b.pdf", "Bob led the migration of billing services to Kubernetes and"),
+        chunk("b.pdf", "of billing services to Kubernetes and cut costs by a third."),
+        chunk("a.pdf", "Candidate: Ana Lee (SRE)\nSection: Skills\nPython, Go", candidate="Ana Lee", title="SRE"),
+        chunk("c.pdf", "Carol " + "writes Rust " * 200),
+        chunk("d.pdf", "Dan knows Java."),
+    ]
+    packer = ContextPacker(token_budget=60, max_chunks=10)
+
+    packed = packer.pack(ranked)
+
+    assert [doc.metadata["filename"] for doc in packed] == ["a.pdf", "b.pdf", "d.pdf"]
+    assert packed[0].page_content == "Section: Skills\nPython, Go"
+    assert packed[1].page_content == "Bob led the migration of billing services to Kubernetes and cut costs by a third."
+    context = packer.format(packed)
+    assert context.startswith("File: a.pdf | Candidate: Ana Lee (SRE)\nSection: Skills")
+    assert estimate_tokens(context) <= 60
+    assert [doc.metadata["filename"] for doc in ContextPacker(token_budget=60, max_chunks=2).pack(ranked)] == [
+        "a.pdf",
+        "b.pdf",
+    ]
+
+
+def test_mock_rag_models_are_deterministic_and_drive_the_benchmark_suite(tmp_path):
+    embeddings = MockEmbeddings(size=64)
+    assert embeddings.embed_query("Python and Kubernetes") == MockEmbeddings(size=64).embed_query("Python and Kubernetes")
+    similar = np.dot(embeddings.embed_query("Python Kubernetes"), embeddings.embed_query("Kubernetes Python expert"))
+    unrelated = np.dot(embeddings.embed_query("Python Kubernetes"), embeddings.embed_query("sales negotiation"))
+    assert similar > unrelated
+
+    report = run_benchmarks(
+        BenchmarkConfig(
+            sizes=[6],
+            work_dir=tmp_path,
+            embedding_size=32,
+            embedding_latency_seconds=0,
+            chat_latency_seconds=0,
+            retrieval_queries=5,
+            chat_requests=4,
+            chat_concurrency=2,
+            render_sample=2,
+            render_workers=1,
+        )
+    )
+
+    (run,) = report["runs"]
+    assert run["corpus_size"] == 6
+    assert run["render"]["pdfs"] == 2
+    assert run["ingest"]["cvs_indexed"] == 6
+    assert run["retrieval"]["queries"] == 5
+    assert run["chat"]["requests"] == 4 and run["chat"]["errors"] == 0
+    json.dumps(report)
+
+
+def test_corpus_synthesizer_is_reproducible_and_feeds_the_candidate_index(tmp_path):
+    synthesizer = CorpusSynthesizer(seed=7)
+    profiles = list(synthesizer.profiles(1500))
+
+    assert [p.model_dump() for p in CorpusSynthesizer(seed=7).profiles(3, start=1200)] == [
+        p.model_dump() for p in profiles[1200:1203]
+    ]
+    assert profiles[0].model_dump() != next(CorpusSynthesizer(seed=8).profiles(1)).model_dump()
+    assert len({profile.title for profile in profiles}) == len(CorpusVocabulary().roles)
+    assert len({profile.contact["email"] for profile in profiles}) == 1500
+
+    static_dir = tmp_path / "static"
+    paths = write_corpus(synthesizer, 20, static_dir)
+    rendered = write_corpus(synthesizer, 2, static_dir, renderer=CVPdfRenderer(tmp_path / "renderer"), start=20)
+
+    assert [path.name for path in paths[:2]] == ["synthetic-7-0000000.pdf", "synthetic-7-0000001.pdf"]
+    assert {path.parent for path in rendered} == {static_dir}
+    assert PdfReader(str(rendered[0])).pages[0].extract_text().startswith(profiles[20].name)
+    directory = CandidateDirectory(static_dir, refresh_interval_seconds=0)
+    skill = profiles[0].skills[0]
+    total, _ = directory.search(CandidateQuery(skills=[skill]))
+    assert total == sum(skill in profile.skills for profile in profiles[:22])
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.values = {}
+        self.published = []
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def execute(self):
+        return []
+
+
+def test_task_events_publish_stages_progress_and_snapshot():
+    client = RecordingRedis()
+    reporter = TaskEventPublisher(client, ttl_seconds=60, prefix="test").reporter("task-1")
+
+    with timed("rag.embed", reporter.stage):
+        pass
+    reporter.progress(3, 8, last="cv-3.pdf")
+
+    events = [event for _, event in client.published]
+    assert [(event["type"], event.get("status")) for event in events] == [
+        ("stage", "started"),
+        ("stage", "finished"),
+        ("progress", None),
+    ]
+    assert {channel for channel, _ in client.published} == {"test:task-1"}
+    snapshot = json.loads(client.values[snapshot_key("test", "task-1")])
+    assert snapshot["percent"] == 37.5
+    status = _status_from_event("task-1", snapshot)
+    assert status.status == "PROGRESS"
+    assert status.progress == {"completed": 3, "total": 8, "percent": 37.5, "last": "cv-3.pdf"}
+    started, stage = [{"task_id": "task-1", "type": kind, "timestamp": 0.0} for kind in ("started", "stage")]
+    assert _status_from_event("task-1", started).status == "STARTED"
+    stage.update(stage="cv.render", status="started")
+    assert _status_from_event("task-1", stage).progress == {"stage": "cv.render", "status": "started"}
+
+
+class KeyValueRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode()
+        return True
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def register_script(self, _source):
+        def release(keys, args):
+            if self.values.get(keys[0]) == args[0].encode():
+                del self.values[keys[0]]
+
+        return release
+
+
+def test_ingest_coalescer_keeps_one_running_and_one_pending():
+    coalescer = IngestCoalescer(KeyValueRedis(), lock_ttl_seconds=60)
+    enqueued = []
+
+    first, coalesced = coalescer.submit(enqueued.append)
+    assert (coalescer.submit(enqueued.append), coalesced) == ((first, True), False)
+    assert coalescer.start(first)
+
+    second, coalesced = coalescer.submit(enqueued.append)
+    assert not coalesced and coalescer.submit(enqueued.append) == (second, True)
+    assert not coalescer.start(second)
+    coalescer.finish(first)
+    assert coalescer.start(second)
+    assert enqueued == [first, second]
+
+
+def test_celery_routes_ingest_and_generation_to_separate_pools():
+    settings = AppSettings(
+        celery_worker_pool="ingest",
+        celery_ingest_concurrency=1,
+        celery_ingest_prefetch_multiplier=1,
+    )
+    assert worker_pool_options(settings) == (("ingest",), 1, 1)
+    shared = AppSettings(celery_generation_concurrency=4, celery_ingest_concurrency=1)
+    assert worker_pool_options(shared)[:2] == (("generation", "ingest"), 5)
+
+    routes = task_routes(settings)
+    assert routes["rag.ingest"]["queue"] == "ingest"
+    assert {routes[name]["queue"] for name in ("cv.generate", "cv.generate_batch")} == {"generation"}
+    assert routes["cv.generate"]["priority"] < routes["cv.generate_batch"]["priority"]
+
+
+def test_redis_answer_cache_serves_async_callers_and_scopes_keys_to_generations():
+    client = KeyValueRedis()
+    cache = RedisAnswerCache(client, ttl_seconds=60, prefix="answers")
+
+    async def roundtrip():
+        await cache.aset(3, "Who knows Python?", "Ana Lee")
+        return await cache.aget(3, "who knows python")
+
+    assert asyncio.run(roundtrip()) == "Ana Lee"
+    # Other API workers' entries survive a generation switch; old ones simply stop matching.
+    cache.clear()
+    assert cache.get(3, "Who knows Python?") == "Ana Lee"
+    assert cache.get(4, "Who knows Python?") is None